@@ -68,7 +68,9 @@ async def get_analytics_overview(
         ]
         
         # Get recent activity (last 10 memories)
-        recent_activity = db.query(Memory).filter(
+        recent_activity = db.query(
+            Memory.id, Memory.text, Memory.modality, Memory.created_at, Memory.importance
+        ).filter(
             and_(
                 Memory.tenant_id == tenant_id,
                 Memory.user_id == user_id,
@@ -312,35 +314,20 @@ async def get_memory_health(
 ) -> Dict[str, Any]:
     """Get memory health metrics and recommendations."""
     try:
-        # Get total memories
-        total_memories = db.query(func.count(Memory.id)).filter(
-            and_(
-                Memory.tenant_id == tenant_id,
-                Memory.user_id == user_id,
-                Memory.active == True,
-            )
-        ).scalar() or 0
-        
-        # Get low importance memories
-        low_importance = db.query(func.count(Memory.id)).filter(
-            and_(
-                Memory.tenant_id == tenant_id,
-                Memory.user_id == user_id,
-                Memory.active == True,
-                Memory.importance < 0.3,
-            )
-        ).scalar() or 0
-        
-        # Get stale memories (not accessed in 30 days)
+        # Get total, low importance and stale (not accessed in 30 days)
+        # memory counts in one pass
         thirty_days_ago = datetime.now() - timedelta(days=30)
-        stale_memories = db.query(func.count(Memory.id)).filter(
+        total_memories, low_importance, stale_memories = db.query(
+            func.count(),
+            func.count().filter(Memory.importance < 0.3),
+            func.count().filter(Memory.last_accessed_at < thirty_days_ago),
+        ).select_from(Memory).filter(
             and_(
                 Memory.tenant_id == tenant_id,
                 Memory.user_id == user_id,
                 Memory.active == True,
-                Memory.last_accessed_at < thirty_days_ago,
             )
-        ).scalar() or 0
+        ).one()
         
         # Get duplicate sources
         duplicate_sources = db.query(
@@ -1,24 +1,39 @@
 """API key authentication and authorization."""
 
+import hashlib
+import hmac
 import secrets
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Tuple
 
 from passlib.context import CryptContext
+from redis import RedisError
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 
+from engram.api.deps import get_cache_redis
 from engram.utils.config import get_settings
 from engram.utils.logger import get_logger
 from engram.database.apikeys import ApiKey
-from engram.database.postgres import get_db_session
+from engram.database.postgres import get_db_session, get_session
 from engram.utils.ids import generate_ulid
 
 logger = get_logger(__name__)
 settings = get_settings()
 
-# Password hashing context
+# bcrypt context, only used to verify keys issued before SHA-256 digests
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Redis key prefix of the per-key cache generations shared by all processes
+API_KEY_GENERATION_PREFIX = "engram:api-key-generation:"
+
+# Session.info entry collecting digests of keys changed in a transaction
+CHANGED_KEYS_INFO = "engram_changed_api_keys"
+
 # Standard API scopes
 SCOPES = {
     "memories:read": "Read memories and retrieve data",
@@ -32,6 +47,198 @@ SCOPES = {
 }
 
 
+class ApiKeyCache:
+    """Short-lived LRU cache of validated API keys by key digest.
+    
+    A hit authenticates a request without touching the database. Entries
+    expire after ``API_KEY_CACHE_TTL`` seconds, or earlier when the key
+    itself expires.
+    
+    Entries are tagged with a per-key generation that committing a change
+    to the key bumps. With a Redis client the generations are shared, so
+    revoking a key in one worker process stops it authenticating in all of
+    them; each hit then costs one Redis GET, and lookups are misses while
+    Redis is unreachable. Without one they live in this process only.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        ttl: Optional[float] = None,
+        redis_client=None,
+    ):
+        """Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of cached keys
+            ttl: Seconds a validated key stays cached
+            redis_client: Optional Redis client sharing generations between
+                processes
+        """
+        self.maxsize = settings.api_key_cache_size if maxsize is None else maxsize
+        self.ttl = settings.api_key_cache_ttl if ttl is None else ttl
+        self.redis_client = redis_client
+        self._entries: "OrderedDict[bytes, Tuple[float, int, ApiKey]]" = OrderedDict()
+        self._generations: Dict[bytes, int] = {}
+        self._lock = threading.Lock()
+
+    def _generation(self, key_hash: bytes) -> Optional[int]:
+        """Get a key's current generation, or None if it cannot be read."""
+        if self.redis_client is None:
+            with self._lock:
+                return self._generations.get(key_hash, 0)
+        try:
+            return int(self.redis_client.get(API_KEY_GENERATION_PREFIX + key_hash.hex()) or 0)
+        except RedisError as e:
+            # Once per request while Redis is down, so kept out of warnings
+            logger.debug(f"Failed to read API key cache generation: {e}")
+            return None
+
+    def lookup(self, key_hash: bytes) -> Tuple[Optional[int], Optional[ApiKey]]:
+        """Look up a validated key, along with its generation.
+        
+        A key read from the database after a miss must be stored with put()
+        under the generation returned here; a revocation that lands in
+        between bumps the generation, so the stale record is never served.
+        
+        Args:
+            key_hash: Digest of the raw API key
+            
+        Returns:
+            Tuple of (the key's generation, or None if it could not be read;
+            detached ApiKey record, or None on a miss)
+        """
+        generation = self._generation(key_hash)
+        if generation is None:
+            return None, None
+            
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry is None:
+                return generation, None
+            if entry[0] <= time.monotonic() or entry[1] != generation:
+                del self._entries[key_hash]
+                return generation, None
+            self._entries.move_to_end(key_hash)
+            return generation, entry[2]
+
+    def get(self, key_hash: bytes) -> Optional[ApiKey]:
+        """Look up a validated key.
+        
+        Args:
+            key_hash: Digest of the raw API key
+            
+        Returns:
+            Detached ApiKey record, or None on a miss
+        """
+        return self.lookup(key_hash)[1]
+
+    def put(self, key_hash: bytes, api_key: ApiKey, generation: Optional[int] = None) -> None:
+        """Cache a validated key.
+        
+        Args:
+            key_hash: Digest of the raw API key
+            api_key: ApiKey record with its columns loaded
+            generation: Generation returned by the lookup() that missed;
+                defaults to the current one
+        """
+        ttl = self.ttl
+        if api_key.expires_at is not None:
+            expires_at = api_key.expires_at
+            now = datetime.now(expires_at.tzinfo) if expires_at.tzinfo else datetime.utcnow()
+            ttl = min(ttl, (expires_at - now).total_seconds())
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+            
+        if generation is None:
+            generation = self._generation(key_hash)
+            if generation is None:
+                return
+            
+        with self._lock:
+            self._entries[key_hash] = (time.monotonic() + ttl, generation, api_key)
+            self._entries.move_to_end(key_hash)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key_hash: bytes) -> None:
+        """Drop a key from the cache, in every process sharing generations.
+        
+        Args:
+            key_hash: Digest of the raw API key
+        """
+        if self.redis_client is None:
+            with self._lock:
+                self._generations[key_hash] = self._generations.get(key_hash, 0) + 1
+                self._entries.pop(key_hash, None)
+            return
+        try:
+            self.redis_client.incr(API_KEY_GENERATION_PREFIX + key_hash.hex())
+        except RedisError as e:
+            # Other processes keep serving the key until their entries expire
+            logger.warning(f"Failed to share API key revocation: {e}")
+            with self._lock:
+                self._entries.pop(key_hash, None)
+
+    def clear(self) -> None:
+        """Drop every cached key."""
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+
+@lru_cache()
+def get_api_key_cache() -> ApiKeyCache:
+    """Get the process-wide validated key cache.
+    
+    Without a reachable Redis, revocations stay within a process, so the
+    cache is kept in-process for a single worker and turned off for
+    several.
+    
+    Returns:
+        ApiKeyCache instance
+    """
+    redis_client = get_cache_redis()
+    if redis_client is not None:
+        return ApiKeyCache(redis_client=redis_client)
+    if settings.workers > 1:
+        logger.warning("API key caching is off: multiple workers need Redis to share revocations")
+        return ApiKeyCache(maxsize=0)
+    return ApiKeyCache()
+
+
+@event.listens_for(ApiKey, "after_update")
+def _note_changed_key(mapper, connection, target: ApiKey) -> None:
+    """Note a revoked or changed key, to drop it from the cache on commit.
+    
+    Dropping it at flush would let another request cache the old row again
+    before the change is committed.
+    """
+    state = inspect(target)
+    if target.key_hash is None or state.session is None:
+        return
+    changed = any(
+        state.attrs[column.key].history.has_changes()
+        for column in mapper.column_attrs
+        if column.key != "last_used_at"
+    )
+    if changed:
+        state.session.info.setdefault(CHANGED_KEYS_INFO, set()).add(target.key_hash)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_keys(session: Session) -> None:
+    """Drop keys changed in the committed transaction from the cache."""
+    for key_hash in session.info.pop(CHANGED_KEYS_INFO, ()):
+        get_api_key_cache().invalidate(key_hash)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_keys(session: Session) -> None:
+    """Keep cached keys whose changes were rolled back."""
+    session.info.pop(CHANGED_KEYS_INFO, None)
+
+
 class ApiKeyManager:
     """Manages API key creation, validation, and authorization."""
 
@@ -48,29 +255,59 @@ class ApiKeyManager:
         return f"{settings.api_key_prefix}{key_string}"
 
     @staticmethod
-    def hash_api_key(api_key: str) -> str:
+    def hash_api_key(api_key: str) -> bytes:
         """Hash an API key for storage.
         
+        Keys are random tokens rather than passwords, so an unsalted SHA-256
+        digest is enough and lets a key be looked up by its hash.
+        
         Args:
             api_key: Raw API key
             
         Returns:
-            Hashed API key
+            32-byte SHA-256 digest
         """
-        return pwd_context.hash(api_key)
+        return hashlib.sha256(api_key.encode("utf-8")).digest()
 
     @staticmethod
-    def verify_api_key(api_key: str, hashed_key: str) -> bool:
+    def verify_api_key(api_key: str, hashed_key: bytes) -> bool:
         """Verify an API key against its hash.
         
         Args:
             api_key: Raw API key
-            hashed_key: Stored hash
+            hashed_key: Stored digest
             
         Returns:
             True if key is valid
         """
-        return pwd_context.verify(api_key, hashed_key)
+        return hmac.compare_digest(ApiKeyManager.hash_api_key(api_key), hashed_key)
+
+    @staticmethod
+    def _upgrade_legacy_key(session: Session, api_key: str, key_hash: bytes) -> Optional[ApiKey]:
+        """Find a bcrypt-hashed key issued before digests and store its digest.
+        
+        Args:
+            session: Database session
+            api_key: Raw API key
+            key_hash: Digest of the raw key
+            
+        Returns:
+            Matching ApiKey record, or None
+        """
+        legacy_keys = session.query(ApiKey).filter(
+            ApiKey.key_hash.is_(None),
+            ApiKey.legacy_key_hash.isnot(None),
+            ApiKey.active == True,
+            ApiKey.expires_at > datetime.utcnow()
+        ).all()
+        
+        for key_record in legacy_keys:
+            if pwd_context.verify(api_key, key_record.legacy_key_hash):
+                key_record.key_hash = key_hash
+                key_record.legacy_key_hash = None
+                return key_record
+                
+        return None
 
     @staticmethod
     def create_api_key(
@@ -109,9 +346,12 @@ class ApiKeyManager:
                 expires_at=expires_at
             )
             
-            with get_db_session() as session:
+            session = get_session()
+            try:
                 session.add(api_key)
                 session.commit()
+            finally:
+                session.close()
                 
             logger.info(
                 "Created API key",
@@ -143,36 +383,49 @@ class ApiKeyManager:
         Returns:
             ApiKey record if valid, None otherwise
         """
+        key_hash = ApiKeyManager.hash_api_key(api_key)
+        api_key_cache = get_api_key_cache()
+        generation, cached = api_key_cache.lookup(key_hash)
+        if cached is not None:
+            return cached
+            
+        session = get_session()
         try:
-            with get_db_session() as session:
-                # Get all active API keys (we need to check each one)
-                api_keys = session.query(ApiKey).filter(
-                    ApiKey.active == True,
-                    ApiKey.expires_at > datetime.utcnow()
-                ).all()
-                
-                for key_record in api_keys:
-                    if ApiKeyManager.verify_api_key(api_key, key_record.key_hash):
-                        # Update last used timestamp
-                        key_record.last_used_at = datetime.utcnow()
-                        session.commit()
-                        
-                        logger.debug(
-                            "Validated API key",
-                            extra={
-                                "key_id": key_record.id,
-                                "tenant_id": key_record.tenant_id,
-                                "user_id": key_record.user_id,
-                            }
-                        )
-                        
-                        return key_record
-                        
+            key_record = session.query(ApiKey).filter(
+                ApiKey.key_hash == key_hash,
+                ApiKey.active == True,
+                ApiKey.expires_at > datetime.utcnow()
+            ).first()
+            if key_record is None:
+                key_record = ApiKeyManager._upgrade_legacy_key(session, api_key, key_hash)
+            if key_record is None:
                 return None
                 
+            # Update last used timestamp
+            key_record.last_used_at = datetime.utcnow()
+            session.commit()
+            # Load the committed row so it stays readable once the session closes
+            session.refresh(key_record)
+            if generation is not None:
+                api_key_cache.put(key_hash, key_record, generation=generation)
+            
+            logger.debug(
+                "Validated API key",
+                extra={
+                    "key_id": key_record.id,
+                    "tenant_id": key_record.tenant_id,
+                    "user_id": key_record.user_id,
+                }
+            )
+            
+            return key_record
+            
         except Exception as e:
+            session.rollback()
             logger.error(f"Failed to validate API key: {e}")
             return None
+        finally:
+            session.close()
 
     @staticmethod
     def revoke_api_key(key_id: str, tenant_id: str) -> bool:
@@ -186,13 +439,14 @@ class ApiKeyManager:
             True if revoked successfully
         """
         try:
-            with get_db_session() as session:
+            with get_session() as session:
                 api_key = session.query(ApiKey).filter(
                     ApiKey.id == key_id,
                     ApiKey.tenant_id == tenant_id
                 ).first()
                 
                 if api_key:
+                    # Committing drops the key from the cache
                     api_key.active = False
                     session.commit()
                     
@@ -5,7 +5,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
 
 from engram.utils.logger import get_logger
-from engram.connectors import GoogleDriveConnector, NotionConnector, SlackConnector
+import engram.connectors as connectors
 from engram.api.middleware import require_scope, get_current_tenant_id, get_current_user_id
 
 logger = get_logger(__name__)
@@ -56,14 +56,14 @@ async def sync_connector(request: ConnectorSyncRequest):
         
         logger.info(f"Starting {request.source} connector sync")
         
-        # Create connector instance
+        # Create connector instance (connector modules are imported on first use)
         connector = None
         if request.source == "google_drive":
-            connector = GoogleDriveConnector(request.config)
+            connector = connectors.GoogleDriveConnector(request.config)
         elif request.source == "notion":
-            connector = NotionConnector(request.config)
+            connector = connectors.NotionConnector(request.config)
         elif request.source == "slack":
-            connector = SlackConnector(request.config)
+            connector = connectors.SlackConnector(request.config)
         
         if not connector:
             raise HTTPException(status_code=400, detail=f"Failed to create {request.source} connector")
@@ -1,13 +1,16 @@
 """Dependency injection helpers for FastAPI."""
 
 from functools import lru_cache
-from typing import Generator
+from typing import Generator, Optional
 
+import redis
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
+from engram.core.ann_index import MemoryANNIndex, ann_available
 from engram.core.memory_store import MemoryStore
 from engram.core.embeddings import EmbeddingsFacade
+from engram.core.retrieval import RetrievalCache
 from engram.database.postgres import get_db_session
 from engram.utils.config import get_settings
 from engram.utils.logger import get_logger
@@ -17,6 +20,9 @@ from engram.vectordb.pinecone_db import PineconeVectorIndex
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Seconds to wait for Redis before a cache lookup is treated as a miss
+REDIS_CACHE_TIMEOUT = 0.1
+
 
 @lru_cache()
 def get_vector_index():
@@ -50,10 +56,74 @@ def get_embeddings_facade():
     return EmbeddingsFacade()
 
 
+@lru_cache()
+def get_ann_index() -> Optional[MemoryANNIndex]:
+    """Get the consolidation nearest-neighbour index.
+    
+    Returns:
+        MemoryANNIndex instance, or None if disabled or hnswlib is missing
+    """
+    if not settings.ann_index_enabled:
+        return None
+    if not ann_available():
+        logger.warning("hnswlib not available, consolidation will compare all memory pairs")
+        return None
+    return MemoryANNIndex()
+
+
+@lru_cache()
+def get_cache_redis() -> Optional[redis.Redis]:
+    """Get the Redis client that caches use to share invalidations.
+    
+    Redis is pinged once, when the client is first requested, so an
+    unreachable Redis costs one timeout rather than one per lookup.
+    
+    Returns:
+        Redis client, or None if Redis is disabled or unreachable
+    """
+    if not settings.redis_enabled:
+        return None
+    client = redis.from_url(
+        settings.redis_url,
+        socket_timeout=REDIS_CACHE_TIMEOUT,
+        socket_connect_timeout=REDIS_CACHE_TIMEOUT,
+    )
+    try:
+        client.ping()
+    except (redis.RedisError, OSError) as e:
+        logger.warning(f"Redis unreachable, cache invalidation stays in-process: {e}")
+        return None
+    return client
+
+
+@lru_cache()
+def get_retrieval_cache() -> RetrievalCache:
+    """Get the process-wide retrieval result cache.
+    
+    With Redis, worker processes share each user's cache generation, so a
+    write in one worker invalidates the cached results of all of them.
+    Without a reachable Redis, invalidation stays within a process, so the
+    cache is kept in-process for a single worker and turned off for
+    several.
+    
+    Returns:
+        RetrievalCache instance
+    """
+    redis_client = get_cache_redis()
+    if redis_client is not None:
+        return RetrievalCache(redis_client=redis_client)
+    if settings.workers > 1:
+        logger.warning("Retrieval caching is off: multiple workers need Redis to share invalidations")
+        return RetrievalCache(maxsize=0)
+    return RetrievalCache()
+
+
 def get_memory_store(
     db: Session = Depends(get_db_session),
     vector_index = Depends(get_vector_index),
     embeddings_facade = Depends(get_embeddings_facade),
+    ann_index = Depends(get_ann_index),
+    retrieval_cache = Depends(get_retrieval_cache),
 ) -> Generator[MemoryStore, None, None]:
     """Get memory store instance.
     
@@ -61,6 +131,8 @@ def get_memory_store(
         db: Database session
         vector_index: Vector database index
         embeddings_facade: Embeddings facade
+        ann_index: Consolidation nearest-neighbour index
+        retrieval_cache: Retrieval result cache
         
     Yields:
         MemoryStore instance
@@ -70,6 +142,8 @@ def get_memory_store(
             db_session=db,
             vector_index=vector_index,
             embeddings_facade=embeddings_facade,
+            ann_index=ann_index,
+            retrieval_cache=retrieval_cache,
         )
         yield memory_store
     except Exception as e:
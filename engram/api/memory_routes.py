@@ -181,7 +181,9 @@ async def get_analytics_overview(
         ]
         
         # Get recent activity (last 10 memories)
-        recent_activity = db.query(Memory).filter(
+        recent_activity = db.query(
+            Memory.id, Memory.text, Memory.modality, Memory.created_at, Memory.importance
+        ).filter(
             and_(
                 Memory.tenant_id == tenant_id,
                 Memory.user_id == user_id,
@@ -1,26 +1,58 @@
 """FastAPI middleware for authentication and request logging."""
 
+import asyncio
+import logging
+import re
 import time
-import uuid
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime
 
+import anyio
+
 from fastapi import Request, Response, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import insert
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from engram.utils.logger import get_logger
 from engram.api.auth import ApiKeyManager
 from engram.database.apikeys import ApiKey
 from engram.database.analytics import RequestLog
-from engram.database.postgres import get_db_session
-from engram.utils.ids import generate_ulid
+from engram.database.postgres import get_session
+from engram.utils.ids import generate_request_id, generate_ulid
+from engram.utils.request_context import request_id_var
 
 logger = get_logger(__name__)
 
 # Security scheme for API keys
 security = HTTPBearer(auto_error=False)
 
+# Liveness probes and API docs skip request logging
+UNLOGGED_PATHS = frozenset({
+    "/",
+    "/v1/health",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+})
+
+# Caller-supplied request IDs are echoed in responses and written to logs,
+# so only short tokens are reused; anything else gets a fresh ULID
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+# Paths that can be reached without an API key
+PUBLIC_PATHS = UNLOGGED_PATHS | {
+    "/metrics",
+    "/graph",  # Static graph visualization
+}
+
+# Request logs buffered for the background writer, the most written at once,
+# and how long a partial batch waits for more logs before it is written
+REQUEST_LOG_QUEUE_SIZE = 10000
+REQUEST_LOG_BATCH_SIZE = 500
+REQUEST_LOG_FLUSH_INTERVAL = 1.0
+
 
 class AuthMiddleware(BaseHTTPMiddleware):
     """Authentication middleware for API key validation."""
@@ -34,19 +66,12 @@ class AuthMiddleware(BaseHTTPMiddleware):
         """
         super().__init__(app)
         self.require_auth = require_auth
-        self.public_paths = {
-            "/v1/health",
-            "/docs",
-            "/redoc",
-            "/openapi.json",
-            "/metrics",
-            "/graph",  # Static graph visualization
-        }
+        self.public_paths = PUBLIC_PATHS
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request with authentication."""
         # Check if path is public
-        if request.url.path in self.public_paths:
+        if request.scope["path"] in self.public_paths:
             return await call_next(request)
 
         # Extract API key from Authorization header
@@ -90,108 +115,207 @@ class AuthMiddleware(BaseHTTPMiddleware):
         return await call_next(request)
 
 
+class StaticCORSMiddleware:
+    """CORS for a public API that allows any origin without credentials.
+    
+    Every response gets the same three headers, so no per-request Origin
+    matching is needed. Written as plain ASGI middleware to avoid the
+    overhead of BaseHTTPMiddleware.
+    """
+
+    HEADERS = [
+        (b"access-control-allow-origin", b"*"),
+        (b"access-control-allow-methods", b"*"),
+        (b"access-control-allow-headers", b"*"),
+    ]
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        # Answer preflight requests directly
+        if scope["method"] == "OPTIONS" and any(
+            name == b"access-control-request-method" for name, _ in scope["headers"]
+        ):
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": self.HEADERS + [(b"content-length", b"0")],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+        
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + self.HEADERS
+            await send(message)
+        
+        await self.app(scope, receive, send_with_cors)
+
+
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Request logging middleware for analytics."""
+    """Request logging middleware for analytics.
+    
+    Request logs are handed to the queue on ``app.state.request_log_queue``
+    and written by ``drain_request_logs`` in the background, so logging and
+    database I/O never add to request latency. Without a queue (e.g. when
+    the app lifespan has not run) logs are written inline.
+    """
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request with logging."""
-        # Generate request ID
-        request_id = str(uuid.uuid4())
+        if request.scope["path"] in UNLOGGED_PATHS:
+            return await call_next(request)
+        
+        # Reuse the caller's request ID so logs correlate across services
+        request_id = request.headers.get("x-request-id")
+        if request_id is None or not REQUEST_ID_PATTERN.fullmatch(request_id):
+            request_id = generate_request_id()
         request.state.request_id = request_id
+        token = request_id_var.set(request_id)
 
         # Start timing
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Process request
-        response = await call_next(request)
+        try:
+            response = await call_next(request)
+        finally:
+            request_id_var.reset(token)
+        response.headers["X-Request-ID"] = request_id
 
         # Calculate duration
-        duration_ms = int((time.time() - start_time) * 1000)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
 
-        # Log request (async to avoid blocking)
+        # Only scope-level data is logged; the request and response bodies
+        # are one-shot streams and are never read here
         try:
-            self._log_request_async(
+            request_log = self._build_request_log(
                 request=request,
                 response=response,
-                duration_ms=duration_ms,
+                elapsed_ms=elapsed_ms,
                 request_id=request_id,
             )
+            
+            queue = getattr(request.app.state, "request_log_queue", None)
+            if queue is None:
+                write_request_logs([request_log])
+            else:
+                # Shed load rather than buffer without bound during bursts
+                queue.put_nowait(request_log)
+        except asyncio.QueueFull:
+            logger.warning("Request log queue full, dropping log for %s", request_id)
         except Exception as e:
             logger.error(f"Failed to log request: {e}")
 
         return response
 
-    def _log_request_async(
+    def _build_request_log(
         self,
         request: Request,
         response: Response,
-        duration_ms: int,
+        elapsed_ms: float,
         request_id: str,
-    ):
-        """Log request asynchronously."""
-        try:
-            # Extract request info
-            tenant_id = getattr(request.state, "tenant_id", None)
-            user_id = getattr(request.state, "user_id", None)
-            
-            # Extract additional metadata
-            user_agent = request.headers.get("user-agent", "")
-            ip_address = request.client.host if request.client else None
-            
-            # Estimate tokens and cost (placeholder)
-            tokens_used = None
-            cost_usd = None
+    ) -> Dict[str, Any]:
+        """Build the request_logs row for a request."""
+        # Extract request info
+        tenant_id = getattr(request.state, "tenant_id", None)
+        user_id = getattr(request.state, "user_id", None)
+        
+        # Extract additional metadata
+        user_agent = request.headers.get("user-agent", "")
+        ip_address = request.client.host if request.client else None
+        
+        # Estimate tokens and cost from response headers
+        tokens_used = response.headers.get("x-tokens-used")
+        cost_usd = response.headers.get("x-cost-usd")
             
-            # Try to extract from response headers or body
-            if hasattr(response, "headers"):
-                tokens_used = response.headers.get("x-tokens-used")
-                cost_usd = response.headers.get("x-cost-usd")
-                
-            if tokens_used:
-                tokens_used = int(tokens_used)
-            if cost_usd:
-                cost_usd = float(cost_usd)
-
-            # Create request log
-            request_log = RequestLog(
-                id=generate_ulid(),
-                tenant_id=tenant_id,
-                user_id=user_id,
-                request_id=request_id,
-                route=request.url.path,
-                method=request.method,
-                status_code=response.status_code,
-                duration_ms=duration_ms,
-                tokens_used=tokens_used,
-                cost_usd=cost_usd,
-                user_agent=user_agent,
-                ip_address=ip_address,
-                metadata={
-                    "query_params": dict(request.query_params),
-                    "content_type": request.headers.get("content-type", ""),
-                }
-            )
+        if tokens_used:
+            tokens_used = int(tokens_used)
+        if cost_usd:
+            cost_usd = float(cost_usd)
+
+        return {
+            "id": generate_ulid(),
+            "tenant_id": tenant_id,
+            "user_id": user_id,
+            "request_id": request_id,
+            "route": request.scope["path"],
+            "method": request.method,
+            "status_code": response.status_code,
+            "duration_ms": int(elapsed_ms),
+            "tokens_used": tokens_used,
+            "cost_usd": cost_usd,
+            "user_agent": user_agent,
+            "ip_address": ip_address,
+            "request_metadata": {
+                "query_params": dict(request.query_params),
+                "content_type": request.headers.get("content-type", ""),
+            },
+        }
 
-            # Save to database
-            with get_db_session() as session:
-                session.add(request_log)
-                session.commit()
-
-            logger.info(
-                "Request processed",
-                extra={
-                    "request_id": request_id,
-                    "route": request.url.path,
-                    "method": request.method,
-                    "status_code": response.status_code,
-                    "duration_ms": duration_ms,
-                    "tenant_id": tenant_id,
-                    "user_id": user_id,
-                }
-            )
 
+def write_request_logs(request_logs: List[Dict[str, Any]]) -> None:
+    """Emit and persist a batch of request logs.
+    
+    Args:
+        request_logs: request_logs rows as column name to value dictionaries
+    """
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("\n".join(
+            f"{log['method']} {log['route']} {log['status_code']} {log['duration_ms']}ms "
+            f"request_id={log['request_id']}"
+            for log in request_logs
+        ))
+    
+    # Only authenticated requests can be attributed to a tenant
+    attributed = [log for log in request_logs if log["tenant_id"] and log["user_id"]]
+    if not attributed:
+        return
+        
+    session = get_session()
+    try:
+        # One multi-row INSERT through Core, without building ORM objects
+        session.execute(insert(RequestLog.__table__), attributed)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to create request logs: {e}")
+    finally:
+        session.close()
+
+
+async def drain_request_logs(queue: "asyncio.Queue[Dict[str, Any]]") -> None:
+    """Write queued request logs in batches until cancelled.
+    
+    A batch is written once it is full, or REQUEST_LOG_FLUSH_INTERVAL
+    seconds after its first log, so light traffic still takes one write
+    per interval rather than one per request.
+    
+    Args:
+        queue: Queue filled by RequestLoggingMiddleware
+    """
+    while True:
+        batch = [await queue.get()]
+        while len(batch) < REQUEST_LOG_BATCH_SIZE and not queue.empty():
+            batch.append(queue.get_nowait())
+        if len(batch) < REQUEST_LOG_BATCH_SIZE:
+            await asyncio.sleep(REQUEST_LOG_FLUSH_INTERVAL)
+            while len(batch) < REQUEST_LOG_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+        try:
+            # Database writes are blocking, so keep them off the event loop
+            await anyio.to_thread.run_sync(write_request_logs, batch)
         except Exception as e:
-            logger.error(f"Failed to create request log: {e}")
+            logger.error(f"Failed to write request logs: {e}")
+        finally:
+            for _ in batch:
+                queue.task_done()
 
 
 def require_scope(required_scope: str):
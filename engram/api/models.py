@@ -5,6 +5,9 @@ from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field, validator
 
+# Maximum characters accepted per memory text
+MAX_TEXT_LENGTH = 2048
+
 
 class TenantCreate(BaseModel):
     """Request model for creating a tenant."""
@@ -35,11 +38,10 @@ class MemoryUpsertRequest(BaseModel):
     @validator("texts")
     def validate_texts(cls, v):
         """Validate text lengths."""
-        for text in v:
-            if len(text) > 2048:
-                raise ValueError("Text length cannot exceed 2048 characters")
-            if not text.strip():
-                raise ValueError("Text cannot be empty")
+        if v and max(map(len, v)) > MAX_TEXT_LENGTH:
+            raise ValueError(f"Text length cannot exceed {MAX_TEXT_LENGTH} characters")
+        if not all(v) or any(map(str.isspace, v)):
+            raise ValueError("Text cannot be empty")
         return v
     
     @validator("importance")
@@ -1,5 +1,7 @@
 """Router proxy API routes for LLM completion with memory context."""
 
+import logging
+import uuid
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
@@ -15,6 +17,13 @@ from engram.api.middleware import require_scope, get_current_tenant_id, get_curr
 logger = get_logger(__name__)
 router = APIRouter(prefix="/v1/router", tags=["router"])
 
+SYSTEM_PROMPT = (
+    "You are a helpful AI assistant with access to the user's personal memory bank. "
+    "Use the provided memory context to give more relevant and personalized responses. "
+    "If the memory context is not relevant to the current question, you can ignore it. "
+    "Always be helpful, accurate, and respectful."
+)
+
 
 class ChatMessage(BaseModel):
     """Chat message model."""
@@ -69,6 +78,43 @@ def get_llm_provider(provider_name: str, model: Optional[str] = None) -> LLMProv
         raise ValueError(f"Unsupported provider: {provider_name}")
 
 
+def format_memory_context(memories: List[Dict[str, Any]]) -> str:
+    """Format retrieved memories as a context block for the system message.
+    
+    Args:
+        memories: Retrieved memory dictionaries
+        
+    Returns:
+        Memory context block, or an empty string if there are no memories
+    """
+    if not memories:
+        return ""
+    
+    lines = ["\n\n[MEMORY CONTEXT START]"]
+    modality_labels: Dict[str, str] = {}
+    for i, memory in enumerate(memories, 1):
+        modality = memory.get("modality", "text")
+        text = memory.get("text", "")
+        source = memory.get("source_uri", "")
+        
+        # Only a handful of modalities exist, so upper-case each one once
+        label = modality_labels.get(modality)
+        if label is None:
+            label = modality_labels[modality] = modality.upper()
+        
+        # Truncate long text
+        if len(text) > 200:
+            text = text[:200] + "..."
+        
+        line = f"- {i}. [{label}] {text}"
+        if source:
+            line += f" (from: {source})"
+        lines.append(line)
+    
+    lines.append("[MEMORY CONTEXT END]\n")
+    return "\n".join(lines)
+
+
 @router.post("/complete", response_model=RouterCompleteResponse)
 @require_scope("router:call")
 async def router_complete(request: RouterCompleteRequest):
@@ -89,11 +135,14 @@ async def router_complete(request: RouterCompleteRequest):
             raise HTTPException(status_code=400, detail="Authentication required")
         
         # Extract last user message for retrieval
-        user_messages = [msg for msg in request.messages if msg.role == "user"]
-        if not user_messages:
-            raise HTTPException(status_code=400, detail="No user messages found")
+        last_user_message = None
+        for msg in reversed(request.messages):
+            if msg.role == "user":
+                last_user_message = msg.content
+                break
         
-        last_user_message = user_messages[-1].content
+        if last_user_message is None:
+            raise HTTPException(status_code=400, detail="No user messages found")
         
         # Retrieve relevant memories
         retrieval_engine = RetrievalEngine()
@@ -114,33 +163,10 @@ async def router_complete(request: RouterCompleteRequest):
         )
         
         # Build memory context
-        memory_context = ""
-        if memories:
-            memory_context = "\n\n[MEMORY CONTEXT START]\n"
-            for i, memory in enumerate(memories, 1):
-                modality = memory.get("modality", "text")
-                text = memory.get("text", "")
-                source = memory.get("source_uri", "")
-                
-                # Truncate long text
-                if len(text) > 200:
-                    text = text[:200] + "..."
-                
-                memory_context += f"- {i}. [{modality.upper()}] {text}"
-                if source:
-                    memory_context += f" (from: {source})"
-                memory_context += "\n"
-            
-            memory_context += "[MEMORY CONTEXT END]\n"
+        memory_context = format_memory_context(memories)
         
         # Build system message with memory context
-        system_message = "You are a helpful AI assistant with access to the user's personal memory bank. "
-        system_message += "Use the provided memory context to give more relevant and personalized responses. "
-        system_message += "If the memory context is not relevant to the current question, you can ignore it. "
-        system_message += "Always be helpful, accurate, and respectful."
-        
-        if memory_context:
-            system_message += memory_context
+        system_message = SYSTEM_PROMPT + memory_context if memory_context else SYSTEM_PROMPT
         
         # Prepare messages for LLM
         llm_messages = [
@@ -165,21 +191,21 @@ async def router_complete(request: RouterCompleteRequest):
         usage = response.get("usage", {})
         
         # Generate trace ID (simplified)
-        import uuid
-        trace_id = str(uuid.uuid4())
-        
-        logger.info(
-            "Router completion completed",
-            extra={
-                "tenant_id": tenant_id,
-                "user_id": user_id,
-                "provider": request.provider,
-                "model": request.model,
-                "memories_used": len(memories),
-                "trace_id": trace_id,
-                "usage": usage,
-            }
-        )
+        trace_id = uuid.uuid4().hex
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Router completion completed",
+                extra={
+                    "tenant_id": tenant_id,
+                    "user_id": user_id,
+                    "provider": request.provider,
+                    "model": request.model,
+                    "memories_used": len(memories),
+                    "trace_id": trace_id,
+                    "usage": usage,
+                }
+            )
         
         return RouterCompleteResponse(
             output=output,
@@ -189,5 +215,5 @@ async def router_complete(request: RouterCompleteRequest):
         )
         
     except Exception as e:
-        logger.error(f"Router completion failed: {e}")
+        logger.error("Router completion failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Completion failed: {str(e)}")
@@ -1,6 +1,9 @@
 """API routes for the Engram service."""
 
-from typing import List
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
@@ -26,6 +29,44 @@ logger = get_logger(__name__)
 # Create router
 router = APIRouter()
 
+# Seconds an admin list total is served from cache, and how many are kept
+COUNT_CACHE_TTL_SECONDS = 10.0
+COUNT_CACHE_SIZE = 1024
+
+# Admin list totals by (tenant_id, user_id, active_only); user IDs come from
+# callers, so the cache is bounded and least recently used totals go first
+_count_cache: "OrderedDict[Tuple[str, Optional[str], bool], Tuple[float, int]]" = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+def _count_memories_cached(
+    memory_store: MemoryStore,
+    tenant_id: str,
+    user_id: Optional[str],
+    active_only: bool,
+) -> int:
+    """Count memories for the admin listing, reusing recent counts."""
+    key = (tenant_id, user_id, active_only)
+    with _count_cache_lock:
+        cached = _count_cache.get(key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                _count_cache.move_to_end(key)
+                return cached[1]
+            del _count_cache[key]
+    
+    total_count = memory_store.count_memories(
+        tenant_id=tenant_id,
+        user_id=user_id,
+        active_only=active_only,
+    )
+    with _count_cache_lock:
+        _count_cache[key] = (time.monotonic() + COUNT_CACHE_TTL_SECONDS, total_count)
+        _count_cache.move_to_end(key)
+        while len(_count_cache) > COUNT_CACHE_SIZE:
+            _count_cache.popitem(last=False)
+    return total_count
+
 
 @router.post("/tenants", response_model=TenantOut, tags=["tenants"])
 async def create_tenant(
@@ -169,10 +210,11 @@ async def list_memories(
             offset=offset,
         )
         
-        # Convert to response format
-        memory_results = []
-        for memory in memories:
-            memory_results.append(RetrieveResult(
+        # Convert to response format. Rows come straight from the database, so
+        # skip per-row validation and let the response model validate once.
+        construct = RetrieveResult.model_construct
+        memory_results = [
+            construct(
                 memory_id=memory.id,
                 text=memory.text,
                 score=0.0,  # No relevance score for listing
@@ -180,10 +222,17 @@ async def list_memories(
                 importance=memory.importance,
                 created_at=memory.created_at.isoformat(),
                 last_accessed_at=memory.last_accessed_at.isoformat(),
-            ))
+            )
+            for memory in memories
+        ]
         
-        # Get total count (simplified - in production you'd want a separate count query)
-        total_count = len(memory_results) + offset
+        # A partial page is the tail of the result set, so the total is known
+        # without a COUNT(*); only full (or empty past-the-end) pages need one.
+        page_size = len(memory_results)
+        if 0 < page_size < limit or (page_size == 0 and offset == 0):
+            total_count = offset + page_size
+        else:
+            total_count = _count_memories_cached(memory_store, tenant_id, user_id, active_only)
         
         return AdminMemoryListResponse(
             memories=memory_results,
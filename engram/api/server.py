@@ -1,14 +1,26 @@
 """FastAPI server application."""
 
+import asyncio
 import time
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from typing import AsyncGenerator
 
+import anyio
+import orjson
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-
-from engram.api.middleware import AuthMiddleware, RequestLoggingMiddleware
+from fastapi.responses import ORJSONResponse, Response
+
+from engram.api.auth import get_api_key_cache
+from engram.api.deps import get_retrieval_cache
+from engram.api.middleware import (
+    REQUEST_LOG_QUEUE_SIZE,
+    AuthMiddleware,
+    RequestLoggingMiddleware,
+    StaticCORSMiddleware,
+    drain_request_logs,
+)
 from engram.api.models import HealthResponse
 from engram.api.routes import router
 from engram.api.ingest_routes import router as ingest_router
@@ -19,14 +31,65 @@ from engram.api.processing_routes import router as processing_router
 from engram.api.analytics_routes import router as analytics_router
 from engram.api.connector_routes import router as connector_router
 from engram.api.memory_routes import router as memory_router
+from engram.connectors.http_client import close_http_client
+from engram.database.analytics import maintain_partitions
 from engram.utils.config import get_settings
 from engram.utils.logger import get_logger
 
 logger = get_logger(__name__)
 settings = get_settings()
 
-# Track application start time
-start_time = time.time()
+# Track application start time (monotonic, so uptime ignores wall-clock jumps)
+start_time = time.monotonic()
+
+# Seconds between analytics partition maintenance runs
+PARTITION_MAINTENANCE_INTERVAL = 24 * 3600
+
+# API docs are only served outside production; skipping them avoids building
+# the OpenAPI schema for every router and keeps the schema private
+DOCS_ENABLED = not settings.is_production
+
+# The root payload never changes, so encode it once at import time
+ROOT_PAYLOAD = orjson.dumps({
+    "service": "Engram",
+    "description": "Universal Memory Layer for Multi-Provider LLMs",
+    "version": "0.1.0",
+    "docs": "/docs" if DOCS_ENABLED else None,
+    "health": "/v1/health",
+})
+
+
+def _error(status_code: int, error_code: str, **extra) -> Response:
+    """Build a JSON error response.
+    
+    Args:
+        status_code: HTTP status code
+        error_code: Machine-readable error code, e.g. ``NOT_FOUND``
+        **extra: Additional payload fields
+        
+    Returns:
+        Pre-encoded JSON response
+    """
+    body = {
+        "error": error_code.replace("_", " ").capitalize(),
+        "error_code": error_code,
+        "timestamp": time.time(),
+        **extra,
+    }
+    # Validation error details can carry exception objects in their context
+    return Response(
+        content=orjson.dumps(body, default=str),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+async def run_partition_maintenance() -> None:
+    """Keep analytics partitions created and expired ones dropped until cancelled."""
+    while True:
+        # Partition DDL is blocking, so keep it off the event loop
+        await anyio.to_thread.run_sync(maintain_partitions)
+        await asyncio.sleep(PARTITION_MAINTENANCE_INTERVAL)
 
 
 @asynccontextmanager
@@ -39,10 +102,33 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info(f"Vector backend: {settings.vector_backend}")
     logger.info(f"Embeddings provider: {settings.default_embeddings_provider}")
     
+    # Blocking calls offloaded with anyio.to_thread share this limiter
+    # (40 threads by default)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.thread_pool_tokens
+    
+    # Request logs are written by a background task, off the request path
+    request_log_queue = asyncio.Queue(maxsize=REQUEST_LOG_QUEUE_SIZE)
+    request_log_task = asyncio.create_task(drain_request_logs(request_log_queue))
+    app.state.request_log_queue = request_log_queue
+    partition_task = asyncio.create_task(run_partition_maintenance())
+    
+    # Decide between shared and in-process caches before the first request,
+    # so an unreachable Redis is probed only once
+    await anyio.to_thread.run_sync(get_retrieval_cache)
+    await anyio.to_thread.run_sync(get_api_key_cache)
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Engram API server")
+    try:
+        await asyncio.wait_for(request_log_queue.join(), timeout=5.0)
+    except asyncio.TimeoutError:
+        logger.warning("Dropped %d unwritten request logs", request_log_queue.qsize())
+    request_log_task.cancel()
+    partition_task.cancel()
+    del app.state.request_log_queue
+    await close_http_client()
 
 
 # Create FastAPI application
@@ -50,20 +136,26 @@ app = FastAPI(
     title="Engram - Universal Memory Layer for LLMs",
     description="A provider-agnostic semantic memory service for LLM applications",
     version="0.1.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json",
+    docs_url="/docs" if DOCS_ENABLED else None,
+    redoc_url="/redoc" if DOCS_ENABLED else None,
+    openapi_url="/openapi.json" if DOCS_ENABLED else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Add CORS middleware. A wildcard origin without credentials needs no
+# per-request Origin matching, so static headers are enough.
+cors_origins = tuple(settings.cors_origins)
+if cors_origins == ("*",) and not settings.cors_allow_credentials:
+    app.add_middleware(StaticCORSMiddleware)
+else:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=cors_origins,
+        allow_credentials=settings.cors_allow_credentials,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
 # Add custom middleware
 app.add_middleware(AuthMiddleware, require_auth=True)
@@ -84,53 +176,38 @@ app.include_router(memory_router, prefix=settings.api_v1_str)
 @app.get("/", tags=["root"])
 async def root():
     """Root endpoint."""
-    return {
-        "service": "Engram",
-        "description": "Universal Memory Layer for Multi-Provider LLMs",
-        "version": "0.1.0",
-        "docs": "/docs",
-        "health": "/v1/health",
-    }
+    return Response(content=ROOT_PAYLOAD, media_type="application/json")
 
 
 @app.get("/v1/health", response_model=HealthResponse, tags=["health"])
 async def health_check():
     """Health check endpoint."""
-    uptime = time.time() - start_time
+    uptime = time.monotonic() - start_time
     
-    return HealthResponse(
-        status="ok",
-        uptime_seconds=uptime,
-        version="0.1.0",
-        timestamp=time.time(),
-    )
+    # Returning a response directly skips response_model validation; the
+    # model is kept on the route for the OpenAPI schema only.
+    return ORJSONResponse({
+        "status": "ok",
+        "uptime_seconds": uptime,
+        "version": "0.1.0",
+        "timestamp": datetime.now(timezone.utc),
+    })
 
 
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
     """Handle 404 errors."""
-    return JSONResponse(
-        status_code=404,
-        content={
-            "error": "Not found",
-            "error_code": "NOT_FOUND",
-            "path": str(request.url.path),
-            "timestamp": time.time(),
-        }
-    )
+    # scope["path"] avoids building a Starlette URL object per request
+    return _error(404, "NOT_FOUND", path=request.scope.get("path", ""))
 
 
 @app.exception_handler(422)
 async def validation_error_handler(request, exc):
     """Handle validation errors."""
-    return JSONResponse(
-        status_code=422,
-        content={
-            "error": "Validation error",
-            "error_code": "VALIDATION_ERROR",
-            "details": exc.errors() if hasattr(exc, 'errors') else str(exc),
-            "timestamp": time.time(),
-        }
+    return _error(
+        422,
+        "VALIDATION_ERROR",
+        details=exc.errors() if hasattr(exc, 'errors') else str(exc),
     )
 
 
@@ -138,11 +215,19 @@ def main():
     """Main entry point for running the server."""
     import uvicorn
     
+    # The reloader only supports a single worker process. Caches such as the
+    # retrieval and API key caches live in each process, so extra workers
+    # are opt-in through WORKERS
+    workers = 1 if settings.debug else settings.workers
+    
     uvicorn.run(
         "engram.api.server:app",
         host="0.0.0.0",
         port=settings.port,
         reload=settings.debug,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
         log_level=settings.log_level.lower(),
     )
 
@@ -1,9 +1,21 @@
 """Connectors for external data sources."""
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from .base_connector import BaseConnector
-from .google_drive import GoogleDriveConnector
-from .notion import NotionConnector
-from .slack import SlackConnector
+
+if TYPE_CHECKING:
+    from .google_drive import GoogleDriveConnector
+    from .notion import NotionConnector
+    from .slack import SlackConnector
+
+# Concrete connectors pull in their SDKs, so they are imported on first access
+_LAZY_CONNECTORS = {
+    "GoogleDriveConnector": ".google_drive",
+    "NotionConnector": ".notion",
+    "SlackConnector": ".slack",
+}
 
 __all__ = [
     "BaseConnector",
@@ -11,3 +23,14 @@ __all__ = [
     "NotionConnector",
     "SlackConnector",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import connector classes lazily (PEP 562)."""
+    module_name = _LAZY_CONNECTORS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,7 +1,8 @@
 """Base connector class for external data sources."""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Union
 from datetime import datetime
 
 from engram.utils.logger import get_logger
@@ -10,7 +11,18 @@ logger = get_logger(__name__)
 
 
 class BaseConnector(ABC):
-    """Base class for all data source connectors."""
+    """Base class for all data source connectors.
+    
+    Connector methods are coroutines. Implementations backed by blocking
+    SDKs should wrap those calls in ``anyio.to_thread.run_sync`` so they run
+    on the shared worker thread pool instead of stalling the event loop.
+    
+    Connectors declare ``__slots__`` so instances carry no ``__dict__``;
+    subclasses should list the attributes they add in their own
+    ``__slots__``.
+    """
+
+    __slots__ = ("config", "name")
 
     def __init__(self, config: Dict[str, Any]):
         """Initialize connector with configuration.
@@ -54,6 +66,33 @@ class BaseConnector(ABC):
         """
         pass
 
+    async def fetch_items(
+        self,
+        item_ids: List[str],
+        concurrency: int = 16,
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        """Fetch several items concurrently.
+        
+        Args:
+            item_ids: Item identifiers
+            concurrency: Maximum number of fetches in flight at once
+            
+        Returns:
+            Item data in the same order as item_ids; a failed fetch yields
+            its exception instead of aborting the batch
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        fetch_item = self.fetch_item
+        
+        async def fetch_one(item_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await fetch_item(item_id)
+        
+        return await asyncio.gather(
+            *(fetch_one(item_id) for item_id in item_ids),
+            return_exceptions=True,
+        )
+
     @abstractmethod
     async def get_last_sync_time(self) -> Optional[datetime]:
         """Get the last synchronization time.
@@ -72,17 +111,16 @@ class BaseConnector(ABC):
         """
         pass
 
-    def validate_config(self, required_fields: List[str]) -> bool:
+    def validate_config(self, required_fields: Iterable[str]) -> bool:
         """Validate connector configuration.
         
         Args:
-            required_fields: List of required configuration fields
+            required_fields: Required configuration fields
             
         Returns:
             True if configuration is valid
         """
-        for field in required_fields:
-            if field not in self.config:
-                logger.error(f"Missing required config field: {field}")
-                return False
-        return True
+        missing = set(required_fields) - self.config.keys()
+        if missing:
+            logger.error("Missing required config fields: %s", sorted(missing))
+        return not missing
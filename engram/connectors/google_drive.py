@@ -2,9 +2,10 @@
 
 import asyncio
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 from engram.connectors.base_connector import BaseConnector
+from engram.connectors.retry import connector_retry
 from engram.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -13,6 +14,8 @@ logger = get_logger(__name__)
 class GoogleDriveConnector(BaseConnector):
     """Google Drive connector for document synchronization."""
 
+    __slots__ = ("credentials_path", "token_path", "folder_id", "_service")
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize Google Drive connector.
         
@@ -53,6 +56,7 @@ class GoogleDriveConnector(BaseConnector):
         try:
             # Placeholder implementation
             logger.info(f"Listing Google Drive items (limit: {limit})")
+            now_iso = datetime.now(timezone.utc).isoformat()
             
             # In a real implementation, you would:
             # 1. Use the Google Drive API to list files
@@ -64,7 +68,7 @@ class GoogleDriveConnector(BaseConnector):
                     "id": "placeholder_file_id",
                     "name": "Example Document.pdf",
                     "mime_type": "application/pdf",
-                    "modified_time": datetime.now().isoformat(),
+                    "modified_time": now_iso,
                     "size": 1024000,
                     "web_view_link": "https://drive.google.com/file/d/placeholder/view",
                 }
@@ -74,6 +78,7 @@ class GoogleDriveConnector(BaseConnector):
             logger.error(f"Failed to list Google Drive items: {e}")
             return []
 
+    @connector_retry
     async def fetch_item(self, item_id: str) -> Dict[str, Any]:
         """Fetch a Google Drive file.
         
@@ -85,6 +90,7 @@ class GoogleDriveConnector(BaseConnector):
         """
         try:
             logger.info(f"Fetching Google Drive item: {item_id}")
+            now_iso = datetime.now(timezone.utc).isoformat()
             
             # Placeholder implementation
             # In a real implementation, you would:
@@ -97,7 +103,7 @@ class GoogleDriveConnector(BaseConnector):
                 "content": b"PDF content placeholder",
                 "mime_type": "application/pdf",
                 "size": 1024000,
-                "modified_time": datetime.now().isoformat(),
+                "modified_time": now_iso,
             }
             
         except Exception as e:
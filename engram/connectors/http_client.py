@@ -0,0 +1,40 @@
+"""Shared HTTP client for connectors that call remote APIs."""
+
+from typing import Optional
+
+import httpx
+
+from engram.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Pooled client shared by every connector instance in this process
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared connector HTTP client, creating it on first use.
+
+    Returns:
+        Async HTTP client with keep-alive connection pooling
+    """
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            timeout=30.0,
+        )
+
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared connector HTTP client if it was created."""
+    global _http_client
+
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+        logger.info("Closed connector HTTP client")
+
+    _http_client = None
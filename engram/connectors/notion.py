@@ -1,9 +1,13 @@
 """Notion connector for page synchronization."""
 
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+
+import httpx
 
 from engram.connectors.base_connector import BaseConnector
+from engram.connectors.retry import connector_retry
+from engram.connectors.http_client import get_http_client
 from engram.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -12,16 +16,21 @@ logger = get_logger(__name__)
 class NotionConnector(BaseConnector):
     """Notion connector for page synchronization."""
 
-    def __init__(self, config: Dict[str, Any]):
+    __slots__ = ("api_key", "database_id", "_headers", "_client")
+
+    def __init__(self, config: Dict[str, Any], http_client: Optional[httpx.AsyncClient] = None):
         """Initialize Notion connector.
         
         Args:
             config: Configuration dict with 'api_key' and 'database_id'
+            http_client: HTTP client for Notion API calls (defaults to the
+                shared pooled client, so connections are reused across syncs)
         """
         super().__init__(config)
         self.api_key = config.get("api_key")
         self.database_id = config.get("database_id")
         self._headers = {"Authorization": f"Bearer {self.api_key}"}
+        self._client = http_client or get_http_client()
 
     async def authenticate(self) -> bool:
         """Authenticate with Notion API.
@@ -50,6 +59,7 @@ class NotionConnector(BaseConnector):
         """
         try:
             logger.info(f"Listing Notion pages (limit: {limit})")
+            now_iso = datetime.now(timezone.utc).isoformat()
             
             # Placeholder implementation
             # In a real implementation, you would:
@@ -61,8 +71,8 @@ class NotionConnector(BaseConnector):
                     "id": "placeholder_page_id",
                     "title": "Example Notion Page",
                     "url": "https://notion.so/placeholder",
-                    "last_edited_time": datetime.now().isoformat(),
-                    "created_time": datetime.now().isoformat(),
+                    "last_edited_time": now_iso,
+                    "created_time": now_iso,
                     "properties": {
                         "tags": ["documentation", "example"],
                         "status": "published",
@@ -74,6 +84,7 @@ class NotionConnector(BaseConnector):
             logger.error(f"Failed to list Notion pages: {e}")
             return []
 
+    @connector_retry
     async def fetch_item(self, item_id: str) -> Dict[str, Any]:
         """Fetch a Notion page.
         
@@ -85,6 +96,7 @@ class NotionConnector(BaseConnector):
         """
         try:
             logger.info(f"Fetching Notion page: {item_id}")
+            now_iso = datetime.now(timezone.utc).isoformat()
             
             # Placeholder implementation
             # In a real implementation, you would:
@@ -97,8 +109,8 @@ class NotionConnector(BaseConnector):
                 "title": "Example Notion Page",
                 "content": "# Example Page\n\nThis is placeholder content from Notion.",
                 "url": "https://notion.so/placeholder",
-                "last_edited_time": datetime.now().isoformat(),
-                "created_time": datetime.now().isoformat(),
+                "last_edited_time": now_iso,
+                "created_time": now_iso,
             }
             
         except Exception as e:
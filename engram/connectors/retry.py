@@ -0,0 +1,88 @@
+"""Retry policy for connector calls to throttled external APIs."""
+
+import asyncio
+from typing import Optional
+
+import httpx
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+from engram.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Rate limiting and transient upstream failures; other 4xx responses will not
+# succeed on a retry
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+MAX_RETRY_WAIT_SECONDS = 10.0
+
+_backoff = wait_exponential_jitter(initial=0.5, max=MAX_RETRY_WAIT_SECONDS)
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Check whether a failed connector call is worth retrying.
+    
+    Args:
+        exc: Exception raised by the call
+        
+    Returns:
+        True for timeouts, connection errors and retryable HTTP statuses
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError))
+
+
+def _retry_after_seconds(exc: Optional[BaseException]) -> Optional[float]:
+    """Read a delta-seconds ``Retry-After`` header from an HTTP error."""
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+        
+    retry_after = exc.response.headers.get("retry-after")
+    try:
+        return max(0.0, float(retry_after)) if retry_after is not None else None
+    except ValueError:
+        # HTTP-date form; fall back to exponential backoff
+        return None
+
+
+def wait_retry_after(retry_state: RetryCallState) -> float:
+    """Wait as long as the server asked, otherwise back off with jitter.
+    
+    Args:
+        retry_state: Tenacity state for the failed attempt
+        
+    Returns:
+        Seconds to sleep before the next attempt
+    """
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    retry_after = _retry_after_seconds(exc)
+    if retry_after is not None:
+        return min(retry_after, MAX_RETRY_WAIT_SECONDS)
+    return _backoff(retry_state)
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    """Log a retry before sleeping."""
+    logger.warning(
+        "Retrying %s after attempt %d failed: %s",
+        retry_state.fn.__qualname__ if retry_state.fn else "connector call",
+        retry_state.attempt_number,
+        retry_state.outcome.exception() if retry_state.outcome else None,
+    )
+
+
+# Decorator for connector methods that call external APIs. The original
+# exception is re-raised once attempts run out, so callers see the real error.
+connector_retry = retry(
+    stop=stop_after_attempt(5),
+    wait=wait_retry_after,
+    retry=retry_if_exception(is_transient_error),
+    before_sleep=_log_retry,
+    reraise=True,
+)
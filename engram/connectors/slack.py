@@ -1,16 +1,51 @@
 """Slack connector for channel export synchronization."""
 
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional
+from datetime import datetime, timezone
+
+import anyio
+import ijson
+import numpy as np
+import orjson
 
 from engram.connectors.base_connector import BaseConnector
 from engram.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Most messages fetch_item() returns for one channel; larger channels are
+# cut short and should be read with iter_messages()
+FETCH_ITEM_MAX_MESSAGES = 10000
+
+# Messages parsed per worker-thread hop while streaming a channel
+MESSAGE_BATCH_SIZE = 500
+
+
+def _read_json(path: Path) -> Any:
+    """Read a JSON file from a Slack export.
+    
+    Args:
+        path: Path to the JSON file
+        
+    Returns:
+        Parsed JSON content
+    """
+    # orjson parses the raw bytes directly, skipping the UTF-8 decode step
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
 
 class SlackConnector(BaseConnector):
-    """Slack connector for channel export synchronization."""
+    """Slack connector for channel export synchronization.
+    
+    Reads a standard Slack workspace export: ``channels.json`` and
+    ``users.json`` at the top level, plus one directory per channel holding
+    a JSON array of messages for each day.
+    """
+
+    __slots__ = ("workspace_url", "export_path", "channel_ids")
 
     def __init__(self, config: Dict[str, Any]):
         """Initialize Slack connector.
@@ -30,9 +65,14 @@ class SlackConnector(BaseConnector):
             True if authentication successful
         """
         try:
-            # Placeholder implementation
-            # In a real implementation, you would validate the export path
-            logger.info("Slack authentication (placeholder)")
+            # Exports are read from disk, so "authenticating" means the
+            # export directory is present and readable
+            channels_file = Path(self.export_path or "") / "channels.json"
+            if not channels_file.is_file():
+                logger.error(f"Slack export not found at: {self.export_path}")
+                return False
+                
+            logger.info("Slack export located")
             return True
             
         except Exception as e:
@@ -51,95 +91,274 @@ class SlackConnector(BaseConnector):
         try:
             logger.info(f"Listing Slack channels (limit: {limit})")
             
-            # Placeholder implementation
-            # In a real implementation, you would:
-            # 1. Parse the Slack export directory structure
-            # 2. Read channel metadata from JSON files
-            # 3. Return channel information
-            
+            channels = await anyio.to_thread.run_sync(self._load_channels)
+            if limit is not None:
+                channels = channels[:limit]
+                
             return [
                 {
-                    "id": "C1234567890",
-                    "name": "general",
-                    "display_name": "General",
-                    "topic": "General discussion",
-                    "purpose": "Company-wide announcements and discussion",
-                    "member_count": 150,
-                    "created": datetime.now().isoformat(),
-                    "export_path": f"{self.export_path}/general",
+                    "id": channel.get("id"),
+                    "name": channel.get("name"),
+                    "display_name": channel.get("name"),
+                    "topic": channel.get("topic", {}).get("value", ""),
+                    "purpose": channel.get("purpose", {}).get("value", ""),
+                    "member_count": len(channel.get("members", [])),
+                    "created": datetime.fromtimestamp(channel.get("created", 0), tz=timezone.utc).isoformat(),
+                    "export_path": f"{self.export_path}/{channel.get('name')}",
                 }
+                for channel in channels
             ]
             
         except Exception as e:
             logger.error(f"Failed to list Slack channels: {e}")
             return []
 
-    async def fetch_item(self, item_id: str) -> Dict[str, Any]:
+    async def iter_messages(self, item_id: str, batch_size: int = MESSAGE_BATCH_SIZE) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a channel's messages without loading the whole channel.
+        
+        Args:
+            item_id: Slack channel ID
+            batch_size: Messages parsed per worker-thread hop
+            
+        Yields:
+            Normalized messages in date order
+        """
+        channel = await anyio.to_thread.run_sync(self._find_channel, item_id)
+        users = await anyio.to_thread.run_sync(self._load_users)
+        async for message in self._stream_messages(channel["name"], users, batch_size):
+            yield message
+
+    async def _stream_messages(
+        self,
+        channel_name: str,
+        users: Dict[str, Dict[str, Any]],
+        batch_size: int,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Parse normalized messages in batches on the worker thread pool."""
+        messages = self._iter_channel_messages(channel_name, users)
+        try:
+            while True:
+                batch = await anyio.to_thread.run_sync(list, islice(messages, batch_size))
+                if not batch:
+                    break
+                for message in batch:
+                    yield message
+        finally:
+            # Close the current day file even when the caller stops early
+            messages.close()
+
+    async def fetch_message_columns(self, item_id: str) -> Dict[str, Any]:
+        """Fetch a channel's messages in columnar form.
+        
+        Each field is stored as one parallel column rather than one dict per
+        message, and timestamps are a float64 array so callers can sort or
+        filter by time with vectorized NumPy operations.
+        
+        Args:
+            item_id: Slack channel ID
+            
+        Returns:
+            Dict with 'user', 'username', 'text' and 'thread_ts' lists and a
+            'ts' float64 array, all of equal length
+        """
+        try:
+            logger.info(f"Fetching Slack channel columns: {item_id}")
+            return await anyio.to_thread.run_sync(self._load_message_columns, item_id)
+            
+        except Exception as e:
+            logger.error(f"Failed to fetch Slack channel {item_id}: {e}")
+            raise
+
+    async def fetch_item(self, item_id: str, max_messages: int = FETCH_ITEM_MAX_MESSAGES) -> Dict[str, Any]:
         """Fetch Slack channel messages.
         
+        Only the first ``max_messages`` messages are kept, so one busy
+        channel cannot hold its whole history in memory; use
+        iter_messages() to read a channel in full.
+        
         Args:
             item_id: Slack channel ID
+            max_messages: Most messages to return
             
         Returns:
-            Channel data including messages
+            Channel data including messages, with 'truncated' set when the
+            channel holds more than max_messages
         """
         try:
             logger.info(f"Fetching Slack channel: {item_id}")
             
-            # Placeholder implementation
-            # In a real implementation, you would:
-            # 1. Parse the channel's JSON export files
-            # 2. Extract messages, users, and metadata
-            # 3. Format as chat items for ingestion
+            # File reads and JSON parsing are blocking, so run them on the
+            # worker thread pool
+            channel = await anyio.to_thread.run_sync(self._find_channel, item_id)
+            users = await anyio.to_thread.run_sync(self._load_users)
+            
+            messages: List[Dict[str, Any]] = []
+            truncated = False
+            stream = self._stream_messages(channel["name"], users, min(max_messages + 1, MESSAGE_BATCH_SIZE))
+            try:
+                async for message in stream:
+                    if len(messages) == max_messages:
+                        truncated = True
+                        break
+                    messages.append(message)
+            finally:
+                await stream.aclose()
+                
+            if truncated:
+                logger.warning(f"Slack channel {item_id} truncated to {max_messages} messages")
+                
+            message_users = {message["user"] for message in messages}
             
             return {
                 "id": item_id,
-                "name": "general",
-                "messages": [
-                    {
-                        "user": "U1234567890",
-                        "username": "john.doe",
-                        "text": "Hello everyone!",
-                        "ts": "1640995200.000100",
-                        "thread_ts": None,
-                    },
-                    {
-                        "user": "U0987654321", 
-                        "username": "jane.smith",
-                        "text": "Hi John! Welcome to the channel.",
-                        "ts": "1640995260.000200",
-                        "thread_ts": None,
-                    }
-                ],
+                "name": channel["name"],
+                "messages": messages,
+                "truncated": truncated,
                 "users": {
-                    "U1234567890": {
-                        "name": "john.doe",
-                        "real_name": "John Doe",
-                        "profile": {
-                            "display_name": "John",
-                            "email": "john@example.com",
-                        }
-                    },
-                    "U0987654321": {
-                        "name": "jane.smith",
-                        "real_name": "Jane Smith", 
-                        "profile": {
-                            "display_name": "Jane",
-                            "email": "jane@example.com",
-                        }
-                    }
+                    user_id: profile
+                    for user_id, profile in users.items()
+                    if user_id in message_users
                 },
                 "channel_info": {
-                    "name": "general",
-                    "topic": "General discussion",
-                    "purpose": "Company-wide announcements and discussion",
-                }
+                    "name": channel["name"],
+                    "topic": channel.get("topic", {}).get("value", ""),
+                    "purpose": channel.get("purpose", {}).get("value", ""),
+                },
             }
             
         except Exception as e:
             logger.error(f"Failed to fetch Slack channel {item_id}: {e}")
             raise
 
+    def _load_channels(self) -> List[Dict[str, Any]]:
+        """Load channel records from the export, honouring channel_ids.
+        
+        Returns:
+            List of raw Slack channel records
+        """
+        channels = _read_json(Path(self.export_path) / "channels.json")
+        
+        if self.channel_ids:
+            wanted = set(self.channel_ids)
+            channels = [channel for channel in channels if channel.get("id") in wanted]
+            
+        return channels
+
+    def _load_users(self) -> Dict[str, Dict[str, Any]]:
+        """Load user profiles from the export keyed by user ID.
+        
+        Returns:
+            Mapping of user ID to profile summary
+        """
+        users_file = Path(self.export_path) / "users.json"
+        if not users_file.is_file():
+            return {}
+            
+        return {
+            user["id"]: {
+                "name": user.get("name"),
+                "real_name": user.get("real_name"),
+                "profile": {
+                    "display_name": user.get("profile", {}).get("display_name"),
+                    "email": user.get("profile", {}).get("email"),
+                },
+            }
+            for user in _read_json(users_file)
+        }
+
+    def _find_channel(self, item_id: str) -> Dict[str, Any]:
+        """Find a channel record in the export.
+        
+        Args:
+            item_id: Slack channel ID
+            
+        Returns:
+            Raw Slack channel record
+            
+        Raises:
+            ValueError: If the channel is not in the export
+        """
+        for channel in self._load_channels():
+            if channel.get("id") == item_id:
+                return channel
+        
+        raise ValueError(f"Slack channel not found in export: {item_id}")
+
+    def _iter_raw_messages(self, channel_name: str) -> Iterator[Dict[str, Any]]:
+        """Stream raw message records from a channel's export files.
+        
+        Day files are parsed incrementally with ijson, so memory use stays
+        flat regardless of how large a channel export is.
+        
+        Args:
+            channel_name: Channel directory name in the export
+            
+        Yields:
+            Raw Slack message records in date order
+        """
+        # One file per day, named YYYY-MM-DD.json, so name order is date order
+        for day_file in sorted((Path(self.export_path) / channel_name).glob("*.json")):
+            with open(day_file, "rb") as f:
+                yield from ijson.items(f, "item", use_float=True)
+
+    def _iter_channel_messages(
+        self,
+        channel_name: str,
+        users: Dict[str, Dict[str, Any]],
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream normalized messages from a channel's export files.
+        
+        Args:
+            channel_name: Channel directory name in the export
+            users: User profiles keyed by user ID
+            
+        Yields:
+            Normalized messages in date order
+        """
+        for message in self._iter_raw_messages(channel_name):
+            user_id = message.get("user")
+            yield {
+                "user": user_id,
+                "username": users.get(user_id, {}).get("name"),
+                "text": message.get("text", ""),
+                "ts": message.get("ts"),
+                "thread_ts": message.get("thread_ts"),
+            }
+
+    def _load_message_columns(self, item_id: str) -> Dict[str, Any]:
+        """Load a channel's messages from the export as parallel columns.
+        
+        Args:
+            item_id: Slack channel ID
+            
+        Returns:
+            Columnar message data
+        """
+        channel = self._find_channel(item_id)
+        users = self._load_users()
+        
+        user_col: List[Optional[str]] = []
+        username_col: List[Optional[str]] = []
+        text_col: List[str] = []
+        ts_col: List[str] = []
+        thread_ts_col: List[Optional[str]] = []
+        
+        for message in self._iter_raw_messages(channel["name"]):
+            user_id = message.get("user")
+            user_col.append(user_id)
+            username_col.append(users.get(user_id, {}).get("name"))
+            text_col.append(message.get("text", ""))
+            ts_col.append(message.get("ts") or 0.0)
+            thread_ts_col.append(message.get("thread_ts"))
+        
+        return {
+            "user": user_col,
+            "username": username_col,
+            "text": text_col,
+            "ts": np.fromiter((float(ts) for ts in ts_col), dtype=np.float64, count=len(ts_col)),
+            "thread_ts": thread_ts_col,
+        }
+
     async def get_last_sync_time(self) -> Optional[datetime]:
         """Get last synchronization time.
         
@@ -1,9 +1,22 @@
 """Core business logic modules."""
 
-from engram.core.memory_store import MemoryStore
-from engram.core.embeddings import EmbeddingsFacade
-from engram.core.retrieval import RetrievalEngine
-from engram.core.consolidation import ConsolidationEngine
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from engram.core.memory_store import MemoryStore
+    from engram.core.embeddings import EmbeddingsFacade
+    from engram.core.retrieval import RetrievalEngine
+    from engram.core.consolidation import ConsolidationEngine
+
+# These modules load numpy, torch and vector backends, so importing a single
+# submodule (e.g. engram.core.forgetting) must not drag all of them in
+_LAZY_EXPORTS = {
+    "MemoryStore": "engram.core.memory_store",
+    "EmbeddingsFacade": "engram.core.embeddings",
+    "RetrievalEngine": "engram.core.retrieval",
+    "ConsolidationEngine": "engram.core.consolidation",
+}
 
 __all__ = [
     "MemoryStore",
@@ -11,3 +24,14 @@ __all__ = [
     "RetrievalEngine", 
     "ConsolidationEngine",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import core classes lazily (PEP 562)."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
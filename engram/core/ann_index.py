@@ -0,0 +1,459 @@
+"""Persistent approximate nearest-neighbour index for memory consolidation."""
+
+import atexit
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
+
+from engram.utils.config import get_settings
+from engram.utils.logger import get_logger
+
+try:
+    # Installed with chromadb as chroma-hnswlib
+    import hnswlib
+except ImportError:  # pragma: no cover - depends on the environment
+    hnswlib = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Capacity of a freshly created index; full indexes double in size
+INITIAL_CAPACITY = 1024
+
+# Consecutive failed saves after which a namespace's unsaved changes are
+# dropped rather than kept in memory; the index is rebuilt from memories
+# missing from it the next time consolidation runs
+MAX_SAVE_FAILURES = 3
+
+
+def ann_available() -> bool:
+    """Check whether hnswlib is installed."""
+    return hnswlib is not None
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """Identify the saved version of a file, or None if it is missing.
+    
+    Saves move new files into place rather than rewriting them, so another
+    inode or modification time means another writer saved in between.
+    """
+    try:
+        stat = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+class _NamespaceIndex:
+    """HNSW index for one (tenant, user) plus its label to memory ID mapping."""
+    
+    __slots__ = ("index", "memory_ids", "labels", "live_count")
+
+    def __init__(self, index, memory_ids: List[Optional[str]]):
+        self.index = index
+        self.memory_ids = memory_ids
+        self.labels = {
+            memory_id: label for label, memory_id in enumerate(memory_ids) if memory_id is not None
+        }
+        self.live_count = len(self.labels)
+
+    def add(self, memory_ids: Sequence[str], vectors: np.ndarray, replace: bool) -> List[int]:
+        """Add or update vectors; returns the rows that were written."""
+        labels = self.labels
+        keep = [
+            row for row, memory_id in enumerate(memory_ids)
+            if replace or memory_id not in labels
+        ]
+        if not keep:
+            return keep
+            
+        new_labels = []
+        for row in keep:
+            memory_id = memory_ids[row]
+            label = labels.get(memory_id)
+            if label is None:
+                label = len(self.memory_ids)
+                self.memory_ids.append(memory_id)
+                labels[memory_id] = label
+                self.live_count += 1
+            new_labels.append(label)
+            
+        capacity = self.index.get_max_elements()
+        if len(self.memory_ids) > capacity:
+            self.index.resize_index(max(len(self.memory_ids), 2 * capacity))
+            
+        self.index.add_items(vectors[keep], np.asarray(new_labels, dtype=np.int64))
+        return keep
+
+    def remove(self, memory_ids: Sequence[str]) -> bool:
+        """Remove memories; returns whether anything changed."""
+        removed = 0
+        for memory_id in memory_ids:
+            label = self.labels.pop(memory_id, None)
+            if label is not None:
+                self.index.mark_deleted(label)
+                self.memory_ids[label] = None
+                removed += 1
+                
+        self.live_count -= removed
+        return removed > 0
+
+
+class _Namespace:
+    """Loaded state of one namespace, guarded by its own lock.
+    
+    ``pending`` holds the changes made since the last save, so they can be
+    applied again on top of a newer copy saved by another process.
+    """
+    
+    __slots__ = ("lock", "entry", "stamp", "pending", "users", "failures")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entry: Optional[_NamespaceIndex] = None
+        self.stamp: Optional[Tuple[int, int]] = None
+        self.pending: List[Tuple] = []
+        self.users = 0
+        self.failures = 0
+
+
+class MemoryANNIndex:
+    """HNSW indexes of memory embeddings, one per (tenant, user).
+    
+    Vectors are added as memories are written, so consolidation can look up
+    each memory's nearest neighbours instead of comparing every pair. Each
+    index is saved under ``INDEX_PATH`` together with the memory IDs behind
+    its integer labels, and loaded again on first use.
+    
+    Writes only change the loaded index; a background thread saves changed
+    namespaces every ``ANN_FLUSH_INTERVAL`` seconds, and again at exit.
+    Each namespace has its own lock, so saving or querying one user does
+    not hold up the others, and at most ``ANN_CACHE_SIZE`` namespaces stay
+    loaded. Processes sharing ``INDEX_PATH`` take a file lock per namespace
+    to save, pick up indexes another process saved, and reapply their own
+    unsaved changes on top.
+    """
+
+    def __init__(
+        self,
+        index_path: Optional[str] = None,
+        m: Optional[int] = None,
+        ef_construction: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        cache_size: Optional[int] = None,
+    ):
+        """Initialize the index store.
+        
+        Args:
+            index_path: Directory for persisted indexes
+            m: HNSW graph degree
+            ef_construction: Candidate list size while inserting
+            ef_search: Minimum candidate list size while querying
+            flush_interval: Seconds between background saves; 0 saves on
+                every write instead
+            cache_size: Most namespaces kept loaded
+            
+        Raises:
+            ImportError: If hnswlib is not installed
+        """
+        if hnswlib is None:
+            raise ImportError("hnswlib not available. Install with: pip install chroma-hnswlib")
+            
+        self.index_path = Path(index_path or settings.index_path)
+        self.m = m or settings.hnsw_m
+        self.ef_construction = ef_construction or settings.hnsw_ef_construction
+        self.ef_search = ef_search or settings.hnsw_ef_search
+        self.flush_interval = settings.ann_flush_interval if flush_interval is None else flush_interval
+        self.cache_size = settings.ann_cache_size if cache_size is None else cache_size
+        self._namespaces: "OrderedDict[str, _Namespace]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        
+        self._flusher = None
+        if self.flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, name="ann-index-flush", daemon=True
+            )
+            self._flusher.start()
+            atexit.register(self.close)
+
+    def _paths(self, namespace: str) -> Tuple[Path, Path]:
+        """Get the index and ID file paths for a namespace."""
+        # Hash the namespace so tenant and user IDs never form a path
+        digest = hashlib.blake2b(namespace.encode("utf-8"), digest_size=16).hexdigest()
+        return self.index_path / f"{digest}.bin", self.index_path / f"{digest}.ids.json"
+
+    @contextmanager
+    def _file_lock(self, namespace: str, shared: bool = False) -> Iterator[None]:
+        """Hold a namespace's file lock against other processes."""
+        if fcntl is None:
+            yield
+            return
+        index_file, _ = self._paths(namespace)
+        self.index_path.mkdir(parents=True, exist_ok=True)
+        with open(index_file.with_suffix(".lock"), "a+b") as handle:
+            fcntl.flock(handle, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _use(self, namespace: str) -> Iterator[_Namespace]:
+        """Lock a namespace, keeping it loaded while in use."""
+        with self._lock:
+            state = self._namespaces.get(namespace)
+            if state is None:
+                state = self._namespaces[namespace] = _Namespace()
+            self._namespaces.move_to_end(namespace)
+            state.users += 1
+        try:
+            with state.lock:
+                yield state
+        finally:
+            with self._lock:
+                state.users -= 1
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used namespaces; callers must hold the lock.
+        
+        Namespaces in use or with unsaved changes are skipped until the
+        flusher has saved them, so the cache can briefly exceed its size.
+        """
+        excess = len(self._namespaces) - self.cache_size
+        if excess <= 0:
+            return
+        for namespace, state in list(self._namespaces.items()):
+            if excess <= 0:
+                break
+            if not state.users and not state.pending:
+                del self._namespaces[namespace]
+                excess -= 1
+
+    def _load(self, namespace: str, state: _Namespace, locked: bool = False) -> None:
+        """Load the saved index, then reapply unsaved changes on top.
+        
+        Args:
+            namespace: Namespace identifier
+            state: Locked namespace state
+            locked: Whether the caller already holds the namespace file lock
+        """
+        index_file, ids_file = self._paths(namespace)
+        with nullcontext() if locked else self._file_lock(namespace, shared=True):
+            stamp = _file_stamp(ids_file)
+            if stamp is None:
+                return
+            stored = orjson.loads(ids_file.read_bytes())
+            index = hnswlib.Index(space="cosine", dim=stored["dimension"])
+            # Deleted labels are saved with the index and stay deleted
+            index.load_index(str(index_file), max_elements=max(len(stored["ids"]), INITIAL_CAPACITY))
+            
+        state.entry = _NamespaceIndex(index, stored["ids"])
+        state.stamp = stamp
+        for operation, *args in state.pending:
+            getattr(state.entry, operation)(*args)
+        logger.debug(f"Loaded ANN index for {namespace} with {state.entry.live_count} vectors")
+
+    def _get(
+        self, namespace: str, state: _Namespace, dimension: Optional[int] = None
+    ) -> Optional[_NamespaceIndex]:
+        """Get a namespace index, loading it from disk or creating it.
+        
+        Indexes saved by another process since they were loaded are loaded
+        again. Callers must hold the namespace lock.
+        
+        Args:
+            namespace: Namespace identifier
+            state: Locked namespace state
+            dimension: Vector dimension, required to create a new index
+            
+        Returns:
+            Namespace index, or None if it does not exist and no dimension
+            was given
+        """
+        _, ids_file = self._paths(namespace)
+        stamp = _file_stamp(ids_file)
+        if stamp is not None and stamp != state.stamp:
+            self._load(namespace, state)
+            
+        if state.entry is None and dimension is not None:
+            index = hnswlib.Index(space="cosine", dim=dimension)
+            index.init_index(
+                max_elements=INITIAL_CAPACITY,
+                ef_construction=self.ef_construction,
+                M=self.m,
+            )
+            state.entry = _NamespaceIndex(index, [])
+        return state.entry
+
+    def _save(self, namespace: str, state: _Namespace) -> None:
+        """Persist a namespace index and its memory IDs.
+        
+        Files are written alongside their targets and moved into place, so
+        readers never see a partial save. Callers must hold the namespace
+        lock.
+        """
+        index_file, ids_file = self._paths(namespace)
+        with self._file_lock(namespace):
+            stamp = _file_stamp(ids_file)
+            if stamp is not None and stamp != state.stamp:
+                # Another process saved first; build on its copy
+                self._load(namespace, state, locked=True)
+                
+            entry = state.entry
+            self.index_path.mkdir(parents=True, exist_ok=True)
+            entry.index.save_index(f"{index_file}.tmp")
+            ids_file.with_suffix(".tmp").write_bytes(
+                orjson.dumps({"dimension": entry.index.dim, "ids": entry.memory_ids})
+            )
+            os.replace(f"{index_file}.tmp", index_file)
+            os.replace(ids_file.with_suffix(".tmp"), ids_file)
+            state.stamp = _file_stamp(ids_file)
+        state.pending.clear()
+        state.failures = 0
+
+    def _save_failed(self, namespace: str, state: _Namespace, error: OSError) -> None:
+        """Count a failed save, dropping unsaved changes once they keep failing.
+        
+        Callers must hold the namespace lock.
+        """
+        state.failures += 1
+        if state.failures < MAX_SAVE_FAILURES:
+            logger.warning(f"Failed to save ANN index for {namespace}: {error}")
+            return
+            
+        logger.error(
+            f"Dropping {len(state.pending)} unsaved ANN index changes for {namespace} "
+            f"after {state.failures} failed saves: {error}"
+        )
+        # The next use loads the last saved copy, or starts empty
+        state.entry = None
+        state.stamp = None
+        state.pending.clear()
+        state.failures = 0
+
+    def _changed(self, namespace: str, state: _Namespace, change: Tuple) -> None:
+        """Record an applied change, saving right away without a flusher."""
+        state.pending.append(change)
+        if self._flusher is None:
+            try:
+                self._save(namespace, state)
+            except OSError as e:
+                self._save_failed(namespace, state, e)
+                raise
+
+    def flush(self) -> None:
+        """Save every namespace with unsaved changes."""
+        with self._lock:
+            changed = [namespace for namespace, state in self._namespaces.items() if state.pending]
+            
+        for namespace in changed:
+            with self._use(namespace) as state:
+                if not state.pending:
+                    continue
+                try:
+                    self._save(namespace, state)
+                except OSError as e:
+                    self._save_failed(namespace, state, e)
+
+    def _flush_periodically(self) -> None:
+        """Save changed namespaces until the store is closed."""
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the background flusher and save outstanding changes."""
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+
+    def add(
+        self,
+        tenant_id: str,
+        user_id: str,
+        memory_ids: Sequence[str],
+        vectors: np.ndarray,
+        replace: bool = True,
+    ) -> None:
+        """Add or update memory vectors.
+        
+        Args:
+            tenant_id: Tenant identifier
+            user_id: User identifier
+            memory_ids: Memory IDs, one per vector row
+            vectors: (n, dimension) matrix of embeddings
+            replace: If False, memories already in the index keep their vectors
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if not len(memory_ids):
+            return
+            
+        namespace = f"{tenant_id}:{user_id}"
+        with self._use(namespace) as state:
+            entry = self._get(namespace, state, vectors.shape[1])
+            written = entry.add(memory_ids, vectors, replace)
+            if written:
+                change = ("add", [memory_ids[row] for row in written], vectors[written], True)
+                self._changed(namespace, state, change)
+
+    def remove(self, tenant_id: str, user_id: str, memory_ids: Sequence[str]) -> None:
+        """Remove memories from the index.
+        
+        Args:
+            tenant_id: Tenant identifier
+            user_id: User identifier
+            memory_ids: Memory IDs to remove
+        """
+        namespace = f"{tenant_id}:{user_id}"
+        with self._use(namespace) as state:
+            entry = self._get(namespace, state)
+            if entry is not None and entry.remove(memory_ids):
+                self._changed(namespace, state, ("remove", list(memory_ids)))
+
+    def query(
+        self,
+        tenant_id: str,
+        user_id: str,
+        vectors: np.ndarray,
+        k: int,
+    ) -> Tuple[List[Optional[str]], np.ndarray, np.ndarray]:
+        """Find the approximate nearest neighbours of each vector.
+        
+        Args:
+            tenant_id: Tenant identifier
+            user_id: User identifier
+            vectors: (n, dimension) matrix of query embeddings
+            k: Neighbours to return per query
+            
+        Returns:
+            Memory IDs indexed by label, an (n, k) label matrix and the
+            matching cosine similarities; k shrinks to the number of indexed
+            memories
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        namespace = f"{tenant_id}:{user_id}"
+        with self._use(namespace) as state:
+            entry = self._get(namespace, state)
+            k = min(k, entry.live_count) if entry is not None else 0
+            if not k or not len(vectors):
+                empty = np.empty((len(vectors), 0))
+                return [], empty.astype(np.int64), empty.astype(np.float32)
+                
+            entry.index.set_ef(max(self.ef_search, k))
+            labels, distances = entry.index.knn_query(vectors, k=k)
+            return list(entry.memory_ids), labels.astype(np.int64), 1.0 - distances
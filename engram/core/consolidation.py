@@ -1,9 +1,19 @@
 """Memory consolidation engine for merging similar memories and managing forgetting."""
 
 import math
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set, Tuple
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from engram.core.ann_index import MemoryANNIndex
 from engram.vectordb.base import VectorHit
 from engram.utils.config import get_settings
 from engram.utils.logger import get_logger
@@ -11,17 +21,213 @@ from engram.utils.logger import get_logger
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Rows and columns of the similarity matrix computed per matrix product
+CLUSTER_BLOCK_SIZE = 2048
+
+# Quantized similarities this close to the consolidation threshold are
+# rescored exactly before two memories are linked
+QUANTIZATION_MARGIN = 0.02
+
+# Random-hyperplane LSH: signatures of LSH_BANDS * LSH_BAND_BITS bits, and
+# memories sharing all bits of any band become candidate pairs. At cosine
+# 0.97 a hyperplane splits a pair with probability ~0.08, so 16 bands of 16
+# bits find ~99% of such pairs while an unrelated pair collides in a band
+# with probability 2**-16
+LSH_BANDS = 16
+LSH_BAND_BITS = 16
+LSH_SEED = 0
+
+# Buckets with more members than this are not expanded into candidate
+# pairs; their members are compared with the tiled exhaustive pass instead
+LSH_MAX_BUCKET_SIZE = 32
+
+# Candidate pairs rescored exactly per gather of their vectors
+RESCORE_CHUNK_SIZE = 65536
+
+# Scratch memory a ConsolidationEngine keeps between runs
+MAX_POOLED_BYTES = 64 * 1024 * 1024
+
+# Per-user consolidation failures that leave the other users' results
+# usable: bad vectors, a shard too large for memory, or a worker process
+# that died (after which every pending shard fails the same way)
+SHARD_ERRORS = (ValueError, MemoryError, BrokenProcessPool)
+
+# Importance assumed for memories without a valid score
+DEFAULT_IMPORTANCE = 0.5
+
+# Memory embeddings, either keyed by memory ID or as IDs plus an aligned
+# (n, dimension) matrix
+MemoryVectors = Union[Dict[str, Sequence[float]], Tuple[List[str], np.ndarray]]
+
+
+class _BufferPool:
+    """Pool of reusable float32 scratch buffers.
+    
+    Buffers are bucketed by element count rounded up to a power of two and
+    handed out as contiguous ndarray views of the requested shape. Released
+    buffers are kept for the next rent until MAX_POOLED_BYTES are retained;
+    beyond that they are left to the allocator.
+    """
+
+    def __init__(self, max_bytes: int = MAX_POOLED_BYTES):
+        """Initialize an empty pool.
+        
+        Args:
+            max_bytes: Most bytes kept in the pool between rents
+        """
+        self.max_bytes = max_bytes
+        self._free: Dict[int, List[np.ndarray]] = {}
+        self._pooled_bytes = 0
+        self._lock = threading.Lock()
+
+    def rent(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """Get an uninitialized float32 array of the given shape.
+        
+        Args:
+            shape: Array shape
+            
+        Returns:
+            Contiguous array backed by a pooled buffer
+        """
+        size = math.prod(shape)
+        bucket = 1 << max(size - 1, 0).bit_length()
+        with self._lock:
+            free = self._free.get(bucket)
+            if free:
+                buffer = free.pop()
+                self._pooled_bytes -= buffer.nbytes
+            else:
+                buffer = None
+        if buffer is None:
+            buffer = np.empty(bucket, dtype=np.float32)
+        return buffer[:size].reshape(shape)
+
+    def release(self, array: np.ndarray) -> None:
+        """Return an array obtained from rent to the pool.
+        
+        Args:
+            array: Array returned by rent; it must not be used afterwards
+        """
+        buffer = array.base if array.base is not None else array
+        with self._lock:
+            if self._pooled_bytes + buffer.nbytes > self.max_bytes:
+                return
+            self._free.setdefault(len(buffer), []).append(buffer)
+            self._pooled_bytes += buffer.nbytes
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Scalar-quantize a matrix to int8 with one scale per row.
+    
+    Args:
+        matrix: Float matrix
+        
+    Returns:
+        int8 codes and float32 row scales, with ``codes * scales[:, None]``
+        approximating the matrix
+    """
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.round(matrix / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def as_vector_matrix(memory_vectors: MemoryVectors) -> Tuple[List[str], np.ndarray]:
+    """Convert memory embeddings to IDs and a unit-normalized float32 matrix.
+    
+    Rows are normalized once here, so every similarity computed afterwards
+    is a plain dot product.
+    
+    Args:
+        memory_vectors: Dict mapping memory_id to embedding vector (lists or
+            arrays), or a (memory_ids, matrix) tuple
+        
+    Returns:
+        Memory IDs and a float32 matrix with one unit-length row per ID
+    """
+    if isinstance(memory_vectors, tuple):
+        memory_ids, matrix = memory_vectors
+        memory_ids = list(memory_ids)
+    else:
+        memory_ids = list(memory_vectors)
+        matrix = [memory_vectors[memory_id] for memory_id in memory_ids]
+    
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    if matrix.ndim != 2 or len(matrix) != len(memory_ids):
+        raise ValueError(f"Expected {len(memory_ids)} vectors of equal dimension, got shape {matrix.shape}")
+    
+    # Embeddings from EmbeddingsFacade are already unit length; vectors from
+    # other sources may not be
+    return memory_ids, matrix / (np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12)
+
+
+def to_datetime64(value: Union[str, datetime, None]) -> np.datetime64:
+    """Convert an ISO 8601 string or datetime to a naive UTC datetime64.
+    
+    Args:
+        value: Timestamp, with or without a UTC offset
+        
+    Returns:
+        Microsecond datetime64, or NaT if the value is missing or invalid
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return np.datetime64("NaT", "us")
+    if not isinstance(value, datetime):
+        return np.datetime64("NaT", "us")
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, "us")
+
+
+def to_importance(value: Any) -> float:
+    """Read a stored importance score.
+    
+    Args:
+        value: Importance from memory metadata
+        
+    Returns:
+        The score, or DEFAULT_IMPORTANCE if it is missing or not a finite
+        number
+    """
+    if not isinstance(value, (int, float)) or not math.isfinite(value):
+        return DEFAULT_IMPORTANCE
+    return float(value)
+
+
+def _consolidate_shard(
+    tenant_id: str,
+    user_id: str,
+    memory_vectors: MemoryVectors,
+    consolidation_threshold: float,
+    dry_run: bool,
+) -> Dict[str, List[str]]:
+    """Consolidate one user's memories in a worker process.
+    
+    Clustering only needs the vectors, so the worker builds its own engine
+    without retrieval or ANN index clients, which do not survive pickling.
+    """
+    engine = ConsolidationEngine(retrieval_engine=None)
+    engine.consolidation_threshold = consolidation_threshold
+    return engine.consolidate_memories(tenant_id, user_id, memory_vectors, dry_run=dry_run)
+
 
 class ConsolidationEngine:
     """Engine for consolidating similar memories and managing memory lifecycle."""
 
-    def __init__(self, retrieval_engine):
+    def __init__(self, retrieval_engine, ann_index: Optional[MemoryANNIndex] = None):
         """Initialize consolidation engine.
         
         Args:
             retrieval_engine: Retrieval engine instance for similarity search
+            ann_index: Optional persistent nearest-neighbour index, used for
+                users with at least ANN_MIN_MEMORIES memories
         """
         self.retrieval_engine = retrieval_engine
+        self.ann_index = ann_index
+        self._buffers = _BufferPool()
         self.consolidation_threshold = settings.consolidation_threshold
         self.similarity_threshold = settings.similarity_threshold
         self.importance_threshold = settings.importance_threshold
@@ -32,7 +238,7 @@ class ConsolidationEngine:
         self,
         tenant_id: str,
         user_id: str,
-        memory_vectors: Dict[str, List[float]],
+        memory_vectors: MemoryVectors,
         dry_run: bool = False,
     ) -> Dict[str, List[str]]:
         """Consolidate similar memories by merging them.
@@ -40,7 +246,8 @@ class ConsolidationEngine:
         Args:
             tenant_id: Tenant identifier
             user_id: User identifier
-            memory_vectors: Dict mapping memory_id to embedding vector
+            memory_vectors: Dict mapping memory_id to embedding vector, or a
+                (memory_ids, matrix) tuple with one matrix row per memory
             dry_run: If True, only identify consolidation candidates without merging
             
         Returns:
@@ -50,101 +257,393 @@ class ConsolidationEngine:
                 "updated": [memory_ids]
             }
         """
-        if not memory_vectors:
+        memory_count = len(memory_vectors[0]) if isinstance(memory_vectors, tuple) else len(memory_vectors)
+        if not memory_count:
             return {"merged": [], "deleted": [], "updated": []}
 
         try:
-            logger.info(f"Starting consolidation for tenant={tenant_id}, user={user_id}, memories={len(memory_vectors)}")
-            
-            # Find similar memory clusters
-            clusters = self._find_memory_clusters(memory_vectors, tenant_id, user_id)
-            
-            consolidation_results = {
-                "merged": [],
-                "deleted": [],
-                "updated": [],
-            }
-            
-            for cluster in clusters:
-                if len(cluster) < 2:
-                    continue
-                
-                # Sort cluster by creation time (oldest first for merging)
-                sorted_cluster = self._sort_cluster_by_age(cluster)
-                
-                if dry_run:
-                    logger.info(f"Would merge cluster: {[m['id'] for m in sorted_cluster]}")
-                    consolidation_results["merged"].append([m["id"] for m in sorted_cluster])
-                else:
-                    # Perform actual consolidation
-                    merge_result = self._merge_memory_cluster(sorted_cluster, tenant_id, user_id)
-                    if merge_result:
-                        consolidation_results["merged"].extend(merge_result["merged"])
-                        consolidation_results["deleted"].extend(merge_result["deleted"])
-                        consolidation_results["updated"].extend(merge_result["updated"])
-            
-            logger.info(f"Consolidation completed: {len(consolidation_results['merged'])} merged, "
-                       f"{len(consolidation_results['deleted'])} deleted")
-            
-            return consolidation_results
-            
-        except Exception as e:
+            memory_ids, matrix = as_vector_matrix(memory_vectors)
+        except ValueError as e:
             logger.error(f"Memory consolidation failed: {e}")
             raise ValueError(f"Memory consolidation failed: {e}")
+        
+        logger.info(f"Starting consolidation for tenant={tenant_id}, user={user_id}, memories={len(memory_ids)}")
+        
+        # Find similar memory clusters
+        clusters = self._find_memory_clusters((memory_ids, matrix), tenant_id, user_id)
+        
+        consolidation_results = {
+            "merged": [],
+            "deleted": [],
+            "updated": [],
+        }
+        
+        for cluster in clusters:
+            if len(cluster) < 2:
+                continue
+            
+            # Sort cluster by creation time (oldest first for merging)
+            sorted_cluster = self._sort_cluster_by_age(cluster)
+            
+            if dry_run:
+                logger.info(f"Would merge cluster: {[m['id'] for m in sorted_cluster]}")
+                consolidation_results["merged"].append([m["id"] for m in sorted_cluster])
+            else:
+                # Perform actual consolidation
+                merge_result = self._merge_memory_cluster(sorted_cluster, tenant_id, user_id)
+                if merge_result:
+                    consolidation_results["merged"].extend(merge_result["merged"])
+                    consolidation_results["deleted"].extend(merge_result["deleted"])
+                    consolidation_results["updated"].extend(merge_result["updated"])
+        
+        logger.info(f"Consolidation completed: {len(consolidation_results['merged'])} merged, "
+                   f"{len(consolidation_results['deleted'])} deleted")
+        
+        return consolidation_results
+
+    def consolidate_all(
+        self,
+        memory_vectors_by_user: Dict[Tuple[str, str], MemoryVectors],
+        dry_run: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> Dict[Tuple[str, str], Dict[str, List[str]]]:
+        """Consolidate the memories of many users in parallel.
+        
+        Memories are only ever merged within one (tenant, user), so each
+        user is an independent shard. Shards run in a process pool, which
+        keeps the clustering of different users off each other's GIL.
+        
+        Args:
+            memory_vectors_by_user: Memory vectors keyed by (tenant_id, user_id)
+            dry_run: If True, only identify consolidation candidates without merging
+            max_workers: Worker processes (defaults to the CPU count)
+            
+        Returns:
+            Consolidation results keyed by (tenant_id, user_id); users whose
+            consolidation failed are logged and left out
+        """
+        shards = list(memory_vectors_by_user.items())
+        max_workers = min(max_workers or os.cpu_count() or 1, len(shards))
+        
+        results = {}
+        if max_workers <= 1:
+            for (tenant_id, user_id), memory_vectors in shards:
+                try:
+                    results[(tenant_id, user_id)] = self.consolidate_memories(
+                        tenant_id, user_id, memory_vectors, dry_run=dry_run
+                    )
+                except SHARD_ERRORS as e:
+                    logger.error(f"Consolidation failed for tenant={tenant_id}, user={user_id}: {e!r}")
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    (tenant_id, user_id): executor.submit(
+                        _consolidate_shard, tenant_id, user_id, memory_vectors,
+                        self.consolidation_threshold, dry_run,
+                    )
+                    for (tenant_id, user_id), memory_vectors in shards
+                }
+                for (tenant_id, user_id), future in futures.items():
+                    try:
+                        results[(tenant_id, user_id)] = future.result()
+                    except SHARD_ERRORS as e:
+                        logger.error(f"Consolidation failed for tenant={tenant_id}, user={user_id}: {e!r}")
+        
+        logger.info(f"Consolidated {len(results)} of {len(shards)} users")
+        return results
 
     def _find_memory_clusters(
         self,
-        memory_vectors: Dict[str, List[float]],
+        memory_vectors: MemoryVectors,
         tenant_id: str,
         user_id: str,
     ) -> List[List[Dict]]:
         """Find clusters of similar memories.
         
+        Clusters come from _cluster_labels; this only maps labels back to
+        memories. Clusters, and the members within each, keep input order.
+        
         Args:
-            memory_vectors: Dict mapping memory_id to embedding vector
+            memory_vectors: Dict mapping memory_id to embedding vector, or a
+                (memory_ids, matrix) tuple
             tenant_id: Tenant identifier
             user_id: User identifier
             
         Returns:
             List of memory clusters (lists of memory dictionaries)
         """
-        clusters = []
-        processed_ids: Set[str] = set()
+        memory_ids, vectors = as_vector_matrix(memory_vectors)
+        labels = self._cluster_labels(memory_ids, vectors, tenant_id, user_id)
         
-        for memory_id, vector in memory_vectors.items():
-            if memory_id in processed_ids:
-                continue
-            
-            # Find similar memories
-            similar_hits = self.retrieval_engine.find_similar_memories(
-                memory_vector=vector,
-                tenant_id=tenant_id,
-                user_id=user_id,
-                similarity_threshold=self.consolidation_threshold,
-                exclude_id=memory_id,
-            )
+        # Order clustered memories by the first index of their cluster, then
+        # by their own index, and cut where the cluster changes
+        _, first_index, inverse, sizes = np.unique(
+            labels, return_index=True, return_inverse=True, return_counts=True
+        )
+        members = np.flatnonzero(sizes[inverse] > 1)
+        cluster_keys = first_index[inverse[members]]
+        order = np.argsort(cluster_keys, kind="stable")
+        members, cluster_keys = members[order], cluster_keys[order]
+        groups = np.split(members, np.flatnonzero(np.diff(cluster_keys)) + 1) if len(members) else []
+        
+        clusters = [
+            [{"id": memory_ids[index], "vector": vectors[index]} for index in group.tolist()]
+            for group in groups
+        ]
+        logger.debug(f"Found {len(clusters)} memory clusters")
+        return clusters
+
+    def _cluster_labels(
+        self,
+        memory_ids: List[str],
+        vectors: np.ndarray,
+        tenant_id: str,
+        user_id: str,
+    ) -> np.ndarray:
+        """Label each memory with the cluster it belongs to.
+        
+        Memories are linked when their cosine similarity reaches the
+        consolidation threshold, and clusters are the connected components
+        of that graph, so membership does not depend on the order memories
+        are visited in. Similar pairs are found in-process (see
+        _find_similar_pairs) rather than with one vector search per memory;
+        from ANN_MIN_MEMORIES memories on, only each memory's nearest
+        neighbours in the ANN index are checked (see _find_similar_pairs_ann),
+        or without an index, memories sharing an LSH bucket (see
+        _find_similar_pairs_lsh). Both steps run in compiled code (BLAS and
+        scipy.sparse.csgraph).
+        
+        Args:
+            memory_ids: Memory IDs, one per vector row
+            vectors: Float32 matrix with one unit-length row per memory
+            tenant_id: Tenant identifier
+            user_id: User identifier
             
-            if not similar_hits:
-                continue
+        Returns:
+            int32 array of cluster labels, one per memory; memories without
+            a similar memory get a label of their own
+        """
+        count = len(memory_ids)
+        if count < settings.ann_min_memories:
+            rows, cols = self._find_similar_pairs(vectors)
+        elif self.ann_index is not None:
+            rows, cols = self._find_similar_pairs_ann(memory_ids, vectors, tenant_id, user_id)
+        else:
+            rows, cols = self._find_similar_pairs_lsh(vectors)
+        
+        adjacency = csr_matrix(
+            (np.ones(len(rows), dtype=np.bool_), (rows, cols)),
+            shape=(count, count),
+        )
+        _, labels = connected_components(adjacency, directed=False)
+        return labels
+
+    def _find_similar_pairs(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Find pairs of vectors whose cosine similarity reaches the threshold.
+        
+        Unit-length vectors are scalar-quantized to int8 with one scale
+        per row, which keeps the working copy at a quarter of the float32
+        size. Approximate similarities are computed tile by tile over the
+        upper triangle only (similarity is symmetric), and pairs within
+        QUANTIZATION_MARGIN of the threshold are rescored exactly from the
+        original vectors. The exact scores of a tile are one float32 matrix
+        product, computed only for tiles holding candidates, so memory stays
+        bounded by the tile size however many near-duplicates a tile has.
+        
+        Args:
+            vectors: Float32 matrix with one unit-length row per memory
             
-            # Create cluster with original memory
-            cluster = [{"id": memory_id, "vector": vector}]
-            processed_ids.add(memory_id)
+        Returns:
+            Row and column indices of similar pairs (row < col)
+        """
+        count = len(vectors)
+        codes, scales = quantize_int8(vectors)
+        threshold = self.consolidation_threshold
+        candidate_threshold = threshold - QUANTIZATION_MARGIN
+        
+        # Tile scratch comes from the engine's buffer pool, so repeated runs
+        # reuse the same few blocks instead of allocating per tile
+        block = min(CLUSTER_BLOCK_SIZE, count)
+        dimension = vectors.shape[1]
+        row_buffer = self._buffers.rent((block, dimension))
+        col_buffer = self._buffers.rent((block, dimension))
+        tile_buffer = self._buffers.rent((block, block))
+        exact_buffer = self._buffers.rent((block, block))
+        
+        rows, cols = [], []
+        try:
+            for row_start in range(0, count, CLUSTER_BLOCK_SIZE):
+                row_end = min(row_start + CLUSTER_BLOCK_SIZE, count)
+                # Integer dot products of int8 codes are exact in float32, which
+                # keeps the product on the BLAS path
+                row_codes = row_buffer[:row_end - row_start]
+                row_codes[...] = codes[row_start:row_end]
+                row_scales = scales[row_start:row_end, None]
+                
+                for col_start in range(row_start, count, CLUSTER_BLOCK_SIZE):
+                    col_end = min(col_start + CLUSTER_BLOCK_SIZE, count)
+                    col_codes = col_buffer[:col_end - col_start]
+                    col_codes[...] = codes[col_start:col_end]
+                    
+                    approx = tile_buffer.ravel()[:len(row_codes) * len(col_codes)].reshape(
+                        len(row_codes), len(col_codes)
+                    )
+                    np.matmul(row_codes, col_codes.T, out=approx)
+                    approx *= row_scales
+                    approx *= scales[col_start:col_end]
+                    
+                    tile_rows, tile_cols = np.nonzero(approx >= candidate_threshold)
+                    if col_start == row_start:
+                        # Diagonal tile: keep each pair once and drop self-pairs,
+                        # which add nothing to the connected components
+                        upper = tile_rows < tile_cols
+                        tile_rows, tile_cols = tile_rows[upper], tile_cols[upper]
+                    if not len(tile_rows):
+                        continue
+                    
+                    exact = exact_buffer.ravel()[:approx.size].reshape(approx.shape)
+                    np.matmul(vectors[row_start:row_end], vectors[col_start:col_end].T, out=exact)
+                    similar = exact[tile_rows, tile_cols] >= threshold
+                    rows.append(tile_rows[similar] + row_start)
+                    cols.append(tile_cols[similar] + col_start)
+        finally:
+            for buffer in (row_buffer, col_buffer, tile_buffer, exact_buffer):
+                self._buffers.release(buffer)
+        
+        if not rows:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate(rows), np.concatenate(cols)
+
+    def _find_similar_pairs_lsh(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Find similar pairs among memories that share an LSH bucket.
+        
+        Each vector is signed against LSH_BANDS * LSH_BAND_BITS fixed random
+        hyperplanes, so two vectors agree on a bit with probability
+        1 - angle / pi. Memories whose signatures match on a whole band are
+        candidates, which are then scored exactly in chunks of
+        RESCORE_CHUNK_SIZE pairs. Buckets larger than LSH_MAX_BUCKET_SIZE
+        would expand into a quadratic number of pairs per band, so their
+        members are instead compared together in one tiled pass of
+        _find_similar_pairs.
+        This replaces the n^2 pass when there is no ANN index; similar pairs
+        are found with high probability rather than with certainty.
+        
+        Args:
+            vectors: Float32 matrix with one unit-length row per memory
             
-            # Add similar memories to cluster
-            for hit in similar_hits:
-                if hit.id in memory_vectors and hit.id not in processed_ids:
-                    cluster.append({
-                        "id": hit.id,
-                        "vector": memory_vectors[hit.id],
-                    })
-                    processed_ids.add(hit.id)
+        Returns:
+            Row and column indices of similar pairs (row < col)
+        """
+        count, dimension = vectors.shape
+        planes = np.random.default_rng(LSH_SEED).standard_normal(
+            (dimension, LSH_BANDS * LSH_BAND_BITS), dtype=np.float32
+        )
+        bits = (vectors @ planes > 0).reshape(count, LSH_BANDS, LSH_BAND_BITS)
+        band_codes = np.packbits(bits, axis=2).view(np.uint16).reshape(count, LSH_BANDS)
+        
+        pair_keys = []
+        rows, cols = [], []
+        in_large_bucket = np.zeros(count, dtype=np.bool_)
+        for band in range(LSH_BANDS):
+            codes = band_codes[:, band]
+            order = np.argsort(codes, kind="stable")
+            sorted_codes = codes[order]
+            bucket_starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+            bucket_sizes = np.diff(np.r_[bucket_starts, count])
+            small = np.repeat(bucket_sizes <= LSH_MAX_BUCKET_SIZE, bucket_sizes)
+            
+            # Pair every memory of a small bucket with the ones `offset`
+            # places later in it, until no small bucket is that large
+            for offset in range(1, min(LSH_MAX_BUCKET_SIZE, count)):
+                same = (sorted_codes[offset:] == sorted_codes[:-offset]) & small[offset:]
+                if not same.any():
+                    break
+                first, second = order[:-offset][same], order[offset:][same]
+                pair_keys.append(np.minimum(first, second) * count + np.maximum(first, second))
+            
+            in_large_bucket[order[~small]] = True
+        
+        # Large buckets mostly hold the same cluster in every band, so their
+        # members are compared once, all together, rather than per bucket
+        members = np.flatnonzero(in_large_bucket)
+        if len(members):
+            member_rows, member_cols = self._find_similar_pairs(vectors[members])
+            rows.append(members[member_rows])
+            cols.append(members[member_cols])
+        
+        if pair_keys:
+            pair_keys = np.unique(np.concatenate(pair_keys).astype(np.int64))
+            for chunk_start in range(0, len(pair_keys), RESCORE_CHUNK_SIZE):
+                chunk_rows, chunk_cols = np.divmod(
+                    pair_keys[chunk_start:chunk_start + RESCORE_CHUNK_SIZE], count
+                )
+                exact = np.einsum("ij,ij->i", vectors[chunk_rows], vectors[chunk_cols])
+                similar = exact >= self.consolidation_threshold
+                rows.append(chunk_rows[similar])
+                cols.append(chunk_cols[similar])
+        
+        if not rows:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        
+        # A pair can come from both a small and a large bucket
+        pairs = np.unique(np.concatenate(rows).astype(np.int64) * count + np.concatenate(cols))
+        return np.divmod(pairs, count)
+
+    def _find_similar_pairs_ann(
+        self,
+        memory_ids: List[str],
+        vectors: np.ndarray,
+        tenant_id: str,
+        user_id: str,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Find similar pairs among each memory's approximate nearest neighbours.
+        
+        Memories missing from the user's index are added first. Each memory
+        is then linked to those of its ANN_NEIGHBORS nearest neighbours that
+        are part of this run and whose exact cosine similarity reaches the
+        threshold. Near-duplicates rank among each other's closest
+        neighbours, so this finds the same clusters as the exhaustive pass
+        in practice while scaling with n log n instead of n^2.
+        
+        Args:
+            memory_ids: Memory IDs, one per vector row
+            vectors: Float32 matrix with one unit-length row per memory
+            tenant_id: Tenant identifier
+            user_id: User identifier
             
-            if len(cluster) > 1:
-                clusters.append(cluster)
+        Returns:
+            Row and column indices of similar pairs (row < col)
+        """
+        self.ann_index.add(tenant_id, user_id, memory_ids, vectors, replace=False)
+        indexed_ids, labels, similarities = self.ann_index.query(
+            tenant_id, user_id, vectors, settings.ann_neighbors + 1
+        )
         
-        logger.debug(f"Found {len(clusters)} memory clusters")
-        return clusters
+        # Map index labels to rows of this run; other memories are ignored
+        positions = {memory_id: row for row, memory_id in enumerate(memory_ids)}
+        label_rows = np.array(
+            [positions.get(memory_id, -1) for memory_id in indexed_ids], dtype=np.int64
+        )
+        neighbor_rows = label_rows[labels] if len(label_rows) else labels
+        query_rows = np.broadcast_to(np.arange(len(vectors))[:, None], labels.shape)
+        
+        candidates = (
+            (neighbor_rows >= 0)
+            & (neighbor_rows != query_rows)
+            & (similarities >= self.consolidation_threshold - QUANTIZATION_MARGIN)
+        )
+        pairs = np.unique(
+            np.sort(np.stack([query_rows[candidates], neighbor_rows[candidates]], axis=1), axis=1),
+            axis=0,
+        )
+        rows, cols = pairs[:, 0], pairs[:, 1]
+        
+        # Rescore candidates exactly from the original vectors
+        exact = np.einsum("ij,ij->i", vectors[rows], vectors[cols])
+        similar = exact >= self.consolidation_threshold
+        return rows[similar], cols[similar]
 
     def _sort_cluster_by_age(self, cluster: List[Dict]) -> List[Dict]:
         """Sort memory cluster by creation time (oldest first).
@@ -157,7 +656,7 @@ class ConsolidationEngine:
         """
         # For now, sort by ID (ULIDs are time-ordered)
         # In a real implementation, you'd fetch creation times from database
-        return sorted(cluster, key=lambda x: x["id"])
+        return sorted(cluster, key=itemgetter("id"))
 
     def _merge_memory_cluster(
         self,
@@ -254,46 +753,35 @@ class ConsolidationEngine:
             return []
         
         current_time = current_time or datetime.now()
-        forgotten_ids = []
         
-        try:
-            for memory in memories:
-                memory_id = memory.get("id")
-                metadata = memory.get("metadata", {})
-                
-                if not memory_id:
-                    continue
-                
-                # Check importance threshold
-                importance = metadata.get("importance", 0.5)
-                if importance < self.importance_threshold:
-                    # Check last accessed time
-                    last_accessed = metadata.get("last_accessed_at")
-                    if last_accessed:
-                        try:
-                            if isinstance(last_accessed, str):
-                                last_accessed_dt = datetime.fromisoformat(
-                                    last_accessed.replace('Z', '+00:00')
-                                )
-                            else:
-                                last_accessed_dt = last_accessed
-                            
-                            days_since_access = (current_time - last_accessed_dt).days
-                            
-                            if days_since_access > self.forgetting_days:
-                                forgotten_ids.append(memory_id)
-                                logger.debug(f"Memory {memory_id} marked for forgetting: "
-                                           f"importance={importance}, days_since={days_since_access}")
-                        
-                        except Exception as e:
-                            logger.debug(f"Failed to parse last_accessed for memory {memory_id}: {e}")
-            
-            logger.info(f"Identified {len(forgotten_ids)} memories for forgetting")
-            return forgotten_ids
-            
-        except Exception as e:
-            logger.error(f"Failed to identify forgotten memories: {e}")
-            return []
+        memory_ids = []
+        metadatas = []
+        for memory in memories:
+            memory_id = memory.get("id")
+            if memory_id:
+                memory_ids.append(memory_id)
+                metadatas.append(memory.get("metadata", {}))
+        
+        # Importance is checked for all memories at once; only the
+        # low-importance ones need their access time parsed
+        importances = np.array(
+            [to_importance(metadata.get("importance")) for metadata in metadatas],
+            dtype=np.float64,
+        )
+        candidates = np.flatnonzero(importances < self.importance_threshold)
+        last_accessed = np.array(
+            [to_datetime64(metadatas[index].get("last_accessed_at")) for index in candidates.tolist()],
+            dtype="datetime64[us]",
+        )
+        
+        # (now - t).days > forgetting_days, i.e. idle for at least one more
+        # whole day; missing or unparseable times are NaT and never match
+        idle = to_datetime64(current_time) - last_accessed
+        forgotten = candidates[idle >= np.timedelta64(self.forgetting_days + 1, "D")]
+        forgotten_ids = [memory_ids[index] for index in forgotten.tolist()]
+        
+        logger.info(f"Identified {len(forgotten_ids)} memories for forgetting")
+        return forgotten_ids
 
     def calculate_memory_importance(
         self,
@@ -311,27 +799,44 @@ class ConsolidationEngine:
         Returns:
             Importance score (0.0 to 1.0)
         """
-        try:
-            metadata = memory.get("metadata", {})
-            current_importance = metadata.get("importance", 0.5)
-            
-            # Base importance from metadata
-            base_importance = current_importance
-            
-            # Boost based on access frequency (logarithmic)
-            frequency_boost = min(0.3, math.log(1 + access_frequency) * 0.1)
-            
-            # Boost based on recency (exponential decay)
-            recency_boost = math.exp(-recency_days / 30.0) * 0.2
-            
-            # Combine factors
-            new_importance = min(1.0, base_importance + frequency_boost + recency_boost)
-            
-            return max(0.0, new_importance)
+        metadata = memory.get("metadata", {})
+        base_importance = to_importance(metadata.get("importance"))
+        
+        # Boost based on access frequency (logarithmic)
+        frequency_boost = min(0.3, math.log1p(max(0, access_frequency)) * 0.1)
+        
+        # Boost based on recency (exponential decay)
+        recency_boost = math.exp(-max(0, recency_days) / 30.0) * 0.2
+        
+        # Combine factors
+        new_importance = min(1.0, base_importance + frequency_boost + recency_boost)
+        
+        return max(0.0, new_importance)
+
+    def calculate_memory_importance_batch(
+        self,
+        base_importance: np.ndarray,
+        access_frequency: np.ndarray,
+        recency_days: np.ndarray,
+    ) -> np.ndarray:
+        """Calculate importance scores for many memories at once.
+        
+        Same formula as calculate_memory_importance, evaluated with NumPy
+        ufuncs over whole arrays.
+        
+        Args:
+            base_importance: Current importance of each memory
+            access_frequency: Number of times each memory was accessed
+            recency_days: Days since each memory was last accessed
             
-        except Exception as e:
-            logger.error(f"Failed to calculate memory importance: {e}")
-            return 0.5  # Default importance
+        Returns:
+            float64 array of importance scores (0.0 to 1.0)
+        """
+        access_frequency = np.maximum(np.asarray(access_frequency, dtype=np.float64), 0.0)
+        recency_days = np.maximum(np.asarray(recency_days, dtype=np.float64), 0.0)
+        frequency_boost = np.minimum(0.3, np.log1p(access_frequency) * 0.1)
+        recency_boost = np.exp(recency_days / -30.0) * 0.2
+        return np.clip(np.asarray(base_importance, dtype=np.float64) + frequency_boost + recency_boost, 0.0, 1.0)
 
     def get_consolidation_stats(self) -> Dict[str, any]:
         """Get consolidation engine statistics.
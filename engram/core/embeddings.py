@@ -1,6 +1,13 @@
 """Embeddings facade for provider-agnostic embedding generation."""
 
-from typing import Dict, List, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 from engram.providers.base_provider import EmbeddingsProvider, ProviderFactory
 from engram.utils.config import get_settings
@@ -9,15 +16,75 @@ from engram.utils.logger import get_logger
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Provider requests in flight at once when a call spans several batches
+EMBEDDING_MAX_WORKERS = 8
+
+
+def _text_digest(text: str) -> bytes:
+    """Hash a text into a compact embedding cache key."""
+    return blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+@lru_cache(maxsize=8)
+def _make_provider(
+    provider_name: str,
+    openai_configured: bool,
+    google_configured: bool,
+) -> EmbeddingsProvider:
+    """Create an embeddings provider, falling back to the local provider.
+    
+    Cached per provider name and credential state, so every facade in the
+    process shares one provider and models or SDK clients load only once.
+    Failures are not cached.
+    
+    Args:
+        provider_name: Name of provider to create
+        openai_configured: Whether an OpenAI API key is set
+        google_configured: Whether Google credentials are set
+        
+    Returns:
+        EmbeddingsProvider instance
+        
+    Raises:
+        ValueError: If neither the provider nor the local fallback can be created
+    """
+    if provider_name == "openai" and not openai_configured:
+        logger.warning("OpenAI API key not configured, falling back to local provider")
+        provider_name = "local"
+    elif provider_name == "google" and not google_configured:
+        logger.warning("Google credentials not configured, falling back to local provider")
+        provider_name = "local"
+    
+    try:
+        provider = ProviderFactory.create_embeddings_provider(provider_name)
+    except Exception as e:
+        logger.error(f"Failed to create embeddings provider {provider_name}: {e}")
+        if provider_name == "local":
+            raise ValueError(f"Could not initialize embeddings provider: {e}")
+        
+        logger.info("Falling back to local embeddings provider")
+        try:
+            return _make_provider("local", openai_configured, google_configured)
+        except ValueError as fallback_error:
+            logger.error(f"Failed to create fallback local provider: {fallback_error}")
+            raise ValueError(f"Could not initialize embeddings provider: {e}")
+    
+    logger.info(f"Initialized embeddings provider: {provider_name}")
+    return provider
+
 
 class EmbeddingsFacade:
     """Facade for embeddings providers with caching and provider management."""
 
     def __init__(self):
         """Initialize embeddings facade."""
-        self._provider: Optional[EmbeddingsProvider] = None
         self._provider_name = settings.default_embeddings_provider
         
+        # LRU of embeddings keyed by (provider name, text digest)
+        self._cache: "OrderedDict[Tuple[str, bytes], np.ndarray]" = OrderedDict()
+        self._cache_size = settings.embedding_cache_size
+        self._cache_lock = threading.Lock()
+        
         # Register default providers
         self._register_providers()
 
@@ -50,47 +117,21 @@ class EmbeddingsFacade:
         Raises:
             ValueError: If provider is not available
         """
-        provider_name = provider_name or self._provider_name
-        
-        # Return cached provider if same name
-        if self._provider and self._provider.provider_name == provider_name:
-            return self._provider
-        
-        try:
-            # Create new provider instance
-            if provider_name == "openai" and not settings.openai_api_key:
-                logger.warning("OpenAI API key not configured, falling back to local provider")
-                provider_name = "local"
-            elif provider_name == "google" and not settings.google_application_credentials:
-                logger.warning("Google credentials not configured, falling back to local provider")
-                provider_name = "local"
-            
-            self._provider = ProviderFactory.create_embeddings_provider(provider_name)
-            self._provider_name = provider_name
-            
-            logger.info(f"Initialized embeddings provider: {provider_name}")
-            return self._provider
-            
-        except Exception as e:
-            logger.error(f"Failed to create embeddings provider {provider_name}: {e}")
-            
-            # Fallback to local provider
-            if provider_name != "local":
-                logger.info("Falling back to local embeddings provider")
-                try:
-                    self._provider = ProviderFactory.create_embeddings_provider("local")
-                    self._provider_name = "local"
-                    return self._provider
-                except Exception as fallback_error:
-                    logger.error(f"Failed to create fallback local provider: {fallback_error}")
-            
-            raise ValueError(f"Could not initialize embeddings provider: {e}")
+        provider = _make_provider(
+            provider_name or self._provider_name,
+            bool(settings.openai_api_key),
+            bool(settings.google_application_credentials),
+        )
+        if provider_name is None:
+            # Record a fallback so stats report the provider actually in use
+            self._provider_name = provider.provider_name
+        return provider
 
     def embed_texts(
         self,
         texts: List[str],
         provider_name: Optional[str] = None,
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         """Generate embeddings for a list of texts.
         
         Args:
@@ -98,40 +139,147 @@ class EmbeddingsFacade:
             provider_name: Name of provider to use
             
         Returns:
-            List of embedding vectors
+            Contiguous float32 array of shape (len(texts), dimension) with
+            unit-length rows, so cosine similarity is a plain dot product
             
         Raises:
             ValueError: If embedding generation fails
         """
         if not texts:
-            return []
+            return np.empty((0, 0), dtype=np.float32)
 
         try:
             provider = self._get_provider(provider_name)
             
-            logger.debug(f"Generating embeddings for {len(texts)} texts using {provider.provider_name}")
-            
-            # Generate embeddings
-            embeddings = provider.embed_texts(texts)
+            # Serve repeated texts from the cache; only misses reach the provider
+            keys = [(provider.provider_name, _text_digest(text)) for text in texts]
+            vectors = self._cache_get(keys)
+            miss_indices = [i for i, vector in enumerate(vectors) if vector is None]
             
-            # Validate embeddings
-            if len(embeddings) != len(texts):
-                raise ValueError(f"Expected {len(texts)} embeddings, got {len(embeddings)}")
-            
-            # Validate embedding dimensions
-            if embeddings:
+            if miss_indices:
+                # Embed each distinct text once, however often it repeats
+                first_miss: Dict[Tuple[str, bytes], int] = {}
+                for i in miss_indices:
+                    first_miss.setdefault(keys[i], i)
+                miss_keys = list(first_miss)
+                miss_texts = [texts[i] for i in first_miss.values()]
+                logger.debug(
+                    f"Generating embeddings for {len(miss_texts)} texts using {provider.provider_name} "
+                    f"({len(miss_indices) - len(miss_texts)} duplicates skipped)"
+                )
+                
+                # Generate embeddings
+                embeddings = self._embed_in_batches(provider, miss_texts)
+                
+                # Validate embeddings
+                if len(embeddings) != len(miss_texts):
+                    raise ValueError(f"Expected {len(miss_texts)} embeddings, got {len(embeddings)}")
+                
+                # Validate embedding dimensions
                 expected_dim = len(embeddings[0])
                 for i, embedding in enumerate(embeddings):
                     if len(embedding) != expected_dim:
                         raise ValueError(f"Embedding {i} has dimension {len(embedding)}, expected {expected_dim}")
+                
+                miss_vectors = np.asarray(embeddings, dtype=np.float32)
+                if not provider.normalizes_embeddings:
+                    miss_vectors /= np.linalg.norm(miss_vectors, axis=1, keepdims=True) + 1e-12
+                vectors_by_key = dict(zip(miss_keys, miss_vectors))
+                for i in miss_indices:
+                    vectors[i] = vectors_by_key[keys[i]]
+                self._cache_put(miss_keys, list(miss_vectors))
             
-            logger.debug(f"Generated {len(embeddings)} embeddings with dimension {len(embeddings[0]) if embeddings else 0}")
-            return embeddings
+            logger.debug(f"Generated {len(vectors)} embeddings ({len(vectors) - len(miss_indices)} cached)")
+            return np.stack(vectors)
             
         except Exception as e:
             logger.error(f"Failed to generate embeddings: {e}")
             raise ValueError(f"Embedding generation failed: {e}")
 
+    def embed_query(self, text: str, provider_name: Optional[str] = None) -> np.ndarray:
+        """Generate the embedding for a single query text.
+        
+        Repeated queries are answered with a single cache lookup, without
+        going through the batch path.
+        
+        Args:
+            text: Query text
+            provider_name: Name of provider to use
+            
+        Returns:
+            Unit-length float32 vector
+            
+        Raises:
+            ValueError: If embedding generation fails
+        """
+        provider = self._get_provider(provider_name)
+        vector = self._cache_get([(provider.provider_name, _text_digest(text))])[0]
+        if vector is not None:
+            return vector.copy()
+        return self.embed_texts([text], provider_name)[0]
+
+    def _embed_in_batches(self, provider: EmbeddingsProvider, texts: List[str]) -> List[List[float]]:
+        """Embed texts in batches of the provider's max_batch_size.
+        
+        Batches are sent concurrently from a small thread pool, so a large
+        call costs roughly one request's latency per EMBEDDING_MAX_WORKERS
+        batches instead of one per batch.
+        
+        Args:
+            provider: Embeddings provider
+            texts: Texts to embed
+            
+        Returns:
+            Embeddings in input order
+        """
+        batch_size = provider.max_batch_size
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        if len(batches) == 1:
+            return provider.embed_texts(batches[0])
+        
+        # map() yields results in submission order
+        with ThreadPoolExecutor(max_workers=min(EMBEDDING_MAX_WORKERS, len(batches))) as executor:
+            return [
+                embedding
+                for batch_embeddings in executor.map(provider.embed_texts, batches)
+                for embedding in batch_embeddings
+            ]
+
+    def _cache_get(self, keys: List[Tuple[str, bytes]]) -> List[Optional[np.ndarray]]:
+        """Look up cached embeddings, refreshing their LRU position.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Cached vectors, with None for misses
+        """
+        vectors: List[Optional[np.ndarray]] = []
+        with self._cache_lock:
+            for key in keys:
+                vector = self._cache.get(key)
+                if vector is not None:
+                    self._cache.move_to_end(key)
+                vectors.append(vector)
+        return vectors
+
+    def _cache_put(self, keys: List[Tuple[str, bytes]], vectors: List[np.ndarray]) -> None:
+        """Store embeddings, evicting the least recently used beyond the limit.
+        
+        Args:
+            keys: Cache keys
+            vectors: Vectors aligned with keys
+        """
+        if self._cache_size <= 0:
+            return
+        
+        with self._cache_lock:
+            for key, vector in zip(keys, vectors):
+                self._cache[key] = vector
+                self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
     def get_embedding_dimension(self, provider_name: Optional[str] = None) -> int:
         """Get the dimension of embeddings produced by the provider.
         
@@ -1,19 +1,36 @@
 """Smart forgetting engine for memory management."""
 
+import copy
+import threading
+import time
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
-from sqlalchemy import and_, desc
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
 from engram.utils.config import get_settings
 from engram.utils.logger import get_logger
+from engram.core.memory_store import user_stats_delta_update
 from engram.database.models import Memory
-from engram.database.postgres import get_db_session
+from engram.database.postgres import get_session
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Rows deactivated per transaction by the forgetting sweeps
+FORGET_BATCH_SIZE = 10000
+# Memory IDs returned in sweep results for reference
+SAMPLE_ID_COUNT = 10
+# Seconds a memory health analysis is served from cache, and how many are kept
+HEALTH_CACHE_TTL = 60.0
+HEALTH_CACHE_SIZE = 1024
+
+# Health analyses by (tenant, user, thresholds), shared by all engines
+_health_cache: "OrderedDict[Tuple[Any, ...], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_health_cache_lock = threading.Lock()
+
 
 class ForgettingEngine:
     """Engine for smart forgetting of low-importance memories."""
@@ -36,27 +53,25 @@ class ForgettingEngine:
             Dict with forgetting results
         """
         try:
-            with get_db_session() as session:
+            with get_session() as session:
                 # Calculate cutoff date
                 cutoff_date = datetime.utcnow() - timedelta(days=self.forgetting_days)
                 
-                # Build query for memories to forget
-                query = session.query(Memory).filter(
-                    and_(
-                        Memory.tenant_id == tenant_id,
-                        Memory.active == True,
-                        Memory.importance < self.importance_threshold,
-                        Memory.last_accessed_at < cutoff_date,
-                    )
-                )
-                
+                filters = [
+                    Memory.tenant_id == tenant_id,
+                    Memory.active == True,
+                    Memory.importance < self.importance_threshold,
+                    Memory.last_accessed_at < cutoff_date,
+                ]
                 if user_id:
-                    query = query.filter(Memory.user_id == user_id)
+                    filters.append(Memory.user_id == user_id)
                 
-                # Get memories to forget
-                memories_to_forget = query.all()
+                # Deactivate memories (soft delete)
+                forgotten, memory_ids = self._deactivate_in_batches(session, tenant_id, filters)
+                if forgotten:
+                    self._invalidate_health_cache(tenant_id)
                 
-                if not memories_to_forget:
+                if not forgotten:
                     logger.info(
                         "No memories to forget",
                         extra={
@@ -73,34 +88,23 @@ class ForgettingEngine:
                         "days": self.forgetting_days,
                     }
                 
-                # Deactivate memories (soft delete)
-                memory_ids = [memory.id for memory in memories_to_forget]
-                session.query(Memory).filter(
-                    Memory.id.in_(memory_ids)
-                ).update(
-                    {"active": False, "updated_at": datetime.utcnow()},
-                    synchronize_session=False
-                )
-                
-                session.commit()
-                
                 logger.info(
                     "Forgot low-importance memories",
                     extra={
                         "tenant_id": tenant_id,
                         "user_id": user_id,
-                        "memories_forgotten": len(memories_to_forget),
+                        "memories_forgotten": forgotten,
                         "threshold": self.importance_threshold,
                         "days": self.forgetting_days,
                     }
                 )
                 
                 return {
-                    "memories_forgotten": len(memories_to_forget),
-                    "memories_processed": len(memories_to_forget),
+                    "memories_forgotten": forgotten,
+                    "memories_processed": forgotten,
                     "threshold": self.importance_threshold,
                     "days": self.forgetting_days,
-                    "memory_ids": memory_ids[:10],  # Return first 10 IDs for reference
+                    "memory_ids": memory_ids,  # First IDs for reference
                 }
                 
         except Exception as e:
@@ -123,20 +127,21 @@ class ForgettingEngine:
             if retention_days is None:
                 retention_days = settings.memory_retention_days
                 
-            with get_db_session() as session:
+            with get_session() as session:
                 # Calculate cutoff date
                 cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
                 
-                # Get old memories
-                old_memories = session.query(Memory).filter(
-                    and_(
-                        Memory.tenant_id == tenant_id,
-                        Memory.active == True,
-                        Memory.created_at < cutoff_date,
-                    )
-                ).all()
+                # Deactivate old memories
+                filters = [
+                    Memory.tenant_id == tenant_id,
+                    Memory.active == True,
+                    Memory.created_at < cutoff_date,
+                ]
+                forgotten, memory_ids = self._deactivate_in_batches(session, tenant_id, filters)
+                if forgotten:
+                    self._invalidate_health_cache(tenant_id)
                 
-                if not old_memories:
+                if not forgotten:
                     logger.info(
                         "No old memories to forget",
                         extra={
@@ -149,101 +154,183 @@ class ForgettingEngine:
                         "retention_days": retention_days,
                     }
                 
-                # Deactivate memories
-                memory_ids = [memory.id for memory in old_memories]
-                session.query(Memory).filter(
-                    Memory.id.in_(memory_ids)
-                ).update(
-                    {"active": False, "updated_at": datetime.utcnow()},
-                    synchronize_session=False
-                )
-                
-                session.commit()
-                
                 logger.info(
                     "Forgot old memories",
                     extra={
                         "tenant_id": tenant_id,
-                        "memories_forgotten": len(old_memories),
+                        "memories_forgotten": forgotten,
                         "retention_days": retention_days,
                     }
                 )
                 
                 return {
-                    "memories_forgotten": len(old_memories),
+                    "memories_forgotten": forgotten,
                     "retention_days": retention_days,
-                    "memory_ids": memory_ids[:10],
+                    "memory_ids": memory_ids,
                 }
                 
         except Exception as e:
             logger.error(f"Failed to forget old memories: {e}")
             raise
 
+    @staticmethod
+    def _invalidate_health_cache(tenant_id: str) -> None:
+        """Drop cached health analyses for a tenant."""
+        with _health_cache_lock:
+            for key in [key for key in _health_cache if key[0] == tenant_id]:
+                del _health_cache[key]
+
+    def _deactivate_in_batches(
+        self, session: Session, tenant_id: str, filters: List[Any]
+    ) -> Tuple[int, List[str]]:
+        """Deactivate matching memories in bounded transactions.
+        
+        Each batch picks up to FORGET_BATCH_SIZE matching rows, skipping rows
+        locked by a concurrent sweep, and deactivates them with one
+        UPDATE ... RETURNING. The returned users and importances are applied
+        to user_memory_stats in the same transaction, so the stats stay in
+        step with the memories. Deactivated rows no longer match, so batches
+        continue until one comes back short.
+        
+        Args:
+            session: Database session
+            tenant_id: Tenant the filters are restricted to
+            filters: Predicate selecting active memories to forget
+            
+        Returns:
+            Tuple of (memories deactivated, first SAMPLE_ID_COUNT memory IDs)
+        """
+        # Core statements on the table: nothing touches the identity map
+        memories = Memory.__table__
+        batch_ids = (
+            select(memories.c.id)
+            .where(*filters)
+            .order_by(memories.c.id)
+            .limit(FORGET_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        statement = (
+            update(memories)
+            .where(memories.c.id.in_(batch_ids.scalar_subquery()))
+            .values(active=False, updated_at=func.now())
+            .returning(memories.c.id, memories.c.user_id, memories.c.importance)
+        )
+        stats_update = user_stats_delta_update()
+        
+        forgotten = 0
+        sample_ids: List[str] = []
+        while True:
+            rows = session.execute(statement).all()
+            
+            # Users without a stats row are skipped; theirs is recomputed
+            # from the memories table on their next write
+            removed: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+            for _, user_id, importance in rows:
+                removed[user_id][0] += 1
+                removed[user_id][1] += importance
+            if removed:
+                session.execute(stats_update, [
+                    {
+                        "stats_tenant_id": tenant_id,
+                        "stats_user_id": user_id,
+                        "added": 0,
+                        "added_importance": 0.0,
+                        "removed": count,
+                        "removed_importance": importance,
+                    }
+                    for user_id, (count, importance) in removed.items()
+                ])
+            session.commit()
+            
+            forgotten += len(rows)
+            sample_ids.extend(row.id for row in rows[:SAMPLE_ID_COUNT - len(sample_ids)])
+            if len(rows) < FORGET_BATCH_SIZE:
+                return forgotten, sample_ids
+
     def analyze_memory_health(
-        self, tenant_id: str, user_id: Optional[str] = None
+        self, tenant_id: str, user_id: Optional[str] = None, force_refresh: bool = False
     ) -> Dict[str, Any]:
         """Analyze memory health and suggest forgetting actions.
         
+        Results are cached for HEALTH_CACHE_TTL seconds, and dropped early
+        when a forgetting sweep changes the tenant's memories.
+        
+        Args:
+            tenant_id: Tenant ID
+            user_id: Optional user ID
+            force_refresh: Recompute even if a cached analysis exists
+            
+        Returns:
+            Dict with memory health analysis
+        """
+        retention_days = settings.memory_retention_days
+        cache_key = (
+            tenant_id, user_id, self.importance_threshold, self.forgetting_days, retention_days
+        )
+        if not force_refresh:
+            with _health_cache_lock:
+                entry = _health_cache.get(cache_key)
+                if entry is not None and entry[0] > time.monotonic():
+                    _health_cache.move_to_end(cache_key)
+                    return copy.deepcopy(entry[1])
+        
+        health = self._compute_memory_health(tenant_id, user_id, retention_days)
+        with _health_cache_lock:
+            _health_cache[cache_key] = (time.monotonic() + HEALTH_CACHE_TTL, health)
+            _health_cache.move_to_end(cache_key)
+            while len(_health_cache) > HEALTH_CACHE_SIZE:
+                _health_cache.popitem(last=False)
+        return copy.deepcopy(health)
+
+    def _compute_memory_health(
+        self, tenant_id: str, user_id: Optional[str], retention_days: int
+    ) -> Dict[str, Any]:
+        """Compute memory health from the memories table.
+        
         Args:
             tenant_id: Tenant ID
             user_id: Optional user ID
+            retention_days: Memory retention period
             
         Returns:
             Dict with memory health analysis
         """
         try:
-            with get_db_session() as session:
-                # Build base query
-                query = session.query(Memory).filter(
-                    and_(
-                        Memory.tenant_id == tenant_id,
-                        Memory.active == True,
-                    )
-                )
+            with get_session() as session:
+                now = datetime.utcnow()
+                cutoff_date = now - timedelta(days=self.forgetting_days)
+                old_cutoff_date = now - timedelta(days=retention_days)
                 
+                filters = [Memory.tenant_id == tenant_id, Memory.active == True]
                 if user_id:
-                    query = query.filter(Memory.user_id == user_id)
-                
-                # Get memory statistics
-                total_memories = query.count()
+                    filters.append(Memory.user_id == user_id)
                 
-                # Low importance memories
-                low_importance = query.filter(
-                    Memory.importance < self.importance_threshold
-                ).count()
+                # All counts and the average in one pass over the memories
+                stats = session.query(
+                    func.count(Memory.id).label("total"),
+                    func.count(Memory.id).filter(
+                        Memory.importance < self.importance_threshold
+                    ).label("low_importance"),
+                    func.count(Memory.id).filter(
+                        Memory.last_accessed_at < cutoff_date
+                    ).label("old"),
+                    func.count(Memory.id).filter(
+                        Memory.created_at < old_cutoff_date
+                    ).label("very_old"),
+                    func.avg(Memory.importance).label("avg_importance"),
+                ).filter(*filters).one()
                 
-                # Old memories
-                cutoff_date = datetime.utcnow() - timedelta(days=self.forgetting_days)
-                old_memories = query.filter(
-                    Memory.last_accessed_at < cutoff_date
-                ).count()
-                
-                # Very old memories
-                old_cutoff_date = datetime.utcnow() - timedelta(days=settings.memory_retention_days)
-                very_old_memories = query.filter(
-                    Memory.created_at < old_cutoff_date
-                ).count()
-                
-                # Average importance
-                avg_importance = session.query(
-                    func.avg(Memory.importance)
-                ).filter(
-                    and_(
-                        Memory.tenant_id == tenant_id,
-                        Memory.active == True,
-                    )
-                ).scalar() or 0.0
+                total_memories = stats.total
+                low_importance = stats.low_importance
+                old_memories = stats.old
+                very_old_memories = stats.very_old
+                avg_importance = stats.avg_importance or 0.0
                 
                 # Modality breakdown
                 modality_counts = session.query(
                     Memory.modality,
                     func.count(Memory.id).label("count")
-                ).filter(
-                    and_(
-                        Memory.tenant_id == tenant_id,
-                        Memory.active == True,
-                    )
-                ).group_by(Memory.modality).all()
+                ).filter(*filters).group_by(Memory.modality).all()
                 
                 return {
                     "total_memories": total_memories,
@@ -266,7 +353,7 @@ class ForgettingEngine:
                     "thresholds": {
                         "importance_threshold": self.importance_threshold,
                         "forgetting_days": self.forgetting_days,
-                        "retention_days": settings.memory_retention_days,
+                        "retention_days": retention_days,
                     },
                 }
                 
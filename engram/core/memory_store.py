@@ -1,15 +1,19 @@
 """Memory store for CRUD operations and orchestration."""
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc, func
+from sqlalchemy import Float, Integer, Row, and_, bindparam, case, desc, func, insert, update
 
+from engram.core.ann_index import MemoryANNIndex
 from engram.core.embeddings import EmbeddingsFacade
-from engram.core.retrieval import RetrievalEngine
+from engram.core.retrieval import RetrievalCache, RetrievalEngine
 from engram.core.consolidation import ConsolidationEngine
-from engram.database.models import Memory, Tenant, UserMemoryStats
+from engram.database.models import Memory, ModalityType, Tenant, UserMemoryStats
+from engram.database.postgres import copy_rows, get_session, match_any
 from engram.utils.config import get_settings
 from engram.utils.ids import generate_memory_id, generate_tenant_id
 from engram.utils.logger import get_logger
@@ -18,6 +22,60 @@ from engram.vectordb.base import VectorIndex
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Vector index writes run here, overlapping the database write
+VECTOR_WRITE_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="vector-write")
+
+# Batches at least this large are written with COPY on PostgreSQL
+COPY_MIN_ROWS = 1000
+
+# Columns read when memories are returned to callers; leaves out large
+# fields such as caption_or_transcript and skips ORM object hydration
+MEMORY_RESULT_COLUMNS = (
+    Memory.id,
+    Memory.text,
+    Memory.memory_metadata,
+    Memory.importance,
+    Memory.created_at,
+    Memory.last_accessed_at,
+)
+
+
+
+def user_stats_delta_update():
+    """Build an UPDATE applying memory deltas to one user's stats row.
+    
+    Counts and the average importance are adjusted in place, so the cost
+    does not depend on how many memories the user has. The statement takes
+    the bound parameters stats_tenant_id, stats_user_id, added,
+    added_importance, removed and removed_importance, and can be executed
+    with a list of them to update many users at once.
+    
+    Returns:
+        Core UPDATE statement on the user_memory_stats table
+    """
+    stats = UserMemoryStats.__table__.c
+    added = bindparam("added", type_=Integer)
+    removed = bindparam("removed", type_=Integer)
+    importance_delta = (
+        bindparam("added_importance", type_=Float) - bindparam("removed_importance", type_=Float)
+    )
+    active = stats.active_memories + added - removed
+    return (
+        update(UserMemoryStats.__table__)
+        .where(
+            stats.tenant_id == bindparam("stats_tenant_id"),
+            stats.user_id == bindparam("stats_user_id"),
+        )
+        .values(
+            total_memories=stats.total_memories + added,
+            active_memories=active,
+            avg_importance=case(
+                (active > 0, (stats.avg_importance * stats.active_memories + importance_delta) / active),
+                else_=0.0,
+            ),
+        )
+    )
+
 
 class MemoryStore:
     """Main memory store for CRUD operations and orchestration."""
@@ -27,6 +85,8 @@ class MemoryStore:
         db_session: Optional[Session] = None,
         vector_index: Optional[VectorIndex] = None,
         embeddings_facade: Optional[EmbeddingsFacade] = None,
+        ann_index: Optional[MemoryANNIndex] = None,
+        retrieval_cache: Optional[RetrievalCache] = None,
     ):
         """Initialize memory store.
         
@@ -34,14 +94,19 @@ class MemoryStore:
             db_session: Database session (optional, creates default if None)
             vector_index: Vector database interface (optional)
             embeddings_facade: Embeddings facade (optional, creates default if None)
+            ann_index: Persistent nearest-neighbour index kept in step with
+                writes for consolidation (optional)
+            retrieval_cache: Process-wide cache of retrieval results (optional)
         """
         self.db = db_session
         self.vector_index = vector_index
         self.embeddings_facade = embeddings_facade or EmbeddingsFacade()
+        self.ann_index = ann_index
+        self.retrieval_cache = retrieval_cache
         
         # Initialize engines
         self.retrieval_engine = RetrievalEngine(vector_index)
-        self.consolidation_engine = ConsolidationEngine(self.retrieval_engine)
+        self.consolidation_engine = ConsolidationEngine(self.retrieval_engine, ann_index)
 
     def create_tenant(self, name: str) -> Tenant:
         """Create a new tenant.
@@ -95,7 +160,7 @@ class MemoryStore:
         tenant_id: str,
         user_id: str,
         texts: List[str],
-        embeddings: Optional[List[List[float]]] = None,
+        embeddings: Optional[Union[np.ndarray, List[List[float]]]] = None,
         metadata_list: Optional[List[Dict[str, Any]]] = None,
         importance: float = 0.5,
         modality: str = "text",
@@ -110,7 +175,7 @@ class MemoryStore:
             tenant_id: Tenant identifier
             user_id: User identifier
             texts: List of memory texts
-            embeddings: Optional list of embeddings
+            embeddings: Optional embeddings, as a (n, dimension) array or list of vectors
             metadata_list: List of metadata dictionaries
             importance: Importance score (default 0.5)
             modality: Content modality (default "text")
@@ -151,11 +216,12 @@ class MemoryStore:
                 captions.append(None)
             
             # Truncate texts if needed
+            max_text_length = settings.max_text_length
             truncated_texts = []
             original_texts = []
             for text in texts:
-                if len(text) > settings.max_text_length:
-                    truncated_texts.append(text[:settings.max_text_length])
+                if len(text) > max_text_length:
+                    truncated_texts.append(text[:max_text_length])
                     original_texts.append(text)
                 else:
                     truncated_texts.append(text)
@@ -166,11 +232,16 @@ class MemoryStore:
                 logger.debug(f"Generating embeddings for {len(truncated_texts)} texts")
                 embeddings = self.embeddings_facade.embed_texts(truncated_texts)
             
+            # Callers may still pass lists of floats; normalise to one array
+            embeddings = np.asarray(embeddings, dtype=np.float32)
             if len(embeddings) != len(texts):
                 raise ValueError(f"Expected {len(texts)} embeddings, got {len(embeddings)}")
             
-            # Create memory records
-            memories = []
+            # Build memory rows; per-batch values are computed once
+            modality_type = ModalityType(modality)
+            now_iso = datetime.now().isoformat()
+            rows = []
+            memory_ids = []
             vector_items = []
             
             for i, (text, embedding, metadata, chunk_idx, mime, caption) in enumerate(
@@ -182,47 +253,61 @@ class MemoryStore:
                 memory_metadata = {
                     **metadata,
                     "importance": importance,
-                    "created_at": datetime.now().isoformat(),
-                    "last_accessed_at": datetime.now().isoformat(),
+                    "created_at": now_iso,
+                    "last_accessed_at": now_iso,
                 }
                 
                 # Store original text if truncated
                 if original_texts[i]:
                     memory_metadata["original"] = original_texts[i]
                 
-                # Import ModalityType
-                from engram.database.models import ModalityType
-                
-                # Create memory record
-                memory = Memory(
-                    id=memory_id,
-                    tenant_id=tenant_id,
-                    user_id=user_id,
-                    text=text,
-                    memory_metadata=memory_metadata,
-                    importance=importance,
-                    modality=ModalityType(modality),
-                    source_uri=source_uri,
-                    chunk_idx=chunk_idx,
-                    mime=mime,
-                    caption_or_transcript=caption,
-                )
-                
-                memories.append(memory)
+                rows.append({
+                    "id": memory_id,
+                    "tenant_id": tenant_id,
+                    "user_id": user_id,
+                    "text": text,
+                    "memory_metadata": memory_metadata,
+                    "importance": importance,
+                    "modality": modality_type,
+                    "source_uri": source_uri,
+                    "chunk_idx": chunk_idx,
+                    "mime": mime,
+                    "caption_or_transcript": caption,
+                })
+                memory_ids.append(memory_id)
                 
                 # Prepare vector item
-                vector_items.append((memory_id, embedding, memory_metadata))
+                # Vector database clients serialize plain lists
+                vector_items.append((memory_id, embedding.tolist(), memory_metadata))
             
-            # Save to database
-            self.db.add_all(memories)
-            self.db.commit()
-            
-            # Save to vector database
+            # Save to the vector database in the background while the
+            # database write runs; commit only once both have succeeded
             namespace = f"{tenant_id}:{user_id}"
-            self.vector_index.upsert(vector_items, namespace)
+            vector_write = VECTOR_WRITE_EXECUTOR.submit(self.vector_index.upsert, vector_items, namespace)
+            try:
+                # One bulk write; IDs are freshly generated, so there is
+                # nothing to conflict with and no rows to load back
+                if len(rows) >= COPY_MIN_ROWS and self.db.get_bind().dialect.name == "postgresql":
+                    copy_rows(self.db, Memory.__table__, rows)
+                else:
+                    self.db.execute(insert(Memory), rows)
+                vector_write.result()
+                self.db.commit()
+            except Exception:
+                self._discard_vectors(vector_write, memory_ids, namespace)
+                raise
+            
+            if self.retrieval_cache is not None:
+                self.retrieval_cache.invalidate(tenant_id, user_id)
+            memories = [Memory(**row) for row in rows]
+            
+            if self.ann_index is not None:
+                self._update_ann_index(self.ann_index.add, tenant_id, user_id, memory_ids, embeddings)
             
             # Update user stats
-            self._update_user_stats(tenant_id, user_id)
+            self._update_user_stats(
+                tenant_id, user_id, added=len(rows), added_importance=importance * len(rows)
+            )
             
             logger.info(f"Upserted {len(memories)} memories for tenant={tenant_id}, user={user_id}")
             return memories
@@ -253,13 +338,15 @@ class MemoryStore:
         Raises:
             ValueError: If retrieval fails
         """
+        generation = None
+        if self.retrieval_cache is not None:
+            generation, cached = self.retrieval_cache.lookup(tenant_id, user_id, query, top_k)
+            if cached is not None:
+                return cached
+        
         try:
             # Generate query embedding
-            query_embeddings = self.embeddings_facade.embed_texts([query])
-            if not query_embeddings:
-                return []
-            
-            query_vector = query_embeddings[0]
+            query_vector = self.embeddings_facade.embed_query(query).tolist()
             
             # Retrieve memories
             hits = self.retrieval_engine.retrieve_memories(
@@ -273,41 +360,49 @@ class MemoryStore:
             if not hits:
                 return []
             
-            memory_ids = [hit.id for hit in hits]
-            memories = self.db.query(Memory).filter(
+            # Rows come back in hit order, each carrying its hit's rank
+            hit_rank = case({hit.id: rank for rank, hit in enumerate(hits)}, value=Memory.id)
+            memories = self.db.query(*MEMORY_RESULT_COLUMNS, hit_rank.label("hit_rank")).filter(
                 and_(
-                    Memory.id.in_(memory_ids),
+                    match_any(Memory.id, [hit.id for hit in hits], self.db),
                     Memory.tenant_id == tenant_id,
                     Memory.user_id == user_id,
                     Memory.active == True,
                 )
-            ).all()
-            
-            # Create memory ID to record mapping
-            memory_map = {memory.id: memory for memory in memories}
+            ).order_by(hit_rank).all()
             
             # Combine hits with memory records
-            results = []
-            for hit in hits:
-                if hit.id in memory_map:
-                    memory = memory_map[hit.id]
-                    
-                    # Update last accessed time
-                    memory.last_accessed_at = datetime.now()
-                    
-                    result = {
-                        "memory_id": memory.id,
-                        "text": memory.text,
-                        "score": hit.score,
-                        "metadata": memory.memory_metadata,
-                        "importance": memory.importance,
-                        "created_at": memory.created_at.isoformat(),
-                        "last_accessed_at": memory.last_accessed_at.isoformat(),
-                    }
-                    results.append(result)
-            
-            # Commit last accessed time updates
-            self.db.commit()
+            now = datetime.now()
+            last_accessed_at = now.isoformat()
+            results = [
+                {
+                    "memory_id": memory.id,
+                    "text": memory.text,
+                    "score": hits[memory.hit_rank].score,
+                    "metadata": memory.memory_metadata,
+                    "importance": memory.importance,
+                    "created_at": memory.created_at.isoformat(),
+                    "last_accessed_at": last_accessed_at,
+                }
+                for memory in memories
+            ]
+            
+            # Update last accessed time for all returned memories at once
+            if memories:
+                memories_table = Memory.__table__
+                self.db.execute(
+                    update(memories_table)
+                    .where(match_any(memories_table.c.id, [memory.id for memory in memories], self.db))
+                    .values(last_accessed_at=now)
+                )
+                self.db.commit()
+            
+            # Stored under the generation seen before retrieving, so a write
+            # committed meanwhile leaves these results unused
+            if self.retrieval_cache is not None and generation is not None:
+                self.retrieval_cache.put(
+                    tenant_id, user_id, query, top_k, results, generation=generation
+                )
             
             logger.debug(f"Retrieved {len(results)} memories for query: {query[:50]}...")
             return results
@@ -328,29 +423,38 @@ class MemoryStore:
             True if memory was deleted, False if not found
         """
         try:
-            # Find memory
-            memory = self.db.query(Memory).filter(
-                and_(
-                    Memory.id == memory_id,
-                    Memory.tenant_id == tenant_id,
-                    Memory.user_id == user_id,
-                    Memory.active == True,
+            # Soft delete in one conditional statement; repeated deletes
+            # match no row and touch neither store again
+            memories_table = Memory.__table__
+            importance = self.db.execute(
+                update(memories_table)
+                .where(
+                    memories_table.c.id == memory_id,
+                    memories_table.c.tenant_id == tenant_id,
+                    memories_table.c.user_id == user_id,
+                    memories_table.c.active == True,
                 )
-            ).first()
+                .values(active=False)
+                .returning(memories_table.c.importance)
+            ).scalar_one_or_none()
             
-            if not memory:
+            if importance is None:
                 return False
             
-            # Soft delete
-            memory.active = False
             self.db.commit()
+            if self.retrieval_cache is not None:
+                self.retrieval_cache.invalidate(tenant_id, user_id)
             
             # Remove from vector database
             namespace = f"{tenant_id}:{user_id}"
             self.vector_index.delete([memory_id], namespace)
+            if self.ann_index is not None:
+                self._update_ann_index(self.ann_index.remove, tenant_id, user_id, [memory_id])
             
             # Update user stats
-            self._update_user_stats(tenant_id, user_id)
+            self._update_user_stats(
+                tenant_id, user_id, removed=1, removed_importance=importance
+            )
             
             logger.info(f"Deleted memory {memory_id} for tenant={tenant_id}, user={user_id}")
             return True
@@ -367,7 +471,7 @@ class MemoryStore:
         active_only: bool = True,
         limit: int = 100,
         offset: int = 0,
-    ) -> List[Memory]:
+    ) -> List[Row]:
         """List memories with pagination.
         
         Args:
@@ -378,9 +482,9 @@ class MemoryStore:
             offset: Number of results to skip
             
         Returns:
-            List of memory records
+            List of memory rows with the MEMORY_RESULT_COLUMNS attributes
         """
-        query = self.db.query(Memory).filter(Memory.tenant_id == tenant_id)
+        query = self.db.query(*MEMORY_RESULT_COLUMNS).filter(Memory.tenant_id == tenant_id)
         
         if user_id:
             query = query.filter(Memory.user_id == user_id)
@@ -390,70 +494,150 @@ class MemoryStore:
         
         return query.order_by(desc(Memory.created_at)).offset(offset).limit(limit).all()
 
-    def _update_user_stats(self, tenant_id: str, user_id: str) -> None:
+    def count_memories(
+        self,
+        tenant_id: str,
+        user_id: Optional[str] = None,
+        active_only: bool = True,
+    ) -> int:
+        """Count memories matching the list_memories filters.
+        
+        Args:
+            tenant_id: Tenant identifier
+            user_id: User identifier (optional, counts all users if None)
+            active_only: Only count active memories
+            
+        Returns:
+            Number of matching memories
+        """
+        query = self.db.query(func.count()).select_from(Memory).filter(Memory.tenant_id == tenant_id)
+        
+        if user_id:
+            query = query.filter(Memory.user_id == user_id)
+        
+        if active_only:
+            query = query.filter(Memory.active == True)
+        
+        return query.scalar() or 0
+
+    def _discard_vectors(self, vector_write: Future, memory_ids: List[str], namespace: str) -> None:
+        """Undo a background vector write after the database write failed.
+        
+        Args:
+            vector_write: Future of the vector index upsert
+            memory_ids: Memory IDs that were written
+            namespace: Vector index namespace
+        """
+        try:
+            vector_write.result()
+        except Exception:
+            # Nothing to undo; the database error is the one reported
+            return
+        
+        try:
+            self.vector_index.delete(memory_ids, namespace)
+        except Exception as e:
+            logger.warning(f"Failed to remove vectors for {len(memory_ids)} unsaved memories in {namespace}: {e}")
+
+    def _update_ann_index(self, operation, tenant_id: str, user_id: str, *args: Any) -> None:
+        """Apply a write to the ANN index without failing the memory write.
+        
+        The index only speeds up consolidation, and memories missing from it
+        are added again on the next consolidation run.
+        
+        Args:
+            operation: Bound MemoryANNIndex method (add or remove)
+            tenant_id: Tenant identifier
+            user_id: User identifier
+            *args: Remaining arguments for the operation
+        """
+        try:
+            operation(tenant_id, user_id, *args)
+        except (OSError, RuntimeError, ValueError) as e:
+            logger.warning(f"Failed to update ANN index for tenant={tenant_id}, user={user_id}: {e}")
+
+    def _update_user_stats(
+        self,
+        tenant_id: str,
+        user_id: str,
+        added: int = 0,
+        added_importance: float = 0.0,
+        removed: int = 0,
+        removed_importance: float = 0.0,
+    ) -> None:
         """Update user memory statistics.
         
+        Existing stats are adjusted in place by the given deltas (see
+        user_stats_delta_update). Users without a stats row get one from a
+        full recompute.
+        
         Args:
             tenant_id: Tenant identifier
             user_id: User identifier
+            added: Number of memories added
+            added_importance: Sum of the added memories' importance
+            removed: Number of active memories deactivated
+            removed_importance: Sum of the deactivated memories' importance
         """
         try:
-            # Get current stats
-            stats = self.db.query(UserMemoryStats).filter(
-                and_(
-                    UserMemoryStats.tenant_id == tenant_id,
-                    UserMemoryStats.user_id == user_id,
-                )
-            ).first()
-            
-            # Calculate new stats
-            total_memories = self.db.query(func.count(Memory.id)).filter(
-                and_(
-                    Memory.tenant_id == tenant_id,
-                    Memory.user_id == user_id,
-                )
-            ).scalar()
-            
-            active_memories = self.db.query(func.count(Memory.id)).filter(
-                and_(
-                    Memory.tenant_id == tenant_id,
-                    Memory.user_id == user_id,
-                    Memory.active == True,
-                )
-            ).scalar()
+            result = self.db.execute(
+                user_stats_delta_update().values(last_seen_at=func.now()),
+                {
+                    "stats_tenant_id": tenant_id,
+                    "stats_user_id": user_id,
+                    "added": added,
+                    "added_importance": added_importance,
+                    "removed": removed,
+                    "removed_importance": removed_importance,
+                },
+            )
             
-            avg_importance = self.db.query(func.avg(Memory.importance)).filter(
-                and_(
-                    Memory.tenant_id == tenant_id,
-                    Memory.user_id == user_id,
-                    Memory.active == True,
-                )
-            ).scalar() or 0.0
-            
-            if stats:
-                # Update existing stats
-                stats.total_memories = total_memories
-                stats.active_memories = active_memories
-                stats.avg_importance = float(avg_importance)
-                stats.last_seen_at = datetime.now()
-            else:
-                # Create new stats
-                stats = UserMemoryStats(
-                    tenant_id=tenant_id,
-                    user_id=user_id,
-                    total_memories=total_memories,
-                    active_memories=active_memories,
-                    avg_importance=float(avg_importance),
-                    last_seen_at=datetime.now(),
-                )
-                self.db.add(stats)
+            if result.rowcount == 0:
+                self._recompute_user_stats(tenant_id, user_id)
             
             self.db.commit()
             
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Failed to update user stats: {e}")
             # Don't raise - this is not critical
 
+    def _recompute_user_stats(self, tenant_id: str, user_id: str) -> UserMemoryStats:
+        """Recompute user memory statistics from the memories table.
+        
+        Args:
+            tenant_id: Tenant identifier
+            user_id: User identifier
+            
+        Returns:
+            Updated or newly added stats, not yet committed
+        """
+        total_memories, active_memories, avg_importance = self.db.query(
+            func.count(),
+            func.count().filter(Memory.active == True),
+            func.avg(Memory.importance).filter(Memory.active == True),
+        ).filter(
+            Memory.tenant_id == tenant_id,
+            Memory.user_id == user_id,
+        ).one()
+        
+        stats = self.db.query(UserMemoryStats).filter(
+            and_(
+                UserMemoryStats.tenant_id == tenant_id,
+                UserMemoryStats.user_id == user_id,
+            )
+        ).first()
+        
+        if stats is None:
+            stats = UserMemoryStats(tenant_id=tenant_id, user_id=user_id)
+            self.db.add(stats)
+        
+        stats.total_memories = total_memories
+        stats.active_memories = active_memories
+        stats.avg_importance = float(avg_importance or 0.0)
+        stats.last_seen_at = func.now()
+        return stats
+
     def get_user_stats(self, tenant_id: str, user_id: str) -> Optional[UserMemoryStats]:
         """Get user memory statistics.
         
@@ -490,9 +674,7 @@ class MemoryStore:
             List of memories
         """
         try:
-            from engram.database.postgres import get_db_session
-            
-            with get_db_session() as session:
+            with get_session() as session:
                 query = session.query(Memory).filter(
                     Memory.tenant_id == tenant_id,
                     Memory.user_id == user_id,
@@ -520,11 +702,11 @@ class MemoryStore:
             Dictionary with store statistics
         """
         try:
-            total_tenants = self.db.query(func.count(Tenant.id)).scalar()
-            total_memories = self.db.query(func.count(Memory.id)).scalar()
-            active_memories = self.db.query(func.count(Memory.id)).filter(
-                Memory.active == True
-            ).scalar()
+            total_tenants = self.db.query(func.count()).select_from(Tenant).scalar()
+            total_memories, active_memories = self.db.query(
+                func.count(),
+                func.count().filter(Memory.active == True),
+            ).select_from(Memory).one()
             
             return {
                 "total_tenants": total_tenants,
@@ -1,8 +1,17 @@
 """Retrieval engine for semantic memory search and ranking."""
 
+import logging
 import math
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+from redis import RedisError
 
 from engram.vectordb.base import VectorIndex, VectorHit
 from engram.utils.config import get_settings
@@ -10,10 +19,273 @@ from engram.utils.logger import get_logger
 
 if TYPE_CHECKING:
     from engram.core.memory_store import MemoryStore
+    from engram.database.models import Memory
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+SECONDS_PER_DAY = 24 * 3600
+
+# Redis key prefix of the per-user cache generations shared by all processes
+CACHE_GENERATION_PREFIX = "engram:retrieval-generation:"
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, including a trailing Z for UTC.
+    
+    Cached because the same memory timestamps recur across queries.
+    
+    Raises:
+        ValueError: If the string is not a valid timestamp
+    """
+    # The C parser accepts "Z" and other ISO 8601 forms on Python 3.11+
+    return datetime.fromisoformat(value)
+
+
+def _epoch_seconds(value: Any) -> float:
+    """Convert an ISO 8601 string or datetime to seconds since the epoch.
+    
+    Naive timestamps are read as local time, like ``datetime.now()``.
+    
+    Args:
+        value: Timestamp, with or without a UTC offset
+        
+    Returns:
+        POSIX timestamp, or NaN if the value is missing or invalid
+    """
+    try:
+        if isinstance(value, str):
+            value = _parse_iso(value)
+        return value.timestamp() if isinstance(value, datetime) else math.nan
+    except (ValueError, OverflowError, OSError):
+        return math.nan
+
+
+def cosine_similarities(query: Sequence[float], vectors: Sequence[Sequence[float]]) -> np.ndarray:
+    """Calculate the cosine similarity of a query with each of several vectors.
+    
+    The vectors are stacked into one matrix and scored with a single
+    matrix-vector product.
+    
+    Args:
+        query: Query vector
+        vectors: Vectors to compare against
+        
+    Returns:
+        float32 similarities aligned with vectors; 0.0 where a vector has a
+        different dimension (e.g. another modality's embedding) or a zero norm
+    """
+    query = np.asarray(query, dtype=np.float32)
+    similarities = np.zeros(len(vectors), dtype=np.float32)
+    rows = [i for i, vector in enumerate(vectors) if len(vector) == len(query)]
+    if not rows:
+        return similarities
+    
+    matrix = np.asarray([vectors[i] for i in rows], dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        similarities[rows] = np.where(norms > 0, (matrix @ query) / norms, 0.0)
+    return similarities
+
+
+def top_k_indices(scores: np.ndarray, k: Optional[int]) -> np.ndarray:
+    """Get the indices of the k highest scores, best first.
+    
+    Only the top k scores are sorted, after an O(n) partial selection.
+    
+    Args:
+        scores: 1-D array of scores
+        k: Number of indices to return (all if None)
+        
+    Returns:
+        Indices into scores in descending score order
+    """
+    if k is None or k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    
+    # Sorting the selected indices first keeps ties in their original order
+    top = np.sort(np.argpartition(-scores, k - 1)[:k])
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class RetrievalCache:
+    """Short-lived LRU cache of retrieval results per (tenant, user, query).
+    
+    Repeated queries are answered without embedding the query, searching
+    the vector index or reading the database. Writes through the memory
+    store invalidate a user's entries; other changes, such as forgetting
+    sweeps, become visible once entries expire.
+    
+    Entries are keyed by a per-user generation that invalidation bumps.
+    With a Redis client the generations are shared, so a write handled by
+    one worker process invalidates the user's entries in all of them; each
+    lookup then costs one Redis GET, and lookups are misses while Redis is
+    unreachable. Without one they live in this process only.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        ttl: Optional[float] = None,
+        redis_client=None,
+    ):
+        """Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of cached queries
+            ttl: Seconds a cached result stays valid
+            redis_client: Optional Redis client sharing generations between
+                processes
+        """
+        self.maxsize = settings.retrieval_cache_size if maxsize is None else maxsize
+        self.ttl = settings.retrieval_cache_ttl if ttl is None else ttl
+        self.redis_client = redis_client
+        self._entries: "OrderedDict[bytes, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        # Bumping a user's generation orphans all of their cached keys
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _generation(self, namespace: str) -> Optional[int]:
+        """Get a user's current generation, or None if it cannot be read."""
+        if self.redis_client is None:
+            with self._lock:
+                return self._generations.get(namespace, 0)
+        try:
+            return int(self.redis_client.get(CACHE_GENERATION_PREFIX + namespace) or 0)
+        except RedisError as e:
+            # Once per lookup while Redis is down, so kept out of warnings
+            logger.debug(f"Failed to read retrieval cache generation for {namespace}: {e}")
+            return None
+
+    @staticmethod
+    def _key(namespace: str, generation: int, query: str, top_k: Optional[int]) -> bytes:
+        """Build the cache key."""
+        raw = f"{namespace}:{generation}:{top_k}:{query}".encode("utf-8")
+        return blake2b(raw, digest_size=16).digest()
+
+    def lookup(
+        self,
+        tenant_id: str,
+        user_id: str,
+        query: str,
+        top_k: Optional[int],
+    ) -> Tuple[Optional[int], Optional[List[Dict[str, Any]]]]:
+        """Look up cached results, along with the generation they belong to.
+        
+        Results computed after a miss must be stored with put() under the
+        generation returned here; a write that lands in between bumps the
+        generation, so those results are never served.
+        
+        Args:
+            tenant_id: Tenant identifier
+            user_id: User identifier
+            query: Query text
+            top_k: Requested number of results
+            
+        Returns:
+            Tuple of (the user's generation, or None if it could not be
+            read; copies of the cached result dictionaries, or None on a
+            miss)
+        """
+        namespace = f"{tenant_id}:{user_id}"
+        generation = self._generation(namespace)
+        if generation is None:
+            return None, None
+            
+        key = self._key(namespace, generation, query, top_k)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return generation, None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return generation, None
+            self._entries.move_to_end(key)
+            results = entry[1]
+        return generation, [dict(result) for result in results]
+
+    def get(
+        self,
+        tenant_id: str,
+        user_id: str,
+        query: str,
+        top_k: Optional[int],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Look up cached results.
+        
+        Args:
+            tenant_id: Tenant identifier
+            user_id: User identifier
+            query: Query text
+            top_k: Requested number of results
+            
+        Returns:
+            Copies of the cached result dictionaries, or None on a miss
+        """
+        return self.lookup(tenant_id, user_id, query, top_k)[1]
+
+    def put(
+        self,
+        tenant_id: str,
+        user_id: str,
+        query: str,
+        top_k: Optional[int],
+        results: List[Dict[str, Any]],
+        generation: Optional[int] = None,
+    ) -> None:
+        """Cache results for a query.
+        
+        Args:
+            tenant_id: Tenant identifier
+            user_id: User identifier
+            query: Query text
+            top_k: Requested number of results
+            results: Result dictionaries to cache
+            generation: Generation returned by the lookup() that missed;
+                defaults to the current one, which is only safe for results
+                known to reflect every write so far
+        """
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+            
+        namespace = f"{tenant_id}:{user_id}"
+        if generation is None:
+            generation = self._generation(namespace)
+            if generation is None:
+                return
+            
+        key = self._key(namespace, generation, query, top_k)
+        expires_at = time.monotonic() + self.ttl
+        results = [dict(result) for result in results]
+        with self._lock:
+            self._entries[key] = (expires_at, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tenant_id: str, user_id: str) -> None:
+        """Drop all cached results for a user.
+        
+        Args:
+            tenant_id: Tenant identifier
+            user_id: User identifier
+        """
+        namespace = f"{tenant_id}:{user_id}"
+        if self.redis_client is None:
+            with self._lock:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            return
+        try:
+            self.redis_client.incr(CACHE_GENERATION_PREFIX + namespace)
+        except RedisError as e:
+            # Entries are keyed by digest, so this process drops them all
+            logger.warning(f"Failed to invalidate retrieval cache for {namespace}: {e}")
+            with self._lock:
+                self._entries.clear()
+
 
 class RetrievalEngine:
     """Engine for retrieving and ranking memories based on semantic similarity."""
@@ -55,7 +327,7 @@ class RetrievalEngine:
         namespace = f"{tenant_id}:{user_id}"
         
         try:
-            logger.debug(f"Retrieving memories for tenant={tenant_id}, user={user_id}, top_k={top_k}")
+            logger.debug("Retrieving memories for tenant=%s, user=%s, top_k=%d", tenant_id, user_id, top_k)
             
             # Query vector database
             results = self.vector_index.query(
@@ -71,13 +343,10 @@ class RetrievalEngine:
             
             hits = results[0]
             
-            # Re-rank results using composite scoring
-            ranked_hits = self._rerank_hits(hits, query_vector)
+            # Re-rank results using composite scoring and keep the top_k
+            final_results = self._rerank_hits(hits, query_vector, top_k=top_k, explain=settings.debug)
             
-            # Return top_k results
-            final_results = ranked_hits[:top_k]
-            
-            logger.debug(f"Retrieved {len(final_results)} ranked memories")
+            logger.debug("Retrieved %d ranked memories", len(final_results))
             return final_results
             
         except Exception as e:
@@ -88,59 +357,89 @@ class RetrievalEngine:
         self,
         hits: List[VectorHit],
         query_vector: List[float],
+        top_k: Optional[int] = None,
+        explain: bool = False,
     ) -> List[VectorHit]:
         """Re-rank hits using composite scoring.
         
+        Scores for all hits are computed together as NumPy arrays; new hits
+        are only built for the ones that are returned.
+        
         Args:
             hits: List of vector hits from database
             query_vector: Original query vector
+            top_k: Number of top hits to return (all hits if None)
+            explain: Add the score components (original_score, recency_boost,
+                decay_penalty, composite_score) to a copy of each hit's
+                metadata; otherwise hits share the original metadata
             
         Returns:
             List of re-ranked hits
         """
-        scored_hits = []
-        
-        for hit in hits:
-            # Extract metadata
-            metadata = hit.metadata
-            importance = metadata.get("importance", 0.5)
-            last_accessed = metadata.get("last_accessed_at")
-            created_at = metadata.get("created_at")
-            
-            # Calculate recency boost
-            recency_boost = self._calculate_recency_boost(last_accessed, created_at)
-            
-            # Calculate decay penalty
-            decay_penalty = self._calculate_decay_penalty(created_at, metadata.get("decay_weight", 1.0))
-            
-            # Composite score
-            score = (
-                self.alpha * hit.score +           # Cosine similarity
-                self.beta * recency_boost +        # Recency boost
-                self.gamma * importance -          # Importance weight
-                self.delta * decay_penalty         # Decay penalty
-            )
-            
-            # Create new hit with updated score
-            scored_hit = VectorHit(
-                id=hit.id,
-                score=max(0.0, min(1.0, score)),  # Clamp to [0, 1]
+        count = len(hits)
+        if not count:
+            return []
+        
+        metadatas = [hit.metadata for hit in hits]
+        scores = np.fromiter((hit.score for hit in hits), dtype=np.float64, count=count)
+        importance = np.fromiter(
+            (metadata.get("importance", 0.5) for metadata in metadatas), dtype=np.float64, count=count
+        )
+        decay_weight = np.fromiter(
+            (metadata.get("decay_weight", 1.0) for metadata in metadatas), dtype=np.float64, count=count
+        )
+        
+        # Seconds since the epoch; NaN where a timestamp is missing or invalid.
+        # Each distinct timestamp is converted once per call.
+        now = time.time()
+        created_values = [metadata.get("created_at") for metadata in metadatas]
+        last_values = [
+            metadata.get("last_accessed_at") or created
+            for metadata, created in zip(metadatas, created_values)
+        ]
+        seconds = {value: _epoch_seconds(value) for value in {*created_values, *last_values}}
+        created_at = np.fromiter(map(seconds.__getitem__, created_values), dtype=np.float64, count=count)
+        last_accessed = np.fromiter(map(seconds.__getitem__, last_values), dtype=np.float64, count=count)
+        
+        recency_boost = self._calculate_recency_boost_batch(last_accessed, now)
+        decay_penalty = self._calculate_decay_penalty_batch(created_at, decay_weight, now)
+        
+        # Composite score
+        alpha, beta, gamma, delta = self.alpha, self.beta, self.gamma, self.delta
+        composite = alpha * scores                 # Cosine similarity
+        composite += beta * recency_boost          # Recency boost
+        composite += gamma * importance            # Importance weight
+        composite -= delta * decay_penalty         # Decay penalty
+        clamped = np.clip(composite, 0.0, 1.0)
+        
+        # Select and sort the best hits by clamped score (descending)
+        order = top_k_indices(clamped, top_k)
+        
+        if not explain:
+            ranked_hits = [
+                VectorHit(id=hits[i].id, score=float(clamped[i]), metadata=metadatas[i])
+                for i in order.tolist()
+            ]
+            logger.debug("Re-ranked %d hits", count)
+            return ranked_hits
+        
+        ranked_hits = [
+            VectorHit(
+                id=hits[i].id,
+                score=float(clamped[i]),
                 metadata={
-                    **metadata,
-                    "original_score": hit.score,
-                    "recency_boost": recency_boost,
-                    "decay_penalty": decay_penalty,
-                    "composite_score": score,
+                    **metadatas[i],
+                    "original_score": hits[i].score,
+                    "recency_boost": float(recency_boost[i]),
+                    "decay_penalty": float(decay_penalty[i]),
+                    "composite_score": float(composite[i]),
                 },
             )
-            
-            scored_hits.append(scored_hit)
+            for i in order.tolist()
+        ]
         
-        # Sort by composite score (descending)
-        scored_hits.sort(key=lambda x: x.score, reverse=True)
-        
-        logger.debug(f"Re-ranked {len(scored_hits)} hits")
-        return scored_hits
+        logger.debug("Re-ranked %d hits", count)
+        return ranked_hits
 
     def _calculate_recency_boost(
         self,
@@ -156,30 +455,25 @@ class RetrievalEngine:
         Returns:
             Recency boost factor (0.0 to 1.0)
         """
-        try:
-            # Use last_accessed if available, otherwise use created_at
-            timestamp_str = last_accessed or created_at
-            if not timestamp_str:
-                return 0.0
-            
-            # Parse timestamp
-            if isinstance(timestamp_str, str):
-                timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            else:
-                timestamp = timestamp_str
-            
-            # Calculate days since last access
-            now = datetime.now(timestamp.tzinfo) if timestamp.tzinfo else datetime.now()
-            days_since = (now - timestamp).total_seconds() / (24 * 3600)
+        # Use last_accessed if available, otherwise use created_at
+        timestamps = np.array([_epoch_seconds(last_accessed or created_at)])
+        return float(self._calculate_recency_boost_batch(timestamps, time.time())[0])
+
+    def _calculate_recency_boost_batch(self, last_accessed: np.ndarray, now: float) -> np.ndarray:
+        """Calculate recency boost factors for many memories at once.
+        
+        Args:
+            last_accessed: Last access (or creation) times in epoch seconds,
+                NaN where unknown
+            now: Current time in epoch seconds
             
+        Returns:
+            Recency boost factors (0.0 to 1.0), 0.0 where the time is unknown
+        """
+        with np.errstate(over="ignore", invalid="ignore"):
             # Exponential decay: exp(-days / tau)
-            boost = math.exp(-days_since / self.tau_days)
-            
-            return max(0.0, min(1.0, boost))
-            
-        except Exception as e:
-            logger.debug(f"Failed to calculate recency boost: {e}")
-            return 0.0
+            boost = np.exp((last_accessed - now) * (1.0 / (SECONDS_PER_DAY * self.tau_days)))
+        return np.clip(np.nan_to_num(boost, nan=0.0), 0.0, 1.0)
 
     def _calculate_decay_penalty(
         self,
@@ -195,29 +489,31 @@ class RetrievalEngine:
         Returns:
             Decay penalty factor (0.0 to 1.0)
         """
-        try:
-            if not created_at:
-                return 0.0
-            
-            # Parse timestamp
-            if isinstance(created_at, str):
-                timestamp = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-            else:
-                timestamp = created_at
-            
-            # Calculate age in days
-            now = datetime.now(timestamp.tzinfo) if timestamp.tzinfo else datetime.now()
-            age_days = (now - timestamp).total_seconds() / (24 * 3600)
+        timestamps = np.array([_epoch_seconds(created_at)])
+        decay_weights = np.array([decay_weight], dtype=np.float64)
+        return float(self._calculate_decay_penalty_batch(timestamps, decay_weights, time.time())[0])
+
+    def _calculate_decay_penalty_batch(
+        self,
+        created_at: np.ndarray,
+        decay_weight: np.ndarray,
+        now: float,
+    ) -> np.ndarray:
+        """Calculate decay penalty factors for many memories at once.
+        
+        Args:
+            created_at: Creation times in epoch seconds, NaN where unknown
+            decay_weight: Decay weights from metadata
+            now: Current time in epoch seconds
             
+        Returns:
+            Decay penalty factors (0.0 to 1.0), 0.0 where the time is unknown
+        """
+        with np.errstate(over="ignore", invalid="ignore"):
             # Linear decay with weight factor
             # Penalty increases with age but is modulated by decay_weight
-            penalty = (age_days / 365.0) * (1.0 - decay_weight)  # Normalize to year
-            
-            return max(0.0, min(1.0, penalty))
-            
-        except Exception as e:
-            logger.debug(f"Failed to calculate decay penalty: {e}")
-            return 0.0
+            penalty = (now - created_at) * (1.0 / (SECONDS_PER_DAY * 365.0)) * (1.0 - decay_weight)
+        return np.clip(np.nan_to_num(penalty, nan=0.0), 0.0, 1.0)
 
     def find_similar_memories(
         self,
@@ -239,31 +535,62 @@ class RetrievalEngine:
         Returns:
             List of similar memories
         """
+        return self.find_similar_memories_batch(
+            memory_vectors=[memory_vector],
+            tenant_id=tenant_id,
+            user_id=user_id,
+            similarity_threshold=similarity_threshold,
+            exclude_ids=[exclude_id],
+        )[0]
+
+    def find_similar_memories_batch(
+        self,
+        memory_vectors: List[List[float]],
+        tenant_id: str,
+        user_id: str,
+        similarity_threshold: Optional[float] = None,
+        exclude_ids: Optional[List[Optional[str]]] = None,
+    ) -> List[List[VectorHit]]:
+        """Find memories similar to each of several memories in one query.
+        
+        All vectors are sent to the vector database in a single batched
+        query against the user's namespace, instead of one round trip each.
+        
+        Args:
+            memory_vectors: Memory embedding vectors
+            tenant_id: Tenant identifier
+            user_id: User identifier
+            similarity_threshold: Minimum similarity threshold
+            exclude_ids: Memory ID to exclude from each vector's results
+                (typically the memory itself), aligned with memory_vectors
+            
+        Returns:
+            List of similar-memory lists, aligned with memory_vectors
+        """
+        if not memory_vectors:
+            return []
+        
         threshold = similarity_threshold or settings.similarity_threshold
         namespace = f"{tenant_id}:{user_id}"
         
         try:
-            # Query vector database
-            results = self.vector_index.query(
-                vectors=[memory_vector],
-                top_k=50,  # Get more results for filtering
+            # Query vector database; the index applies the threshold and
+            # exclusions, so excluded IDs do not use up result slots
+            similar_hits = list(self.vector_index.query(
+                vectors=memory_vectors,
+                top_k=50,
                 namespace=namespace,
-            )
-            
-            if not results or not results[0]:
-                return []
+                score_threshold=threshold,
+                exclude_ids=exclude_ids,
+            ) or [])
             
-            hits = results[0]
-            
-            # Filter by similarity threshold and exclude ID
-            similar_hits = []
-            for hit in hits:
-                if hit.score >= threshold:
-                    if exclude_id and hit.id == exclude_id:
-                        continue
-                    similar_hits.append(hit)
+            # Backends may return fewer lists than queries when nothing matches
+            similar_hits.extend([] for _ in range(len(memory_vectors) - len(similar_hits)))
             
-            logger.debug(f"Found {len(similar_hits)} similar memories above threshold {threshold}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Found %d similar memories above threshold %s", sum(map(len, similar_hits)), threshold
+                )
             return similar_hits
             
         except Exception as e:
@@ -288,6 +615,48 @@ class RetrievalEngine:
             "vector_provider": self.vector_index.provider_name if self.vector_index else "none",
         }
     
+    def _get_memory_embeddings(
+        self,
+        memories: List["Memory"],
+        namespace: str,
+        embeddings_registry: Any,
+    ) -> List[Sequence[float]]:
+        """Get the embeddings of memories, preferring the stored vectors.
+        
+        Vectors are fetched from the vector index in one call. Memories it
+        does not have are embedded with one batched call per modality.
+        
+        Args:
+            memories: Memories to get embeddings for
+            namespace: Vector index namespace of the memories
+            embeddings_registry: Multimodal embeddings registry for fallback
+            
+        Returns:
+            Embeddings aligned with memories
+        """
+        stored: Dict[str, Sequence[float]] = {}
+        if self.vector_index is not None:
+            try:
+                stored = self.vector_index.fetch([memory.id for memory in memories], namespace)
+            except Exception as e:
+                logger.warning(f"Failed to fetch stored embeddings, re-embedding memories: {e}")
+        
+        embeddings = [stored.get(memory.id) for memory in memories]
+        
+        missing: Dict[str, List[int]] = {}
+        for i, embedding in enumerate(embeddings):
+            if embedding is None:
+                missing.setdefault(memories[i].modality.value, []).append(i)
+        
+        for modality, rows in missing.items():
+            vectors = embeddings_registry.embed_texts([memories[i].text for i in rows], modality)
+            for i, vector in zip(rows, vectors):
+                embeddings[i] = vector
+        
+        if missing:
+            logger.debug("Embedded %d memories without stored vectors", sum(map(len, missing.values())))
+        return embeddings
+
     def retrieve(
         self,
         tenant_id: str,
@@ -311,8 +680,8 @@ class RetrievalEngine:
         try:
             from engram.providers.multimodal_registry import embeddings_registry
             
-            # Generate query embedding for text search
-            query_embedding = embeddings_registry.embed_texts([query], "text")[0]
+            # Generate query embedding for text search (cached for repeated queries)
+            query_embedding = embeddings_registry.embed_query(query, "text")
             
             # Get memory store instance
             from engram.core.memory_store import MemoryStore
@@ -334,39 +703,20 @@ class RetrievalEngine:
             if not memories:
                 return []
             
-            # Prepare for vector search
-            memory_items = []
-            for memory in memories:
-                # Get embedding for this memory
-                # In a real implementation, you'd store embeddings during ingestion
-                # For now, we'll generate them on-the-fly (not ideal for performance)
-                text_embedding = embeddings_registry.embed_texts([memory.text], memory.modality.value)[0]
-                
-                memory_items.append({
-                    "memory": memory,
-                    "embedding": text_embedding,
-                })
-            
-            # Calculate similarities
-            similarities = []
-            for item in memory_items:
-                similarity = self._cosine_similarity(query_embedding, item["embedding"])
-                similarities.append({
-                    "memory": item["memory"],
-                    "similarity": similarity,
-                })
-            
-            # Sort by similarity
-            similarities.sort(key=lambda x: x["similarity"], reverse=True)
+            # Score memories against the embeddings stored at ingest
+            similarities = cosine_similarities(
+                query_embedding,
+                self._get_memory_embeddings(memories, f"{tenant_id}:{user_id}", embeddings_registry),
+            )
             
-            # Format results
+            # Format results for the most similar memories
             results = []
-            for sim in similarities[:top_k]:
-                memory = sim["memory"]
+            for i in top_k_indices(similarities, top_k).tolist():
+                memory = memories[i]
                 results.append({
                     "memory_id": memory.id,
                     "text": memory.text,
-                    "score": sim["similarity"],
+                    "score": float(similarities[i]),
                     "metadata": {
                         "modality": memory.modality.value,
                         "source_uri": memory.source_uri,
@@ -382,32 +732,3 @@ class RetrievalEngine:
         except Exception as e:
             logger.error(f"Hybrid retrieval failed: {e}")
             return []
-    
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors.
-        
-        Args:
-            vec1: First vector
-            vec2: Second vector
-            
-        Returns:
-            Cosine similarity score
-        """
-        try:
-            import numpy as np
-            
-            vec1 = np.array(vec1)
-            vec2 = np.array(vec2)
-            
-            dot_product = np.dot(vec1, vec2)
-            norm1 = np.linalg.norm(vec1)
-            norm2 = np.linalg.norm(vec2)
-            
-            if norm1 == 0 or norm2 == 0:
-                return 0.0
-            
-            return dot_product / (norm1 * norm2)
-            
-        except Exception as e:
-            logger.error(f"Error calculating cosine similarity: {e}")
-            return 0.0
@@ -0,0 +1,50 @@
+"""add_memory_partial_indexes
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-02-01 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+# Partial indexes over active memories, matching the forgetting sweeps
+# (tenant, importance, last access), the retention sweep (tenant, created_at)
+# and per-user listing and retrieval (tenant, user)
+PARTIAL_INDEXES = [
+    ('idx_memories_forget_low', ['tenant_id', 'importance', 'last_accessed_at']),
+    ('idx_memories_forget_old', ['tenant_id', 'created_at']),
+    ('idx_memories_tenant_user_active', ['tenant_id', 'user_id']),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, columns in PARTIAL_INDEXES:
+            op.create_index(
+                name,
+                'memories',
+                columns,
+                unique=False,
+                postgresql_where=sa.text('active = true'),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(PARTIAL_INDEXES):
+            op.drop_index(
+                name,
+                table_name='memories',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,73 @@
+"""add_memory_user_order_indexes
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-02-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+# Partial indexes over a user's active memories in the orders they are read:
+# newest first for listing and hybrid retrieval, and by last access for the
+# access analytics. The first supersedes idx_memories_tenant_user_active.
+PARTIAL_INDEXES = [
+    ('idx_memories_user_created', ['tenant_id', 'user_id', 'created_at']),
+    ('idx_memories_user_accessed', ['tenant_id', 'user_id', 'last_accessed_at']),
+]
+
+# Indexes no query filters or sorts on any more
+DROPPED_INDEXES = [
+    ('idx_memories_tenant_user_active', ['tenant_id', 'user_id'], sa.text('active = true')),
+    ('idx_memories_importance', ['importance'], None),
+    ('idx_memories_last_accessed', ['last_accessed_at'], None),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, columns in PARTIAL_INDEXES:
+            op.create_index(
+                name,
+                'memories',
+                columns,
+                unique=False,
+                postgresql_where=sa.text('active = true'),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name, _, _ in DROPPED_INDEXES:
+            op.drop_index(
+                name,
+                table_name='memories',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, where in DROPPED_INDEXES:
+            op.create_index(
+                name,
+                'memories',
+                columns,
+                unique=False,
+                postgresql_where=where,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name, _ in reversed(PARTIAL_INDEXES):
+            op.drop_index(
+                name,
+                table_name='memories',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,140 @@
+"""partition_analytics_tables
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-02-22 12:00:00.000000
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+# Monthly partitions created past the one holding existing rows; the API
+# server keeps creating them ahead of time from then on
+MONTHS_AHEAD = 2
+
+# Indexes of each table, recreated as partitioned indexes so every month
+# carries its own small copy
+INDEXES = {
+    'request_logs': [
+        ('idx_request_logs_tenant_created', ['tenant_id', 'created_at']),
+        ('idx_request_logs_user_created', ['user_id', 'created_at']),
+        ('idx_request_logs_route_created', ['route', 'created_at']),
+        ('idx_request_logs_status_created', ['status_code', 'created_at']),
+    ],
+    'system_metrics': [
+        ('idx_system_metrics_tenant_name', ['tenant_id', 'metric_name']),
+        ('idx_system_metrics_created_at', ['created_at']),
+    ],
+}
+
+
+def _columns(table):
+    """Build the columns of an analytics table as created by 002."""
+    if table == 'request_logs':
+        return [
+            sa.Column('id', sa.String(26), nullable=False),
+            sa.Column('tenant_id', sa.String(26), nullable=False),
+            sa.Column('user_id', sa.String(26), nullable=False),
+            sa.Column('request_id', sa.String(26), nullable=False),
+            sa.Column('route', sa.String(255), nullable=False),
+            sa.Column('method', sa.String(10), nullable=False),
+            sa.Column('status_code', sa.Integer(), nullable=False),
+            sa.Column('duration_ms', sa.Integer(), nullable=False),
+            sa.Column('tokens_used', sa.Integer(), nullable=True),
+            sa.Column('cost_usd', sa.Float(), nullable=True),
+            sa.Column('user_agent', sa.String(500), nullable=True),
+            sa.Column('ip_address', sa.String(45), nullable=True),
+            sa.Column('request_metadata', sa.JSON(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        ]
+    # IDs keep coming from the sequence created with the original table
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('system_metrics_id_seq'::regclass)"), nullable=False),
+        sa.Column('tenant_id', sa.String(26), nullable=False),
+        sa.Column('metric_name', sa.String(255), nullable=False),
+        sa.Column('metric_value', sa.Float(), nullable=False),
+        sa.Column('metric_unit', sa.String(50), nullable=True),
+        sa.Column('tags', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    ]
+
+
+def _month_start(value, offset=0):
+    month = value.year * 12 + value.month - 1 + offset
+    return datetime(month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def upgrade() -> None:
+    # Existing rows stay where they are, attached as one partition covering
+    # everything before next month; it is dropped once it ages out
+    boundary = _month_start(datetime.now(timezone.utc), 1)
+
+    for table, indexes in INDEXES.items():
+        legacy = f'{table}_before_{boundary:%Y_%m}'
+        op.rename_table(table, legacy)
+        # A partition cannot keep a primary key other than its parent's;
+        # ATTACH builds the (id, created_at) key on the legacy rows instead
+        op.drop_constraint(f'{table}_pkey', legacy, type_='primary')
+        for name, _ in indexes:
+            op.execute(f"ALTER INDEX {name} RENAME TO {name.replace(f'idx_{table}', f'idx_{legacy}')}")
+
+        op.create_table(
+            table,
+            *_columns(table),
+            sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+            sa.PrimaryKeyConstraint('id', 'created_at'),
+            postgresql_partition_by='RANGE (created_at)',
+        )
+        if table == 'system_metrics':
+            # Keep the sequence when the legacy partition is dropped
+            op.execute('ALTER SEQUENCE system_metrics_id_seq OWNED BY system_metrics.id')
+        for name, columns in indexes:
+            op.create_index(name, table, columns, unique=False)
+
+        # A validated CHECK lets ATTACH skip scanning the legacy rows
+        check = f'{legacy}_bound'
+        op.execute(
+            f"ALTER TABLE {legacy} ADD CONSTRAINT {check} "
+            f"CHECK (created_at < '{boundary.isoformat()}') NOT VALID"
+        )
+        op.execute(f'ALTER TABLE {legacy} VALIDATE CONSTRAINT {check}')
+        op.execute(
+            f"ALTER TABLE {table} ATTACH PARTITION {legacy} "
+            f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')"
+        )
+        op.execute(f'ALTER TABLE {legacy} DROP CONSTRAINT {check}')
+
+        for offset in range(MONTHS_AHEAD):
+            start = _month_start(boundary, offset)
+            end = _month_start(boundary, offset + 1)
+            op.execute(
+                f"CREATE TABLE {table}_{start:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+
+
+def downgrade() -> None:
+    for table, indexes in INDEXES.items():
+        unpartitioned = f'{table}_unpartitioned'
+        op.execute(f'CREATE TABLE {unpartitioned} (LIKE {table} INCLUDING DEFAULTS)')
+        op.execute(f'INSERT INTO {unpartitioned} SELECT * FROM {table}')
+        if table == 'system_metrics':
+            op.execute('ALTER SEQUENCE system_metrics_id_seq OWNED BY NONE')
+
+        # Dropping the parent drops every partition with it
+        op.drop_table(table)
+        op.rename_table(unpartitioned, table)
+        op.create_primary_key(f'{table}_pkey', table, ['id'])
+        op.create_foreign_key(f'{table}_tenant_id_fkey', table, 'tenants', ['tenant_id'], ['id'])
+        if table == 'system_metrics':
+            op.execute('ALTER SEQUENCE system_metrics_id_seq OWNED BY system_metrics.id')
+        for name, columns in indexes:
+            op.create_index(name, table, columns, unique=False)
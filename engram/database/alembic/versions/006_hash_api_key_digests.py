@@ -0,0 +1,46 @@
+"""hash_api_key_digests
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-02-29 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing bcrypt hashes cannot be turned into digests; they move to
+    # legacy_key_hash and each key gets its digest the first time it is used
+    op.drop_index('ix_api_keys_key_hash', table_name='api_keys')
+    op.drop_constraint('api_keys_key_hash_key', 'api_keys', type_='unique')
+    op.alter_column('api_keys', 'key_hash', new_column_name='legacy_key_hash', nullable=True)
+    op.add_column('api_keys', sa.Column('key_hash', sa.LargeBinary(32), nullable=True))
+    # Keys are only ever looked up by equality on a fixed-size digest
+    op.create_index(
+        'ix_api_keys_key_hash',
+        'api_keys',
+        ['key_hash'],
+        unique=False,
+        postgresql_using='hash',
+    )
+
+
+def downgrade() -> None:
+    # Keys issued as digests have no bcrypt hash to fall back to, so they
+    # are revoked; the placeholder only has to be unique
+    op.execute(
+        "UPDATE api_keys SET active = false, legacy_key_hash = 'revoked:' || id "
+        "WHERE legacy_key_hash IS NULL"
+    )
+    op.drop_index('ix_api_keys_key_hash', table_name='api_keys')
+    op.drop_column('api_keys', 'key_hash')
+    op.alter_column('api_keys', 'legacy_key_hash', new_column_name='key_hash', nullable=False)
+    op.create_unique_constraint('api_keys_key_hash_key', 'api_keys', ['key_hash'])
+    op.create_index('ix_api_keys_key_hash', 'api_keys', ['key_hash'], unique=True)
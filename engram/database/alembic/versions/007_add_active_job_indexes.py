@@ -0,0 +1,66 @@
+"""add_active_job_indexes
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-03-07 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+# Partial indexes over the small tail of jobs still queued or running;
+# completed and failed jobs, the bulk of the table, never enter them
+ACTIVE_JOB_INDEXES = [
+    ('idx_jobs_active', ['created_at']),
+    ('idx_jobs_tenant_active', ['tenant_id', 'created_at']),
+]
+
+ACTIVE_JOB_FILTER = "status IN ('pending', 'running')"
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, columns in ACTIVE_JOB_INDEXES:
+            op.create_index(
+                name,
+                'jobs',
+                columns,
+                unique=False,
+                postgresql_where=sa.text(ACTIVE_JOB_FILTER),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        # No query filters jobs by type, and every status change had to
+        # update this index
+        op.drop_index(
+            'idx_jobs_type_status',
+            table_name='jobs',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_jobs_type_status',
+            'jobs',
+            ['job_type', 'status'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, _ in reversed(ACTIVE_JOB_INDEXES):
+            op.drop_index(
+                name,
+                table_name='jobs',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,39 @@
+"""widen_request_log_request_id
+
+Revision ID: 008
+Revises: 007
+Create Date: 2024-03-08 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Callers may supply request IDs of up to 64 characters. Widening a
+    # varchar is a catalog-only change, recursed to every partition, and
+    # leaves the request_id index intact.
+    op.alter_column(
+        'request_logs',
+        'request_id',
+        type_=sa.String(64),
+        existing_type=sa.String(26),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'request_logs',
+        'request_id',
+        type_=sa.String(26),
+        existing_type=sa.String(64),
+        existing_nullable=False,
+        postgresql_using='left(request_id, 26)',
+    )
@@ -1,7 +1,8 @@
 """SQLAlchemy ORM models for analytics and monitoring."""
 
-from datetime import datetime
-from typing import Dict, Any, Optional
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
 
 from sqlalchemy import (
     Column,
@@ -13,12 +14,31 @@ from sqlalchemy import (
     ForeignKey,
     JSON,
     Float,
+    Sequence,
+    text,
 )
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, Session
 from sqlalchemy.sql import func
 
 from engram.database.models import Base
+from engram.database.postgres import get_session
+from engram.utils.config import get_settings
+from engram.utils.logger import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Tables range-partitioned by month on created_at, so analytics scans prune
+# to the months they cover and expired months are dropped whole
+PARTITIONED_TABLES = ("request_logs", "system_metrics")
+
+# Monthly partitions kept ready beyond the current month
+PARTITION_MONTHS_AHEAD = 2
+
+# Partitions are named <table>_YYYY_MM; rows written before partitioning
+# live in <table>_before_YYYY_MM, bounded above by that month
+PARTITION_NAME = re.compile(r"_(before_)?(\d{4})_(\d{2})$")
 
 
 class RequestLog(Base):
@@ -29,7 +49,7 @@ class RequestLog(Base):
     id = Column(String(26), primary_key=True)  # ULID
     tenant_id = Column(String(26), ForeignKey("tenants.id"), nullable=False, index=True)
     user_id = Column(String(26), nullable=False, index=True)
-    request_id = Column(String(26), nullable=False, index=True)  # For tracing
+    request_id = Column(String(64), nullable=False, index=True)  # ULID or caller-supplied, for tracing
     route = Column(String(255), nullable=False, index=True)  # e.g., "/v1/chat"
     method = Column(String(10), nullable=False, index=True)  # GET, POST, etc.
     status_code = Column(Integer, nullable=False, index=True)
@@ -39,17 +59,22 @@ class RequestLog(Base):
     user_agent = Column(String(500), nullable=True)
     ip_address = Column(String(45), nullable=True)  # IPv4 or IPv6
     request_metadata = Column(JSON, nullable=True, default=dict)  # Additional context
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Part of the table's primary key, as PostgreSQL requires of the partition key
+    created_at = Column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False
+    )
 
     # Relationships
-    tenant = relationship("Tenant")
+    tenant = relationship("Tenant", lazy="raise")
 
     __table_args__ = (
         Index("idx_request_logs_tenant_created", "tenant_id", "created_at"),
         Index("idx_request_logs_user_created", "user_id", "created_at"),
         Index("idx_request_logs_route_created", "route", "created_at"),
         Index("idx_request_logs_status_created", "status_code", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
 
     def __repr__(self) -> str:
         return f"<RequestLog(id={self.id}, route={self.route}, status={self.status_code})>"
@@ -79,21 +104,26 @@ class SystemMetrics(Base):
 
     __tablename__ = "system_metrics"
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
+    # Named sequence, as the composite primary key rules out SERIAL
+    id = Column(Integer, Sequence("system_metrics_id_seq"), primary_key=True)
     tenant_id = Column(String(26), ForeignKey("tenants.id"), nullable=False, index=True)
     metric_name = Column(String(255), nullable=False, index=True)
     metric_value = Column(Float, nullable=False)
     metric_unit = Column(String(50), nullable=True)  # e.g., "count", "ms", "bytes"
     tags = Column(JSON, nullable=True, default=dict)  # Additional labels
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False
+    )
 
     # Relationships
-    tenant = relationship("Tenant")
+    tenant = relationship("Tenant", lazy="raise")
 
     __table_args__ = (
         Index("idx_system_metrics_tenant_name", "tenant_id", "metric_name"),
         Index("idx_system_metrics_created_at", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
 
     def __repr__(self) -> str:
         return f"<SystemMetrics(name={self.metric_name}, value={self.metric_value})>"
@@ -109,3 +139,153 @@ class SystemMetrics(Base):
             "tags": self.tags,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
+
+
+def _month_start(value: datetime, offset: int = 0) -> datetime:
+    """Get the UTC start of the month ``offset`` months after ``value``."""
+    month = value.year * 12 + value.month - 1 + offset
+    return datetime(month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_bounds(name: str) -> Optional[Tuple[Optional[datetime], datetime]]:
+    """Get the created_at range of a partition from its name.
+    
+    Args:
+        name: Partition table name
+        
+    Returns:
+        (start, end) with an exclusive end and no start for the partition
+        holding rows from before partitioning, or None if the name does not
+        follow the naming scheme
+    """
+    match = PARTITION_NAME.search(name)
+    if match is None:
+        return None
+        
+    end = datetime(int(match.group(2)), int(match.group(3)), 1, tzinfo=timezone.utc)
+    if match.group(1):
+        return None, end
+    return end, _month_start(end, 1)
+
+
+def _list_partitions(session: Session, table: str) -> List[str]:
+    """List the partitions attached to a table."""
+    result = session.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    )
+    return [row[0] for row in result]
+
+
+def _lock_partitions(session: Session) -> None:
+    """Serialize partition maintenance across workers for this transaction."""
+    session.execute(text("SELECT pg_advisory_xact_lock(hashtext('engram_analytics_partitions'))"))
+
+
+def ensure_partitions(
+    session: Session,
+    now: Optional[datetime] = None,
+    months_ahead: int = PARTITION_MONTHS_AHEAD,
+) -> List[str]:
+    """Create the monthly partitions for this month and the coming ones.
+    
+    Months already covered by an existing partition are skipped. Only
+    PostgreSQL tables are partitioned; on other dialects this does nothing.
+    The caller commits.
+    
+    Args:
+        session: Database session
+        now: Current time, defaults to the wall clock
+        months_ahead: Months after the current one to create partitions for
+        
+    Returns:
+        Names of the partitions created
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return []
+        
+    now = now or datetime.now(timezone.utc)
+    _lock_partitions(session)
+    
+    created = []
+    for table in PARTITIONED_TABLES:
+        bounds = [partition_bounds(name) for name in _list_partitions(session, table)]
+        covered_until = max((end for start, end in filter(None, bounds)), default=None)
+        
+        for offset in range(months_ahead + 1):
+            start = _month_start(now, offset)
+            if covered_until is not None and start < covered_until:
+                continue
+                
+            end = _month_start(now, offset + 1)
+            name = f"{table}_{start:%Y_%m}"
+            session.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            ))
+            created.append(name)
+            
+    if created:
+        logger.info("Created analytics partitions: %s", ", ".join(created))
+    return created
+
+
+def drop_expired_partitions(
+    session: Session,
+    retention_days: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> List[str]:
+    """Drop partitions whose rows are all past the retention period.
+    
+    Dropping a partition removes a month of rows at once, without the
+    row-by-row DELETE and vacuum a plain table would need. Only PostgreSQL
+    tables are partitioned; on other dialects this does nothing. The
+    caller commits.
+    
+    Args:
+        session: Database session
+        retention_days: Days of analytics to keep, defaults to
+            ANALYTICS_RETENTION_DAYS
+        now: Current time, defaults to the wall clock
+        
+    Returns:
+        Names of the partitions dropped
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return []
+        
+    if retention_days is None:
+        retention_days = settings.analytics_retention_days
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=retention_days)
+    _lock_partitions(session)
+    
+    dropped = []
+    for table in PARTITIONED_TABLES:
+        for name in _list_partitions(session, table):
+            bounds = partition_bounds(name)
+            if bounds is not None and bounds[1] <= cutoff:
+                session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped.append(name)
+                
+    if dropped:
+        logger.info("Dropped expired analytics partitions: %s", ", ".join(dropped))
+    return dropped
+
+
+def maintain_partitions() -> None:
+    """Create upcoming analytics partitions and drop expired ones."""
+    session = get_session()
+    try:
+        ensure_partitions(session)
+        drop_expired_partitions(session)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to maintain analytics partitions: {e}")
+    finally:
+        session.close()
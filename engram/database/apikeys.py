@@ -1,7 +1,7 @@
 """SQLAlchemy ORM models for API keys and authentication."""
 
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, FrozenSet, List, Optional
 import enum
 
 from sqlalchemy import (
@@ -14,9 +14,10 @@ from sqlalchemy import (
     ForeignKey,
     JSON,
     Boolean,
+    LargeBinary,
 )
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import reconstructor, relationship, validates
 from sqlalchemy.sql import func
 
 from engram.database.models import Base
@@ -31,7 +32,10 @@ class ApiKey(Base):
     tenant_id = Column(String(26), ForeignKey("tenants.id"), nullable=False, index=True)
     user_id = Column(String(26), nullable=False, index=True)
     name = Column(String(255), nullable=False)
-    key_hash = Column(String(255), nullable=False, unique=True, index=True)
+    # SHA-256 digest of the raw key, looked up by equality only
+    key_hash = Column(LargeBinary(32), nullable=True)
+    # bcrypt hash of a key issued before digests, replaced on its first use
+    legacy_key_hash = Column(String(255), nullable=True)
     scopes = Column(JSON, nullable=False, default=list)  # List of permission scopes
     active = Column(Boolean, nullable=False, default=True, index=True)
     last_used_at = Column(DateTime(timezone=True), nullable=True)
@@ -40,14 +44,29 @@ class ApiKey(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
-    tenant = relationship("Tenant")
+    tenant = relationship("Tenant", lazy="raise")
 
     __table_args__ = (
+        Index("ix_api_keys_key_hash", "key_hash", postgresql_using="hash"),
         Index("idx_api_keys_tenant_user", "tenant_id", "user_id"),
         Index("idx_api_keys_active", "active"),
         Index("idx_api_keys_last_used", "last_used_at"),
     )
 
+    # Scopes as a set for authorization checks, kept in step with ``scopes``
+    _scope_set: FrozenSet[str] = frozenset()
+
+    @reconstructor
+    def _load_scope_set(self) -> None:
+        """Build the scope set for keys loaded from the database."""
+        self._scope_set = frozenset(self.scopes or ())
+
+    @validates("scopes")
+    def _validate_scopes(self, key: str, scopes: Optional[List[str]]) -> Optional[List[str]]:
+        """Rebuild the scope set whenever scopes are assigned."""
+        self._scope_set = frozenset(scopes or ())
+        return scopes
+
     def __repr__(self) -> str:
         return f"<ApiKey(id={self.id}, name={self.name}, active={self.active})>"
 
@@ -67,7 +86,7 @@ class ApiKey(Base):
         }
         
         if include_key_hash:
-            result["key_hash"] = self.key_hash
+            result["key_hash"] = self.key_hash.hex() if self.key_hash else None
             
         return result
 
@@ -77,14 +96,18 @@ class ApiKey(Base):
             return False
             
         # Admin scope grants all permissions
-        if "admin:*" in self.scopes:
-            return True
-            
-        return scope in self.scopes
+        scope_set = self._scope_set
+        return "admin:*" in scope_set or scope in scope_set
 
     def has_any_scope(self, scopes: List[str]) -> bool:
         """Check if API key has any of the specified scopes."""
-        return any(self.has_scope(scope) for scope in scopes)
+        if not self.active:
+            return False
+            
+        scope_set = self._scope_set
+        if "admin:*" in scope_set:
+            return bool(scopes)
+        return not scope_set.isdisjoint(scopes)
 
     @property
     def is_expired(self) -> bool:
@@ -41,7 +41,7 @@ class Node(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    tenant = relationship("Tenant")
+    tenant = relationship("Tenant", lazy="raise")
     
     # Indexes for performance
     __table_args__ = (
@@ -93,9 +93,9 @@ class Edge(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    tenant = relationship("Tenant")
-    source_node = relationship("Node", foreign_keys=[src_id])
-    target_node = relationship("Node", foreign_keys=[dst_id])
+    tenant = relationship("Tenant", lazy="raise")
+    source_node = relationship("Node", foreign_keys=[src_id], lazy="raise")
+    target_node = relationship("Node", foreign_keys=[dst_id], lazy="raise")
     
     # Indexes for performance
     __table_args__ = (
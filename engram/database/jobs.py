@@ -63,12 +63,20 @@ class Job(Base):
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
-    tenant = relationship("Tenant")
+    tenant = relationship("Tenant", lazy="raise")
 
     __table_args__ = (
         Index("idx_jobs_tenant_user_status", "tenant_id", "user_id", "status"),
-        Index("idx_jobs_type_status", "job_type", "status"),
         Index("idx_jobs_created_at", "created_at"),
+        # Queued and running jobs only, a small slice of the table
+        Index(
+            "idx_jobs_active", "created_at",
+            postgresql_where=status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+        ),
+        Index(
+            "idx_jobs_tenant_active", "tenant_id", "created_at",
+            postgresql_where=status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+        ),
     )
 
     def __repr__(self) -> str:
@@ -45,9 +45,14 @@ class Tenant(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
-    # Relationships
-    memories = relationship("Memory", back_populates="tenant", cascade="all, delete-orphan")
-    user_stats = relationship("UserMemoryStats", back_populates="tenant", cascade="all, delete-orphan")
+    # Relationships; none load lazily, so a query that needs one must load it
+    # explicitly (e.g. with selectinload) instead of issuing a query per row
+    memories = relationship(
+        "Memory", back_populates="tenant", cascade="all, delete-orphan", lazy="raise"
+    )
+    user_stats = relationship(
+        "UserMemoryStats", back_populates="tenant", cascade="all, delete-orphan", lazy="raise"
+    )
     
     def __repr__(self) -> str:
         return f"<Tenant(id={self.id}, name={self.name})>"
@@ -84,17 +89,33 @@ class Memory(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    tenant = relationship("Tenant", back_populates="memories")
+    tenant = relationship("Tenant", back_populates="memories", lazy="raise")
     
     # Indexes for performance
     __table_args__ = (
         Index("idx_memories_tenant_user", "tenant_id", "user_id"),
         Index("idx_memories_active_created", "active", "created_at"),
-        Index("idx_memories_importance", "importance"),
-        Index("idx_memories_last_accessed", "last_accessed_at"),
         Index("idx_memories_modality", "modality"),
         Index("idx_memories_source_uri", "source_uri"),
         Index("idx_memories_tenant_user_modality", "tenant_id", "user_id", "modality"),
+        # Partial indexes over active rows for the forgetting sweeps and per-user
+        # reads, newest first or by last access
+        Index(
+            "idx_memories_forget_low", "tenant_id", "importance", "last_accessed_at",
+            postgresql_where=active == True,
+        ),
+        Index(
+            "idx_memories_forget_old", "tenant_id", "created_at",
+            postgresql_where=active == True,
+        ),
+        Index(
+            "idx_memories_user_created", "tenant_id", "user_id", "created_at",
+            postgresql_where=active == True,
+        ),
+        Index(
+            "idx_memories_user_accessed", "tenant_id", "user_id", "last_accessed_at",
+            postgresql_where=active == True,
+        ),
     )
     
     def __repr__(self) -> str:
@@ -146,7 +167,7 @@ class UserMemoryStats(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    tenant = relationship("Tenant", back_populates="user_stats")
+    tenant = relationship("Tenant", back_populates="user_stats", lazy="raise")
     
     # Unique constraint
     __table_args__ = (
@@ -1,9 +1,13 @@
 """PostgreSQL database configuration and session management."""
 
-from typing import Generator, Optional
+import io
+from typing import Any, Dict, Generator, List, Optional, Sequence
 
-from sqlalchemy import create_engine, text
+import orjson
+from sqlalchemy import Table, any_, create_engine, literal, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.pool import QueuePool
 
 from engram.database.models import Base
@@ -13,7 +17,36 @@ from engram.utils.logger import get_logger
 logger = get_logger(__name__)
 settings = get_settings()
 
-# Create database engine
+
+def _json_default(value: Any) -> Any:
+    """Convert values orjson does not serialize natively.
+    
+    Raises:
+        TypeError: If the value is not JSON serializable
+    """
+    # json.dumps accepts float subclasses; orjson only exact floats
+    if isinstance(value, float):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_dumps(value: Any) -> str:
+    """Serialize JSON column values with orjson.
+    
+    numpy arrays and scalars, such as embedding-derived scores, are written
+    as plain JSON numbers. NaN and infinities are written as null, where
+    json.dumps would write tokens PostgreSQL rejects.
+    """
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    return orjson.dumps(value, default=_json_default, option=option).decode("utf-8")
+
+
+# Compiled statements kept for reuse; every distinct query shape across the
+# ORM models, API routes and workers takes an entry
+QUERY_CACHE_SIZE = 1200
+
+# Create database engine; JSON columns such as memory metadata are
+# encoded and decoded with orjson instead of the stdlib json module
 engine = create_engine(
     settings.database_url,
     poolclass=QueuePool,
@@ -22,6 +55,9 @@ engine = create_engine(
     pool_pre_ping=True,
     pool_recycle=3600,
     echo=settings.debug,
+    query_cache_size=QUERY_CACHE_SIZE,
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
 )
 
 # Create session factory
@@ -54,6 +90,88 @@ def get_session() -> Session:
     return SessionLocal()
 
 
+def match_any(column: ColumnElement, values: Sequence[Any], session: Session) -> ColumnElement:
+    """Build a filter matching a column against a list of values.
+    
+    On PostgreSQL the values are sent as a single array parameter and
+    compared with ``= ANY(...)``, so long ID lists neither expand into one
+    bind per value nor produce a new statement shape for every length.
+    Other dialects fall back to ``IN (...)``.
+    
+    Args:
+        column: Column to compare
+        values: Values to match
+        session: Session the query runs on
+        
+    Returns:
+        Filter expression
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        return column == any_(literal(list(values), ARRAY(column.type)))
+    return column.in_(values)
+
+
+def _copy_text(value: Any) -> str:
+    """Format a bound value as a COPY text-format field."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_rows(session: Session, table: Table, rows: List[Dict[str, Any]]) -> None:
+    """Insert rows with ``COPY ... FROM STDIN`` on the session's connection.
+    
+    Values go through the columns' own bind processors, so enums and JSON
+    are stored exactly as an INSERT would store them, and scalar Python-side
+    column defaults are filled in for keys the rows leave out. The copy
+    runs in the session's transaction; the caller commits.
+    
+    Args:
+        session: Session bound to a PostgreSQL engine
+        table: Target table
+        rows: Rows as column name to value dictionaries, all with the same keys
+    """
+    if not rows:
+        return
+        
+    dialect = session.get_bind().dialect
+    defaults = {
+        column.name: column.default.arg
+        for column in table.columns
+        if column.name not in rows[0]
+        and column.default is not None
+        and column.default.is_scalar
+    }
+    columns = [table.c[name] for name in rows[0]] + [table.c[name] for name in defaults]
+    processors = [column.type.bind_processor(dialect) for column in columns]
+    
+    buffer = io.StringIO()
+    for row in rows:
+        values = list(row.values()) + list(defaults.values())
+        buffer.write("\t".join(
+            _copy_text(processor(value) if processor and value is not None else value)
+            for processor, value in zip(processors, values)
+        ))
+        buffer.write("\n")
+    buffer.seek(0)
+    
+    preparer = dialect.identifier_preparer
+    column_list = ", ".join(preparer.quote(column.name) for column in columns)
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {preparer.format_table(table)} ({column_list}) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+
+
 def create_tables() -> None:
     """Create all database tables."""
     try:
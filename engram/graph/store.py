@@ -1,16 +1,78 @@
 """Graph storage and persistence layer."""
 
-from typing import List, Dict, Any, Optional, Tuple
-from sqlalchemy.orm import Session
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple
+from sqlalchemy import DateTime
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import InstrumentedAttribute, Session
 from sqlalchemy.exc import IntegrityError
 
 from engram.utils.logger import get_logger
 from engram.utils.ids import generate_ulid
 from engram.database.graph_models import Node, Edge
-from engram.database.postgres import get_db_session
+from engram.database.postgres import get_db_session, get_session, match_any
 
 logger = get_logger(__name__)
 
+# Columns read for graph results, paired with the keys of Node.to_dict and
+# Edge.to_dict; selecting them as plain rows skips building ORM instances
+NODE_RESULT_COLUMNS = (
+    Node.id,
+    Node.tenant_id,
+    Node.user_id,
+    Node.label,
+    Node.node_type,
+    Node.properties,
+    Node.created_at,
+    Node.updated_at,
+)
+NODE_RESULT_KEYS = (
+    "id", "tenant_id", "user_id", "label", "type", "properties", "created_at", "updated_at",
+)
+EDGE_RESULT_COLUMNS = (
+    Edge.id,
+    Edge.tenant_id,
+    Edge.user_id,
+    Edge.src_id,
+    Edge.dst_id,
+    Edge.relation,
+    Edge.weight,
+    Edge.properties,
+    Edge.created_at,
+    Edge.updated_at,
+)
+EDGE_RESULT_KEYS = (
+    "id", "tenant_id", "user_id", "src", "dst", "relation", "weight", "properties",
+    "created_at", "updated_at",
+)
+
+
+def rows_to_dicts(
+    columns: Sequence[InstrumentedAttribute],
+    keys: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+) -> List[Dict[str, Any]]:
+    """Serialize result rows into dictionaries with ISO timestamps.
+    
+    Args:
+        columns: Selected columns
+        keys: Dictionary key for each column
+        rows: Rows of column values
+        
+    Returns:
+        One dictionary per row, shaped like the model's ``to_dict``
+    """
+    timestamps = [
+        index for index, column in enumerate(columns) if isinstance(column.type, DateTime)
+    ]
+    results = []
+    for row in rows:
+        values = list(row)
+        for index in timestamps:
+            if values[index] is not None:
+                values[index] = values[index].isoformat()
+        results.append(dict(zip(keys, values)))
+    return results
+
 
 class GraphStore:
     """Graph storage and retrieval operations."""
@@ -238,18 +300,18 @@ class GraphStore:
         Returns:
             Dictionary containing nodes and edges
         """
-        with get_db_session() as session:
+        with get_session() as session:
             try:
                 if seed_labels:
                     # Start from specific seed nodes
-                    seed_nodes = session.query(Node).filter(
+                    seed_nodes = session.query(*NODE_RESULT_COLUMNS).filter(
                         Node.tenant_id == tenant_id,
                         Node.user_id == user_id,
                         Node.label.in_(seed_labels)
                     ).all()
                 else:
                     # Get random nodes if no seeds provided
-                    seed_nodes = session.query(Node).filter(
+                    seed_nodes = session.query(*NODE_RESULT_COLUMNS).filter(
                         Node.tenant_id == tenant_id,
                         Node.user_id == user_id
                     ).limit(10).all()
@@ -263,8 +325,8 @@ class GraphStore:
                 )
                 
                 return {
-                    "nodes": [node.to_dict() for node in nodes],
-                    "edges": [edge.to_dict() for edge in edges],
+                    "nodes": rows_to_dicts(NODE_RESULT_COLUMNS, NODE_RESULT_KEYS, nodes),
+                    "edges": rows_to_dicts(EDGE_RESULT_COLUMNS, EDGE_RESULT_KEYS, edges),
                     "metadata": {
                         "total_nodes": len(nodes),
                         "total_edges": len(edges),
@@ -282,22 +344,22 @@ class GraphStore:
         session: Session,
         tenant_id: str,
         user_id: str,
-        seed_nodes: List[Node],
+        seed_nodes: List[Row],
         radius: int,
         max_nodes: int
-    ) -> Tuple[List[Node], List[Edge]]:
+    ) -> Tuple[List[Row], List[Row]]:
         """Traverse graph from seed nodes.
         
         Args:
             session: Database session
             tenant_id: Tenant identifier
             user_id: User identifier
-            seed_nodes: List of seed nodes
+            seed_nodes: Seed node rows with the NODE_RESULT_COLUMNS attributes
             radius: Traversal radius
             max_nodes: Maximum nodes to return
             
         Returns:
-            Tuple of (nodes, edges)
+            Tuple of (node rows, edge rows)
         """
         visited_nodes = set()
         all_nodes = []
@@ -314,10 +376,10 @@ class GraphStore:
             next_level = set()
             
             # Get edges from current level
-            edges = session.query(Edge).filter(
+            edges = session.query(*EDGE_RESULT_COLUMNS).filter(
                 Edge.tenant_id == tenant_id,
                 Edge.user_id == user_id,
-                Edge.src_id.in_(current_level)
+                match_any(Edge.src_id, current_level, session)
             ).all()
             
             # Add edges to result
@@ -326,10 +388,10 @@ class GraphStore:
             # Get destination nodes
             dst_ids = [edge.dst_id for edge in edges]
             if dst_ids:
-                dst_nodes = session.query(Node).filter(
+                dst_nodes = session.query(*NODE_RESULT_COLUMNS).filter(
                     Node.tenant_id == tenant_id,
                     Node.user_id == user_id,
-                    Node.id.in_(dst_ids)
+                    match_any(Node.id, dst_ids, session)
                 ).all()
                 
                 for node in dst_nodes:
@@ -362,9 +424,9 @@ class GraphStore:
         Returns:
             List of matching entities
         """
-        with get_db_session() as session:
+        with get_session() as session:
             try:
-                query_obj = session.query(Node).filter(
+                query_obj = session.query(*NODE_RESULT_COLUMNS).filter(
                     Node.tenant_id == tenant_id,
                     Node.user_id == user_id,
                     Node.label.ilike(f"%{query}%")
@@ -375,7 +437,7 @@ class GraphStore:
                 
                 nodes = query_obj.limit(limit).all()
                 
-                return [node.to_dict() for node in nodes]
+                return rows_to_dicts(NODE_RESULT_COLUMNS, NODE_RESULT_KEYS, nodes)
                 
             except Exception as e:
                 logger.error(f"Error searching entities: {e}")
@@ -1,9 +1,10 @@
 """Chat content extraction and processing."""
 
-import json
 from typing import List, Dict, Any, Union
 from datetime import datetime
 
+import orjson
+
 from engram.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -42,15 +43,14 @@ class ChatExtractor:
             List of chat chunks with metadata
         """
         try:
-            # Parse content based on type
-            if isinstance(content, bytes):
-                content = content.decode('utf-8')
-            
-            if isinstance(content, str):
+            # Parse content based on type (orjson accepts bytes directly)
+            if isinstance(content, (str, bytes)):
                 try:
-                    messages = json.loads(content)
-                except json.JSONDecodeError:
+                    messages = orjson.loads(content)
+                except orjson.JSONDecodeError:
                     # Treat as raw text
+                    if isinstance(content, bytes):
+                        content = content.decode('utf-8')
                     messages = [{"text": content, "author": "unknown", "timestamp": datetime.now().isoformat()}]
             elif isinstance(content, list):
                 messages = content
@@ -11,6 +11,14 @@ logger = get_logger(__name__)
 class EmbeddingsProvider(ABC):
     """Abstract base class for embeddings providers."""
 
+    # True for providers that already return unit-length vectors, so the
+    # embeddings facade does not normalize them a second time
+    normalizes_embeddings: bool = False
+
+    # Most texts accepted in one embed_texts call; larger inputs are split
+    # into batches by the embeddings facade
+    max_batch_size: int = 256
+
     @abstractmethod
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for a list of texts.
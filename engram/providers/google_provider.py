@@ -17,6 +17,9 @@ settings = get_settings()
 class GoogleEmbeddingsProvider(EmbeddingsProvider):
     """Google Vertex AI embeddings provider."""
 
+    # textembedding-gecko accepts 5 instances per prediction request
+    max_batch_size = 5
+
     def __init__(
         self,
         credentials_path: Optional[str] = None,
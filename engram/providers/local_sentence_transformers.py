@@ -16,6 +16,10 @@ settings = get_settings()
 class LocalSentenceTransformersProvider(EmbeddingsProvider):
     """Local embeddings provider using sentence-transformers."""
 
+    normalizes_embeddings = True
+    # encode() batches internally; larger calls only compete for the same cores
+    max_batch_size = 1024
+
     def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
         """Initialize the sentence transformers provider.
         
@@ -2,7 +2,9 @@
 
 import os
 import logging
-from typing import List, Union, Optional, Dict, Any
+import threading
+from collections import OrderedDict
+from typing import List, Union, Optional, Dict, Any, Tuple
 from abc import ABC, abstractmethod
 import numpy as np
 from PIL import Image
@@ -15,6 +17,9 @@ from engram.utils.logger import get_logger
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Query embeddings kept per registry for repeated queries
+QUERY_CACHE_SIZE = 1024
+
 
 class EmbeddingProvider(ABC):
     """Abstract base class for embedding providers."""
@@ -243,6 +248,8 @@ class MultimodalEmbeddingsRegistry:
             "chat": "sentence_transformers",
             "video": "sentence_transformers",  # For transcripts
         }
+        self._query_cache: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
         self._initialize_providers()
     
     def _initialize_providers(self):
@@ -308,6 +315,37 @@ class MultimodalEmbeddingsRegistry:
         provider = self.get_provider(modality)
         return provider.embed_texts(texts)
     
+    def embed_query(self, text: str, modality: str = "text") -> np.ndarray:
+        """Embed a single query text, reusing recent results.
+        
+        The last QUERY_CACHE_SIZE query embeddings are kept per provider,
+        so a repeated query skips the model call.
+        
+        Args:
+            text: Query text
+            modality: Content modality
+            
+        Returns:
+            float32 embedding vector
+        """
+        provider = self.get_provider(modality)
+        key = (provider.provider_name, text)
+        
+        with self._query_cache_lock:
+            vector = self._query_cache.get(key)
+            if vector is not None:
+                self._query_cache.move_to_end(key)
+                return vector.copy()
+        
+        vector = np.asarray(provider.embed_texts([text])[0], dtype=np.float32)
+        
+        with self._query_cache_lock:
+            self._query_cache[key] = vector
+            self._query_cache.move_to_end(key)
+            while len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return vector.copy()
+    
     def embed_images(self, images: Union[List[str], List[np.ndarray]]) -> List[List[float]]:
         """Embed images using the appropriate provider.
         
@@ -16,6 +16,11 @@ settings = get_settings()
 class OpenAIEmbeddingsProvider(EmbeddingsProvider):
     """OpenAI embeddings provider."""
 
+    # OpenAI embeddings are unit length
+    normalizes_embeddings = True
+    # API limit on inputs per embeddings request
+    max_batch_size = 2048
+
     def __init__(self, api_key: Optional[str] = None, model_name: str = "text-embedding-3-small"):
         """Initialize OpenAI embeddings provider.
         
@@ -12,6 +12,7 @@ from engram.utils.ids import (
     timestamp_to_ulid,
 )
 from engram.utils.logger import get_logger, log_request, log_error
+from engram.utils.request_context import get_request_id, request_id_var
 
 __all__ = [
     "Settings",
@@ -27,4 +28,6 @@ __all__ = [
     "get_logger",
     "log_request",
     "log_error",
+    "get_request_id",
+    "request_id_var",
 ]
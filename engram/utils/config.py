@@ -15,6 +15,8 @@ class Settings(BaseSettings):
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
     port: int = Field(default=8000, alias="PORT")
     debug: bool = Field(default=False, alias="DEBUG")
+    workers: int = Field(default=1, alias="WORKERS")
+    thread_pool_tokens: int = Field(default=200, alias="THREAD_POOL_TOKENS")
 
     # API Configuration
     api_v1_str: str = Field(default="/v1", alias="API_V1_STR")
@@ -22,6 +24,7 @@ class Settings(BaseSettings):
         default=["http://localhost:3000", "http://localhost:8000"],
         alias="CORS_ORIGINS"
     )
+    cors_allow_credentials: bool = Field(default=True, alias="CORS_ALLOW_CREDENTIALS")
 
     # Provider Configuration
     openai_api_key: Optional[str] = Field(default=None, alias="OPENAI_API_KEY")
@@ -33,6 +36,7 @@ class Settings(BaseSettings):
         default="local", alias="DEFAULT_EMBEDDINGS_PROVIDER"
     )
     default_llm_provider: str = Field(default="openai", alias="DEFAULT_LLM_PROVIDER")
+    embedding_cache_size: int = Field(default=50000, alias="EMBEDDING_CACHE_SIZE")
 
     # Vector Database Configuration
     vector_backend: str = Field(default="chroma", alias="VECTOR_BACKEND")
@@ -72,6 +76,19 @@ class Settings(BaseSettings):
     consolidation_threshold: float = Field(
         default=0.97, alias="CONSOLIDATION_THRESHOLD"
     )
+    retrieval_cache_size: int = Field(default=10000, alias="RETRIEVAL_CACHE_SIZE")
+    retrieval_cache_ttl: float = Field(default=60.0, alias="RETRIEVAL_CACHE_TTL")
+
+    # Consolidation Index Configuration
+    ann_index_enabled: bool = Field(default=False, alias="ANN_INDEX_ENABLED")
+    index_path: str = Field(default="/data/index", alias="INDEX_PATH")
+    hnsw_m: int = Field(default=16, alias="HNSW_M")
+    hnsw_ef_construction: int = Field(default=200, alias="HNSW_EF_CONSTRUCTION")
+    hnsw_ef_search: int = Field(default=64, alias="HNSW_EF_SEARCH")
+    ann_neighbors: int = Field(default=32, alias="ANN_NEIGHBORS")
+    ann_min_memories: int = Field(default=20000, alias="ANN_MIN_MEMORIES")
+    ann_flush_interval: float = Field(default=5.0, alias="ANN_FLUSH_INTERVAL")
+    ann_cache_size: int = Field(default=256, alias="ANN_CACHE_SIZE")
 
     # Memory Management
     max_text_length: int = Field(default=2048, alias="MAX_TEXT_LENGTH")
@@ -118,6 +135,8 @@ class Settings(BaseSettings):
     # Auth Configuration
     api_key_bytes: int = Field(default=32, alias="API_KEY_BYTES")
     api_key_prefix: str = Field(default="ek_", alias="API_KEY_PREFIX")
+    api_key_cache_size: int = Field(default=10000, alias="API_KEY_CACHE_SIZE")
+    api_key_cache_ttl: float = Field(default=60.0, alias="API_KEY_CACHE_TTL")
 
     # Analytics Configuration
     analytics_retention_days: int = Field(default=90, alias="ANALYTICS_RETENTION_DAYS")
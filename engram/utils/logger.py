@@ -8,6 +8,17 @@ import structlog
 from structlog.stdlib import LoggerFactory
 
 from engram.utils.config import get_settings
+from engram.utils.request_context import request_id_var
+
+
+def add_request_id(
+    logger: Any, method_name: str, event_dict: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Add the current request ID to log events emitted during a request."""
+    request_id = request_id_var.get()
+    if request_id:
+        event_dict.setdefault("request_id", request_id)
+    return event_dict
 
 
 def configure_logging() -> None:
@@ -20,6 +31,7 @@ def configure_logging() -> None:
             structlog.stdlib.filter_by_level,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
+            add_request_id,
             structlog.stdlib.PositionalArgumentsFormatter(),
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.processors.StackInfoRenderer(),
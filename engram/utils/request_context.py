@@ -0,0 +1,16 @@
+"""Request-scoped context shared with code outside the request handlers."""
+
+from contextvars import ContextVar
+
+# ID of the request being served; empty outside a request. Set by
+# RequestLoggingMiddleware and read by logging, connectors and stores.
+request_id_var: ContextVar[str] = ContextVar("request_id", default="")
+
+
+def get_request_id() -> str:
+    """Get the ID of the request being served.
+    
+    Returns:
+        Request ID, or an empty string outside a request
+    """
+    return request_id_var.get()
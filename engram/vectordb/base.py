@@ -48,6 +48,8 @@ class VectorIndex(ABC):
         top_k: int,
         namespace: str,
         filter_dict: Optional[Dict[str, Any]] = None,
+        score_threshold: Optional[float] = None,
+        exclude_ids: Optional[List[Optional[str]]] = None,
     ) -> List[List[VectorHit]]:
         """Query similar vectors.
         
@@ -56,6 +58,9 @@ class VectorIndex(ABC):
             top_k: Number of top results to return
             namespace: Namespace/collection identifier
             filter_dict: Optional metadata filters
+            score_threshold: Optional minimum similarity score of returned hits
+            exclude_ids: Optional ID to leave out of each query's hits,
+                aligned with vectors; excluded hits do not count towards top_k
             
         Returns:
             List of hit lists (one per query vector)
@@ -82,6 +87,26 @@ class VectorIndex(ABC):
         """
         pass
 
+    @abstractmethod
+    def fetch(
+        self,
+        ids: List[str],
+        namespace: str,
+    ) -> Dict[str, List[float]]:
+        """Fetch stored vectors by IDs.
+        
+        Args:
+            ids: List of vector IDs to fetch
+            namespace: Namespace/collection identifier
+            
+        Returns:
+            Mapping of ID to vector; IDs that are not stored are omitted
+            
+        Raises:
+            VectorDBError: If fetch operation fails
+        """
+        pass
+
     @abstractmethod
     def similarity_threshold(
         self,
@@ -147,6 +147,8 @@ class ChromaVectorIndex(VectorIndex):
         top_k: int,
         namespace: str,
         filter_dict: Optional[Dict[str, Any]] = None,
+        score_threshold: Optional[float] = None,
+        exclude_ids: Optional[List[Optional[str]]] = None,
     ) -> List[List[VectorHit]]:
         """Query similar vectors.
         
@@ -155,6 +157,9 @@ class ChromaVectorIndex(VectorIndex):
             top_k: Number of top results to return
             namespace: Namespace/collection identifier
             filter_dict: Optional metadata filters
+            score_threshold: Optional minimum similarity score of returned hits
+            exclude_ids: Optional ID to leave out of each query's hits,
+                aligned with vectors; excluded hits do not count towards top_k
             
         Returns:
             List of hit lists (one per query vector)
@@ -172,10 +177,13 @@ class ChromaVectorIndex(VectorIndex):
             where_filter = filter_dict or {}
             where_filter["namespace"] = namespace
             
+            # Fetch one extra result so an excluded ID still leaves top_k hits
+            exclude_ids = exclude_ids or []
+            
             # Query ChromaDB
             results = collection.query(
                 query_embeddings=vectors,
-                n_results=top_k,
+                n_results=top_k + 1 if any(exclude_ids) else top_k,
                 where=where_filter if where_filter else None,
                 include=["metadatas", "distances"],
             )
@@ -185,22 +193,31 @@ class ChromaVectorIndex(VectorIndex):
             for i, (ids, distances, metadatas) in enumerate(
                 zip(results["ids"], results["distances"], results["metadatas"])
             ):
+                exclude_id = exclude_ids[i] if i < len(exclude_ids) else None
                 hits = []
                 for id_, distance, metadata in zip(ids, distances, metadatas):
+                    if id_ == exclude_id:
+                        continue
+                    
                     # Convert distance to similarity score
                     if self.distance_metric == "cosine":
                         score = 1.0 - distance  # ChromaDB returns cosine distance
                     else:
                         score = 1.0 / (1.0 + distance)  # Convert distance to similarity
+                    score = max(0.0, min(1.0, score))  # Clamp to [0, 1]
+                    
+                    # Results come back best first
+                    if score_threshold is not None and score < score_threshold:
+                        break
                     
                     hit = VectorHit(
                         id=id_,
-                        score=max(0.0, min(1.0, score)),  # Clamp to [0, 1]
+                        score=score,
                         metadata=metadata or {},
                     )
                     hits.append(hit)
                 
-                hits_list.append(hits)
+                hits_list.append(hits[:top_k])
             
             logger.debug(f"Queried {len(vectors)} vectors, got {len(hits_list)} result sets")
             return hits_list
@@ -264,6 +281,52 @@ class ChromaVectorIndex(VectorIndex):
                 original_error=e,
             )
 
+    def fetch(
+        self,
+        ids: List[str],
+        namespace: str,
+    ) -> Dict[str, List[float]]:
+        """Fetch stored vectors by IDs.
+        
+        Args:
+            ids: List of vector IDs to fetch
+            namespace: Namespace/collection identifier
+            
+        Returns:
+            Mapping of ID to vector; IDs that are not stored are omitted
+            
+        Raises:
+            VectorDBError: If fetch operation fails
+        """
+        if not ids:
+            return {}
+
+        try:
+            collection = self._get_namespace_collection(namespace)
+            
+            # Fetch from ChromaDB
+            results = collection.get(ids=ids, include=["embeddings"])
+            
+            logger.debug(f"Fetched {len(results['ids'])} of {len(ids)} vectors from namespace: {namespace}")
+            return dict(zip(results["ids"], results["embeddings"]))
+            
+        except ChromaError as e:
+            logger.error(f"ChromaDB fetch failed: {e}")
+            raise VectorDBError(
+                f"ChromaDB fetch failed: {e}",
+                provider_name=self.provider_name,
+                operation="fetch",
+                original_error=e,
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error during fetch: {e}")
+            raise VectorDBError(
+                f"Unexpected error during fetch: {e}",
+                provider_name=self.provider_name,
+                operation="fetch",
+                original_error=e,
+            )
+
     def similarity_threshold(
         self,
         vector_a: List[float],
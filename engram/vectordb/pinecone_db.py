@@ -166,6 +166,8 @@ class PineconeVectorIndex(VectorIndex):
         top_k: int,
         namespace: str,
         filter_dict: Optional[Dict[str, Any]] = None,
+        score_threshold: Optional[float] = None,
+        exclude_ids: Optional[List[Optional[str]]] = None,
     ) -> List[List[VectorHit]]:
         """Query similar vectors.
         
@@ -174,6 +176,9 @@ class PineconeVectorIndex(VectorIndex):
             top_k: Number of top results to return
             namespace: Namespace/collection identifier
             filter_dict: Optional metadata filters
+            score_threshold: Optional minimum similarity score of returned hits
+            exclude_ids: Optional ID to leave out of each query's hits,
+                aligned with vectors; excluded hits do not count towards top_k
             
         Returns:
             List of hit lists (one per query vector)
@@ -191,32 +196,44 @@ class PineconeVectorIndex(VectorIndex):
             where_filter = filter_dict or {}
             where_filter["namespace"] = namespace
             
+            # Fetch one extra result so an excluded ID still leaves top_k hits
+            exclude_ids = exclude_ids or []
+            
             # Query Pinecone
             results = self.index.query(
                 vector=vectors,
-                top_k=top_k,
+                top_k=top_k + 1 if any(exclude_ids) else top_k,
                 namespace=pinecone_namespace,
                 filter=where_filter if where_filter else None,
                 include_metadata=True,
             )
             
-            # Convert to VectorHit objects
+            # Convert to VectorHit objects, stripping the namespace prefix
+            prefix = f"{namespace}:"
             hits_list = []
-            for query_result in results.matches:
+            for i, query_result in enumerate(results.matches):
+                exclude_id = exclude_ids[i] if i < len(exclude_ids) else None
                 hits = []
                 for match in query_result:
-                    # Extract original memory ID from Pinecone ID
+                    # Namespaces contain colons themselves, so cut the whole prefix
                     pinecone_id = match.id
-                    memory_id = pinecone_id.split(":", 1)[1] if ":" in pinecone_id else pinecone_id
+                    memory_id = pinecone_id[len(prefix):] if pinecone_id.startswith(prefix) else pinecone_id
+                    if memory_id == exclude_id:
+                        continue
+                    
+                    # Results come back best first
+                    score = match.score or 0.0
+                    if score_threshold is not None and score < score_threshold:
+                        break
                     
                     hit = VectorHit(
                         id=memory_id,
-                        score=match.score or 0.0,
+                        score=score,
                         metadata=match.metadata or {},
                     )
                     hits.append(hit)
                 
-                hits_list.append(hits)
+                hits_list.append(hits[:top_k])
             
             logger.debug(f"Queried {len(vectors)} vectors, got {len(hits_list)} result sets")
             return hits_list
@@ -270,6 +287,57 @@ class PineconeVectorIndex(VectorIndex):
                 original_error=e,
             )
 
+    def fetch(
+        self,
+        ids: List[str],
+        namespace: str,
+    ) -> Dict[str, List[float]]:
+        """Fetch stored vectors by IDs.
+        
+        Args:
+            ids: List of vector IDs to fetch
+            namespace: Namespace/collection identifier
+            
+        Returns:
+            Mapping of ID to vector; IDs that are not stored are omitted
+            
+        Raises:
+            VectorDBError: If fetch operation fails
+        """
+        if not ids:
+            return {}
+
+        try:
+            pinecone_namespace = self._get_namespace_key(namespace)
+            
+            # Create Pinecone IDs with namespace prefix
+            pinecone_ids = [f"{namespace}:{memory_id}" for memory_id in ids]
+            
+            # Fetch from Pinecone
+            results = self.index.fetch(
+                ids=pinecone_ids,
+                namespace=pinecone_namespace,
+            )
+            
+            # Strip the namespace prefix to recover memory IDs
+            prefix_length = len(namespace) + 1
+            vectors = {
+                pinecone_id[prefix_length:]: list(vector.values)
+                for pinecone_id, vector in results.vectors.items()
+            }
+            
+            logger.debug(f"Fetched {len(vectors)} of {len(ids)} vectors from namespace: {namespace}")
+            return vectors
+            
+        except Exception as e:
+            logger.error(f"Pinecone fetch failed: {e}")
+            raise VectorDBError(
+                f"Pinecone fetch failed: {e}",
+                provider_name=self.provider_name,
+                operation="fetch",
+                original_error=e,
+            )
+
     def similarity_threshold(
         self,
         vector_a: List[float],
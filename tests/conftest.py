@@ -6,6 +6,8 @@ import shutil
 from typing import Generator, Dict, Any
 from unittest.mock import Mock, MagicMock
 
+import numpy as np
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
@@ -70,6 +72,7 @@ def mock_embeddings_facade() -> EmbeddingsFacade:
     """Create a mock embeddings facade."""
     mock_facade = Mock(spec=EmbeddingsFacade)
     mock_facade.embed_texts = Mock(return_value=[[0.1, 0.2, 0.3, 0.4] * 10])  # 40-dim vector
+    mock_facade.embed_query = Mock(return_value=np.array([0.1, 0.2, 0.3, 0.4] * 10, dtype=np.float32))
     mock_facade.get_embedding_dimension = Mock(return_value=40)
     return mock_facade
 
@@ -0,0 +1,116 @@
+"""Tests for analytics table partitioning."""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from engram.database.analytics import (
+    RequestLog,
+    drop_expired_partitions,
+    ensure_partitions,
+    partition_bounds,
+)
+from engram.database.models import Tenant
+
+UTC = timezone.utc
+
+
+def postgres_session(partitions):
+    """Build a mock PostgreSQL session listing the given partitions per table."""
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+
+    def execute(statement, params=None):
+        if params and "table" in params:
+            return [(name,) for name in partitions.get(params["table"], [])]
+        return MagicMock()
+
+    session.execute.side_effect = execute
+    return session
+
+
+def executed_sql(session):
+    """Get the SQL of statements run without parameters."""
+    return [str(call.args[0]) for call in session.execute.call_args_list if len(call.args) == 1]
+
+
+class TestPartitionBounds:
+    """Test partition names map to created_at ranges."""
+
+    def test_monthly_partition(self):
+        assert partition_bounds("request_logs_2026_12") == (
+            datetime(2026, 12, 1, tzinfo=UTC),
+            datetime(2027, 1, 1, tzinfo=UTC),
+        )
+
+    def test_legacy_partition(self):
+        assert partition_bounds("system_metrics_before_2026_11") == (
+            None,
+            datetime(2026, 11, 1, tzinfo=UTC),
+        )
+
+    def test_unrelated_table(self):
+        assert partition_bounds("request_logs") is None
+
+
+class TestPartitionMaintenance:
+    """Test partitions are created ahead and dropped after retention."""
+
+    def test_ensure_partitions_skips_covered_months(self):
+        session = postgres_session({
+            "request_logs": ["request_logs_before_2026_11", "request_logs_2026_11"],
+        })
+
+        created = ensure_partitions(session, now=datetime(2026, 10, 17, tzinfo=UTC), months_ahead=2)
+
+        # Existing request log partitions already cover October and November
+        assert created == [
+            "request_logs_2026_12",
+            "system_metrics_2026_10",
+            "system_metrics_2026_11",
+            "system_metrics_2026_12",
+        ]
+        assert (
+            "CREATE TABLE IF NOT EXISTS request_logs_2026_12 PARTITION OF request_logs "
+            "FOR VALUES FROM ('2026-12-01T00:00:00+00:00') TO ('2027-01-01T00:00:00+00:00')"
+        ) in executed_sql(session)
+
+    def test_drop_expired_partitions(self):
+        session = postgres_session({
+            "request_logs": [
+                "request_logs_before_2026_07",
+                "request_logs_2026_07",
+                "request_logs_2026_08",
+            ],
+        })
+
+        # 90 days before 2026-10-17 is 2026-07-19, inside the July partition
+        dropped = drop_expired_partitions(
+            session, retention_days=90, now=datetime(2026, 10, 17, tzinfo=UTC)
+        )
+
+        assert dropped == ["request_logs_before_2026_07"]
+        assert "DROP TABLE IF EXISTS request_logs_before_2026_07" in executed_sql(session)
+
+    def test_maintenance_is_noop_off_postgres(self, test_session):
+        assert ensure_partitions(test_session) == []
+        assert drop_expired_partitions(test_session) == []
+
+    def test_request_log_identity(self, test_session):
+        """Test request logs are still identified by ID alone."""
+        test_session.add(Tenant(id="partition-tenant", name="Partition tenant"))
+        test_session.add(RequestLog(
+            id="partition-log-1",
+            tenant_id="partition-tenant",
+            user_id="user-1",
+            request_id="request-1",
+            route="/v1/retrieve",
+            method="POST",
+            status_code=200,
+            duration_ms=12,
+        ))
+        test_session.commit()
+        test_session.expunge_all()
+
+        log = test_session.get(RequestLog, "partition-log-1")
+        assert log.route == "/v1/retrieve"
+        assert log.created_at is not None
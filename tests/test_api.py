@@ -1,11 +1,24 @@
 """Tests for API endpoints."""
 
+import asyncio
+
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, patch
+from sqlalchemy.orm import sessionmaker
 
+from engram.api.middleware import (
+    RequestLoggingMiddleware,
+    StaticCORSMiddleware,
+    drain_request_logs,
+    write_request_logs,
+)
+from engram.api.routes import _count_cache, _count_memories_cached
 from engram.api.server import app
+from engram.database.analytics import RequestLog
 from engram.database.models import Tenant, Memory
+from engram.utils.request_context import get_request_id
 
 
 class TestTenantAPI:
@@ -300,6 +313,20 @@ class TestAdminAPI:
             assert data["total_memories"] == 100
             assert data["vector_provider"] == "chromadb"
 
+    def test_count_cache_is_bounded(self):
+        """Test cached admin totals are reused and least recently used ones dropped."""
+        mock_store = Mock()
+        mock_store.count_memories.return_value = 7
+        _count_cache.clear()
+        
+        with patch('engram.api.routes.COUNT_CACHE_SIZE', 2):
+            for user_id in ["user-1", "user-2", "user-1", "user-3"]:
+                assert _count_memories_cached(mock_store, "tenant", user_id, True) == 7
+        
+        assert mock_store.count_memories.call_count == 3
+        assert list(_count_cache) == [("tenant", "user-1", True), ("tenant", "user-3", True)]
+        _count_cache.clear()
+
 
 class TestHealthAPI:
     """Test health check endpoint."""
@@ -345,3 +372,153 @@ class TestErrorHandling:
         data = response.json()
         assert "error" in data
         assert "details" in data
+
+
+class TestRequestLogging:
+    """Test background request log writing."""
+
+    def make_log(self, log_id, tenant_id=None, user_id=None, status_code=200):
+        return {
+            "id": log_id,
+            "tenant_id": tenant_id,
+            "user_id": user_id,
+            "request_id": f"request-{log_id}",
+            "route": "/v1/stats",
+            "method": "GET",
+            "status_code": status_code,
+            "duration_ms": 1,
+            "tokens_used": None,
+            "cost_usd": None,
+            "user_agent": "",
+            "ip_address": None,
+            "request_metadata": {"query_params": {}, "content_type": ""},
+        }
+
+    @pytest.mark.asyncio
+    async def test_drain_request_logs_batches(self):
+        """Test queued logs are written in batches by the drain task."""
+        queue = asyncio.Queue()
+        for i in range(5):
+            queue.put_nowait(self.make_log(str(i)))
+        
+        with patch('engram.api.middleware.write_request_logs') as mock_write, \
+                patch('engram.api.middleware.REQUEST_LOG_FLUSH_INTERVAL', 0.01):
+            task = asyncio.create_task(drain_request_logs(queue))
+            await asyncio.wait_for(queue.join(), timeout=1.0)
+            task.cancel()
+        
+        mock_write.assert_called_once()
+        assert [log["id"] for log in mock_write.call_args[0][0]] == ["0", "1", "2", "3", "4"]
+
+    @pytest.mark.asyncio
+    async def test_drain_request_logs_waits_to_fill_batch(self):
+        """Test logs arriving during the flush interval join the same batch."""
+        queue = asyncio.Queue()
+        queue.put_nowait(self.make_log("first"))
+        
+        with patch('engram.api.middleware.write_request_logs') as mock_write, \
+                patch('engram.api.middleware.REQUEST_LOG_FLUSH_INTERVAL', 0.05):
+            task = asyncio.create_task(drain_request_logs(queue))
+            await asyncio.sleep(0.01)
+            queue.put_nowait(self.make_log("second"))
+            await asyncio.wait_for(queue.join(), timeout=1.0)
+            task.cancel()
+        
+        mock_write.assert_called_once()
+        assert [log["id"] for log in mock_write.call_args[0][0]] == ["first", "second"]
+
+    def test_write_request_logs_skips_anonymous(self):
+        """Test logs without a tenant are not persisted."""
+        with patch('engram.api.middleware.get_session') as mock_get_session:
+            write_request_logs([self.make_log("1", status_code=401)])
+        
+        mock_get_session.assert_not_called()
+
+    def test_write_request_logs_inserts_rows(self, test_engine):
+        """Test attributed logs are inserted in one statement."""
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+        with factory() as session:
+            session.add(Tenant(id="log-tenant", name="Log tenant"))
+            session.commit()
+        
+        with patch('engram.api.middleware.get_session', factory):
+            write_request_logs([
+                self.make_log("log-1", "log-tenant", "user-1"),
+                self.make_log("log-2"),
+                self.make_log("log-3", "log-tenant", "user-1"),
+            ])
+        
+        with factory() as session:
+            logs = session.query(RequestLog).filter(RequestLog.tenant_id == "log-tenant").all()
+            assert sorted(log.id for log in logs) == ["log-1", "log-3"]
+            assert logs[0].request_metadata == {"query_params": {}, "content_type": ""}
+            assert all(log.created_at is not None for log in logs)
+
+    def test_request_id_context(self):
+        """Test the request ID is visible to handlers and echoed back."""
+        request_app = FastAPI()
+        request_app.add_middleware(RequestLoggingMiddleware)
+
+        @request_app.get("/v1/request-id")
+        async def read_request_id():
+            return {"request_id": get_request_id()}
+
+        client = TestClient(request_app)
+        response = client.get("/v1/request-id", headers={"X-Request-ID": "caller-id"})
+
+        assert response.json() == {"request_id": "caller-id"}
+        assert response.headers["x-request-id"] == "caller-id"
+        assert get_request_id() == ""
+
+        generated = client.get("/v1/request-id")
+        assert generated.json()["request_id"] == generated.headers["x-request-id"]
+
+    @pytest.mark.parametrize("caller_id", ["", "a" * 65, "id with spaces", "id.with.dots", "<script>"])
+    def test_invalid_request_id_is_replaced(self, caller_id):
+        """Test caller request IDs outside the accepted pattern get a ULID."""
+        request_app = FastAPI()
+        request_app.add_middleware(RequestLoggingMiddleware)
+
+        @request_app.get("/v1/request-id")
+        async def read_request_id():
+            return {"request_id": get_request_id()}
+
+        client = TestClient(request_app)
+        response = client.get("/v1/request-id", headers={"X-Request-ID": caller_id})
+
+        request_id = response.headers["x-request-id"]
+        assert request_id != caller_id
+        assert len(request_id) == 26
+        assert response.json() == {"request_id": request_id}
+
+
+class TestStaticCORS:
+    """Test the wildcard CORS middleware."""
+
+    @pytest.fixture
+    def cors_client(self):
+        cors_app = FastAPI()
+        cors_app.add_middleware(StaticCORSMiddleware)
+
+        @cors_app.get("/ping")
+        async def ping():
+            return {"ok": True}
+
+        return TestClient(cors_app)
+
+    def test_adds_headers(self, cors_client):
+        """Test simple requests get static CORS headers."""
+        response = cors_client.get("/ping", headers={"Origin": "https://example.com"})
+        
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "*"
+
+    def test_answers_preflight(self, cors_client):
+        """Test preflight requests are answered without reaching the app."""
+        response = cors_client.options(
+            "/ping",
+            headers={"Origin": "https://example.com", "Access-Control-Request-Method": "POST"},
+        )
+        
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-methods"] == "*"
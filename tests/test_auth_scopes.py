@@ -1,9 +1,16 @@
 """Tests for API key authentication and scopes."""
 
+import hashlib
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
 
+from engram.api.auth import ApiKeyCache, ApiKeyManager
 from engram.api.server import app
+from engram.database.apikeys import ApiKey
 
 
 @pytest.fixture
@@ -45,6 +52,10 @@ def test_public_endpoints_no_auth(client):
     # Docs should be public
     response = client.get("/docs")
     assert response.status_code == 200
+    
+    # Root service info should be public
+    response = client.get("/")
+    assert response.status_code == 200
 
 
 def test_ingest_endpoints_require_auth(client):
@@ -71,3 +82,220 @@ def test_connector_endpoints_require_auth(client):
     """Test that connector endpoints require authentication."""
     response = client.get("/v1/connectors/sources")
     assert response.status_code == 401
+
+
+class TestApiKeyLookup:
+    """Test API keys are validated by their SHA-256 digest."""
+
+    @pytest.fixture
+    def session_factory(self, test_engine):
+        """Route the key manager's sessions to the test database."""
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+        self.cache = ApiKeyCache(maxsize=10, ttl=60)
+        with patch("engram.api.auth.get_session", factory), \
+                patch("engram.api.auth.get_api_key_cache", return_value=self.cache):
+            yield factory
+
+    def add_key(self, session_factory, key_id, **fields):
+        with session_factory() as session:
+            session.add(ApiKey(
+                id=key_id,
+                tenant_id="auth-tenant",
+                user_id="auth-user",
+                name=key_id,
+                scopes=["memories:read"],
+                expires_at=datetime.utcnow() + timedelta(days=1),
+                **fields,
+            ))
+            session.commit()
+
+    def test_hash_is_sha256_digest(self):
+        key_hash = ApiKeyManager.hash_api_key("ek_test")
+        
+        assert key_hash == hashlib.sha256(b"ek_test").digest()
+        assert ApiKeyManager.verify_api_key("ek_test", key_hash)
+        assert not ApiKeyManager.verify_api_key("ek_other", key_hash)
+
+    def test_validate_by_digest(self, session_factory):
+        self.add_key(session_factory, "digest-key", key_hash=ApiKeyManager.hash_api_key("ek_digest"))
+        
+        record = ApiKeyManager.validate_api_key("ek_digest")
+        
+        assert record.id == "digest-key"
+        assert record.last_used_at is not None
+        assert ApiKeyManager.validate_api_key("ek_unknown") is None
+
+    def test_legacy_key_gets_digest(self, session_factory):
+        self.add_key(session_factory, "legacy-key", legacy_key_hash="$2b$legacy")
+        
+        with patch("engram.api.auth.pwd_context") as pwd_context:
+            pwd_context.verify.side_effect = lambda key, hashed: key == "ek_legacy"
+            assert ApiKeyManager.validate_api_key("ek_legacy").id == "legacy-key"
+            
+            # Later lookups go through the digest without bcrypt
+            pwd_context.verify.reset_mock()
+            assert ApiKeyManager.validate_api_key("ek_legacy").id == "legacy-key"
+            pwd_context.verify.assert_not_called()
+            
+        with session_factory() as session:
+            record = session.get(ApiKey, "legacy-key")
+            assert record.key_hash == ApiKeyManager.hash_api_key("ek_legacy")
+            assert record.legacy_key_hash is None
+
+    def test_validated_key_is_cached(self, session_factory):
+        self.add_key(session_factory, "cached-key", key_hash=ApiKeyManager.hash_api_key("ek_cached"))
+        assert ApiKeyManager.validate_api_key("ek_cached").id == "cached-key"
+        
+        with patch("engram.api.auth.get_session") as get_session:
+            record = ApiKeyManager.validate_api_key("ek_cached")
+            
+        get_session.assert_not_called()
+        assert record.id == "cached-key"
+        assert record.has_scope("memories:read")
+
+    def test_revoked_key_leaves_cache(self, session_factory):
+        self.add_key(session_factory, "revoked-key", key_hash=ApiKeyManager.hash_api_key("ek_revoked"))
+        assert ApiKeyManager.validate_api_key("ek_revoked") is not None
+        
+        assert ApiKeyManager.revoke_api_key("revoked-key", "auth-tenant")
+        
+        assert ApiKeyManager.validate_api_key("ek_revoked") is None
+
+    def test_revocation_during_validation_is_not_cached(self, session_factory):
+        key_hash = ApiKeyManager.hash_api_key("ek_racing")
+        self.add_key(session_factory, "racing-key", key_hash=key_hash)
+        
+        put = self.cache.put
+        
+        # Revoke the key after validation has read it, before it is cached
+        def revoke_then_put(*args, **kwargs):
+            assert ApiKeyManager.revoke_api_key("racing-key", "auth-tenant")
+            put(*args, **kwargs)
+            
+        with patch.object(self.cache, "put", side_effect=revoke_then_put):
+            assert ApiKeyManager.validate_api_key("ek_racing") is not None
+            
+        assert self.cache.get(key_hash) is None
+        assert ApiKeyManager.validate_api_key("ek_racing") is None
+
+    def test_last_used_update_keeps_cache(self, session_factory):
+        key_hash = ApiKeyManager.hash_api_key("ek_used")
+        self.add_key(session_factory, "used-key", key_hash=key_hash)
+        
+        assert ApiKeyManager.validate_api_key("ek_used") is not None
+        
+        assert self.cache.get(key_hash).id == "used-key"
+
+
+class TestApiKeyCache:
+    """Test the validated key cache."""
+
+    def make_key(self, key_id, expires_in=None):
+        expires_at = datetime.utcnow() + expires_in if expires_in is not None else None
+        return ApiKey(id=key_id, active=True, scopes=[], expires_at=expires_at)
+
+    def test_lru_eviction(self):
+        cache = ApiKeyCache(maxsize=2, ttl=60)
+        cache.put(b"a", self.make_key("a"))
+        cache.put(b"b", self.make_key("b"))
+        cache.get(b"a")
+        cache.put(b"c", self.make_key("c"))
+        
+        assert cache.get(b"b") is None
+        assert cache.get(b"a").id == "a"
+        assert cache.get(b"c").id == "c"
+
+    def test_entries_expire(self):
+        cache = ApiKeyCache(maxsize=10, ttl=60)
+        with patch("engram.api.auth.time.monotonic", return_value=1000.0):
+            cache.put(b"a", self.make_key("a"))
+        with patch("engram.api.auth.time.monotonic", return_value=1061.0):
+            assert cache.get(b"a") is None
+
+    def test_key_expiry_bounds_ttl(self):
+        cache = ApiKeyCache(maxsize=10, ttl=60)
+        cache.put(b"expired", self.make_key("expired", timedelta(seconds=-1)))
+        with patch("engram.api.auth.time.monotonic", return_value=1000.0):
+            cache.put(b"soon", self.make_key("soon", timedelta(seconds=10)))
+        
+        assert cache.get(b"expired") is None
+        with patch("engram.api.auth.time.monotonic", return_value=1011.0):
+            assert cache.get(b"soon") is None
+
+    def test_invalidate_by_digest(self):
+        cache = ApiKeyCache(maxsize=10, ttl=60)
+        cache.put(b"a", self.make_key("a"))
+        
+        cache.invalidate(b"a")
+        cache.invalidate(b"missing")
+        
+        assert cache.get(b"a") is None
+
+    def test_put_under_stale_generation(self):
+        cache = ApiKeyCache(maxsize=10, ttl=60)
+        generation, _ = cache.lookup(b"a")
+        cache.invalidate(b"a")
+        cache.put(b"a", self.make_key("a"), generation=generation)
+        
+        assert cache.get(b"a") is None
+
+    def test_revocation_is_shared_through_redis(self):
+        generations = {}
+        redis_client = Mock()
+        redis_client.get.side_effect = generations.get
+        redis_client.incr.side_effect = lambda key: generations.update({key: generations.get(key, 0) + 1})
+        first = ApiKeyCache(maxsize=10, ttl=60, redis_client=redis_client)
+        second = ApiKeyCache(maxsize=10, ttl=60, redis_client=redis_client)
+        second.put(b"a", self.make_key("a"))
+        
+        first.invalidate(b"a")
+        
+        assert second.get(b"a") is None
+
+    def test_disabled_cache(self):
+        cache = ApiKeyCache(maxsize=0, ttl=60)
+        cache.put(b"a", self.make_key("a"))
+        
+        assert cache.get(b"a") is None
+
+
+class TestApiKeyScopes:
+    """Test scope checks on API key records."""
+
+    def test_scopes_from_constructor(self):
+        api_key = ApiKey(id="scoped", active=True, scopes=["memories:read", "chat:read"])
+        
+        assert api_key.has_scope("memories:read")
+        assert not api_key.has_scope("memories:write")
+        assert api_key.has_any_scope(["memories:write", "chat:read"])
+        assert not api_key.has_any_scope(["memories:write"])
+
+    def test_reassigned_scopes(self):
+        api_key = ApiKey(id="reassigned", active=True, scopes=["memories:read"])
+        api_key.scopes = ["admin:*"]
+        
+        assert api_key.has_scope("analytics:read")
+        assert api_key.has_any_scope(["graph:read"])
+        assert not api_key.has_any_scope([])
+
+    def test_inactive_key_has_no_scopes(self):
+        api_key = ApiKey(id="inactive", active=False, scopes=["admin:*"])
+        
+        assert not api_key.has_scope("memories:read")
+        assert not api_key.has_any_scope(["memories:read"])
+
+    def test_scopes_loaded_from_database(self, test_session):
+        test_session.add(ApiKey(
+            id="loaded-scopes",
+            tenant_id="auth-tenant",
+            user_id="auth-user",
+            name="loaded",
+            active=True,
+            scopes=["graph:read"],
+        ))
+        test_session.commit()
+        test_session.expunge_all()
+        
+        api_key = test_session.get(ApiKey, "loaded-scopes")
+        assert api_key.has_scope("graph:read")
+        assert not api_key.has_scope("chat:read")
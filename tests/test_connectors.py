@@ -0,0 +1,263 @@
+"""Tests for external data source connectors."""
+
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pytest
+
+from engram.connectors.base_connector import BaseConnector
+from engram.connectors.retry import connector_retry, is_transient_error
+from engram.connectors.slack import SlackConnector
+
+
+class FakeConnector(BaseConnector):
+    """In-memory connector for exercising BaseConnector helpers."""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def authenticate(self) -> bool:
+        return True
+
+    async def list_items(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return []
+
+    async def fetch_item(self, item_id: str) -> Dict[str, Any]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if item_id == "missing":
+            raise KeyError(item_id)
+        return {"id": item_id}
+
+    async def get_last_sync_time(self) -> Optional[datetime]:
+        return None
+
+    async def update_sync_time(self, timestamp: datetime) -> None:
+        return None
+
+
+class TestBaseConnector:
+    """Test BaseConnector shared behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_items_preserves_order(self):
+        """Test concurrent fetches return results in request order."""
+        connector = FakeConnector({})
+
+        results = await connector.fetch_items(["a", "b", "c"])
+
+        assert [result["id"] for result in results] == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_fetch_items_limits_concurrency(self):
+        """Test the semaphore caps in-flight fetches."""
+        connector = FakeConnector({})
+
+        await connector.fetch_items([str(i) for i in range(10)], concurrency=3)
+
+        assert connector.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_fetch_items_returns_exceptions(self):
+        """Test a failed fetch does not abort the batch."""
+        connector = FakeConnector({})
+
+        results = await connector.fetch_items(["a", "missing"])
+
+        assert results[0] == {"id": "a"}
+        assert isinstance(results[1], KeyError)
+
+    def test_validate_config(self):
+        """Test required config fields are checked."""
+        connector = FakeConnector({"token": "t", "workspace": "w"})
+
+        assert connector.validate_config(["token", "workspace"]) is True
+        assert connector.validate_config(("token", "export_path")) is False
+        assert connector.validate_config([]) is True
+
+    def test_package_exports_connectors_lazily(self):
+        """Test connector classes resolve through the package on access."""
+        import engram.connectors as connectors
+
+        assert connectors.SlackConnector is SlackConnector
+        with pytest.raises(AttributeError):
+            connectors.MissingConnector
+
+
+@pytest.fixture
+def slack_export(tmp_path):
+    """Create a minimal Slack workspace export on disk."""
+    (tmp_path / "channels.json").write_text(json.dumps([
+        {
+            "id": "C1",
+            "name": "general",
+            "created": 1640995200,
+            "members": ["U1", "U2"],
+            "topic": {"value": "General discussion"},
+            "purpose": {"value": "Announcements"},
+        },
+        {"id": "C2", "name": "random", "created": 1640995200, "members": []},
+    ]))
+    (tmp_path / "users.json").write_text(json.dumps([
+        {"id": "U1", "name": "john.doe", "real_name": "John Doe", "profile": {"display_name": "John"}},
+        {"id": "U2", "name": "jane.smith", "real_name": "Jane Smith", "profile": {}},
+    ]))
+    channel_dir = tmp_path / "general"
+    channel_dir.mkdir()
+    (channel_dir / "2022-01-02.json").write_text(json.dumps([
+        {"type": "message", "user": "U2", "text": "Second day", "ts": "1641081600.000100"},
+    ]))
+    (channel_dir / "2022-01-01.json").write_text(json.dumps([
+        {"type": "message", "user": "U1", "text": "Hello everyone!", "ts": "1640995200.000100"},
+        {"type": "message", "user": "U1", "text": "Threaded", "ts": "1640995260.000200", "thread_ts": "1640995200.000100"},
+    ]))
+    return tmp_path
+
+
+class TestSlackConnector:
+    """Test SlackConnector export parsing."""
+
+    @pytest.mark.asyncio
+    async def test_authenticate_requires_export(self, tmp_path, slack_export):
+        """Test authentication checks for the export files."""
+        assert await SlackConnector({"export_path": str(slack_export)}).authenticate()
+        assert not await SlackConnector({"export_path": str(tmp_path / "missing")}).authenticate()
+
+    def test_connectors_use_slots(self, slack_export):
+        """Test connector instances carry no per-instance __dict__."""
+        connector = SlackConnector({"export_path": slack_export})
+
+        assert not hasattr(connector, "__dict__")
+
+    @pytest.mark.asyncio
+    async def test_list_items(self, slack_export):
+        """Test channels are listed from channels.json."""
+        connector = SlackConnector({"export_path": str(slack_export)})
+
+        channels = await connector.list_items()
+
+        assert [channel["id"] for channel in channels] == ["C1", "C2"]
+        assert channels[0]["topic"] == "General discussion"
+        assert channels[0]["member_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_list_items_respects_channel_ids(self, slack_export):
+        """Test configured channel IDs filter the listing."""
+        connector = SlackConnector({"export_path": str(slack_export), "channel_ids": ["C2"]})
+
+        channels = await connector.list_items()
+
+        assert [channel["id"] for channel in channels] == ["C2"]
+
+    @pytest.mark.asyncio
+    async def test_fetch_item(self, slack_export):
+        """Test channel messages are read in date order with user names."""
+        connector = SlackConnector({"export_path": str(slack_export)})
+
+        channel = await connector.fetch_item("C1")
+
+        assert [message["text"] for message in channel["messages"]] == [
+            "Hello everyone!",
+            "Threaded",
+            "Second day",
+        ]
+        assert channel["messages"][0]["username"] == "john.doe"
+        assert channel["messages"][1]["thread_ts"] == "1640995200.000100"
+        assert set(channel["users"]) == {"U1", "U2"}
+        assert channel["channel_info"]["purpose"] == "Announcements"
+
+    @pytest.mark.asyncio
+    async def test_fetch_item_caps_messages(self, slack_export):
+        """Test large channels are cut short at the message cap."""
+        connector = SlackConnector({"export_path": str(slack_export)})
+
+        channel = await connector.fetch_item("C1", max_messages=2)
+
+        assert [message["text"] for message in channel["messages"]] == ["Hello everyone!", "Threaded"]
+        assert channel["truncated"]
+        assert set(channel["users"]) == {"U1"}
+        assert not (await connector.fetch_item("C1"))["truncated"]
+
+    @pytest.mark.asyncio
+    async def test_fetch_item_unknown_channel(self, slack_export):
+        """Test fetching a channel missing from the export fails."""
+        connector = SlackConnector({"export_path": str(slack_export)})
+
+        with pytest.raises(ValueError):
+            await connector.fetch_item("C404")
+
+    @pytest.mark.asyncio
+    async def test_iter_messages_streams_in_batches(self, slack_export):
+        """Test streamed messages match the materialized channel."""
+        connector = SlackConnector({"export_path": str(slack_export)})
+
+        streamed = [message async for message in connector.iter_messages("C1", batch_size=1)]
+        channel = await connector.fetch_item("C1")
+
+        assert streamed == channel["messages"]
+
+    @pytest.mark.asyncio
+    async def test_fetch_message_columns(self, slack_export):
+        """Test columnar messages line up with the row-oriented fetch."""
+        connector = SlackConnector({"export_path": str(slack_export)})
+
+        columns = await connector.fetch_message_columns("C1")
+        channel = await connector.fetch_item("C1")
+
+        assert columns["text"] == [message["text"] for message in channel["messages"]]
+        assert columns["ts"].dtype.name == "float64"
+        assert columns["ts"].tolist() == [float(message["ts"]) for message in channel["messages"]]
+        assert (columns["ts"] >= 1641000000.0).sum() == 1
+
+
+class TestConnectorRetry:
+    """Test the shared connector retry policy."""
+
+    @staticmethod
+    def _status_error(status_code: int, headers: Optional[Dict[str, str]] = None) -> httpx.HTTPStatusError:
+        request = httpx.Request("GET", "https://api.example.com/items")
+        response = httpx.Response(status_code, headers=headers, request=request)
+        return httpx.HTTPStatusError("error", request=request, response=response)
+
+    @pytest.mark.asyncio
+    async def test_retries_throttled_calls(self):
+        """Test 429 responses are retried, honouring Retry-After."""
+        attempts = []
+
+        @connector_retry
+        async def fetch():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise self._status_error(429, {"Retry-After": "0"})
+            return "ok"
+
+        assert await fetch() == "ok"
+        assert len(attempts) == 3
+
+    @pytest.mark.asyncio
+    async def test_does_not_retry_client_errors(self):
+        """Test non-transient HTTP errors are raised immediately."""
+        attempts = []
+
+        @connector_retry
+        async def fetch():
+            attempts.append(1)
+            raise self._status_error(404)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await fetch()
+        assert len(attempts) == 1
+
+    def test_is_transient_error(self):
+        """Test transient error classification."""
+        assert is_transient_error(self._status_error(503))
+        assert is_transient_error(httpx.ConnectTimeout("timeout"))
+        assert not is_transient_error(self._status_error(401))
+        assert not is_transient_error(ValueError("bad"))
@@ -1,10 +1,14 @@
 """Tests for consolidation engine functionality."""
 
+import numpy as np
 import pytest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
-from engram.core.consolidation import ConsolidationEngine
+from engram.core.ann_index import MAX_SAVE_FAILURES, MemoryANNIndex
+from engram.core.consolidation import ConsolidationEngine, _BufferPool, quantize_int8
 from engram.core.retrieval import RetrievalEngine
 from engram.vectordb.base import VectorHit
 
@@ -86,13 +90,6 @@ class TestConsolidationEngine:
             "memory-3": [0.9, 0.8, 0.7, 0.6] * 10,     # Different
         }
         
-        # Mock retrieval engine responses
-        consolidation_engine.retrieval_engine.find_similar_memories.side_effect = [
-            [VectorHit("memory-2", 0.98, {})],  # memory-1 finds memory-2
-            [],  # memory-2 finds nothing (already processed)
-            [],  # memory-3 finds nothing
-        ]
-        
         clusters = consolidation_engine._find_memory_clusters(
             memory_vectors=memory_vectors,
             tenant_id="test-tenant",
@@ -104,6 +101,204 @@ class TestConsolidationEngine:
         assert len(clusters[0]) == 2
         assert clusters[0][0]["id"] == "memory-1"
         assert clusters[0][1]["id"] == "memory-2"
+        consolidation_engine.retrieval_engine.find_similar_memories.assert_not_called()
+
+    def test_consolidate_memories_matrix_input(self, consolidation_engine: ConsolidationEngine):
+        """Test consolidation accepts memory IDs with an aligned matrix."""
+        memory_ids = ["memory-1", "memory-2", "memory-3"]
+        matrix = np.array([
+            [0.1, 0.2, 0.3, 0.4],
+            [0.11, 0.21, 0.31, 0.41],
+            [0.9, 0.1, 0.0, 0.0],
+        ], dtype=np.float32)
+        
+        result = consolidation_engine.consolidate_memories(
+            tenant_id="test-tenant",
+            user_id="test-user",
+            memory_vectors=(memory_ids, matrix),
+            dry_run=True,
+        )
+        
+        assert result["merged"] == [["memory-1", "memory-2"]]
+
+    def test_find_memory_clusters_transitive(self, consolidation_engine: ConsolidationEngine):
+        """Test chains of similar memories form one cluster."""
+        consolidation_engine.consolidation_threshold = 0.9
+        memory_vectors = {
+            "memory-1": [1.0, 0.0, 0.0],
+            "memory-2": [0.0, 0.0, 1.0],  # Unrelated
+            "memory-3": [0.9, 0.4, 0.0],  # Similar to memory-1 and memory-4
+            "memory-4": [0.7, 0.7, 0.0],  # Not similar to memory-1 directly
+        }
+        
+        clusters = consolidation_engine._find_memory_clusters(
+            memory_vectors=memory_vectors,
+            tenant_id="test-tenant",
+            user_id="test-user",
+        )
+        
+        assert [[m["id"] for m in cluster] for cluster in clusters] == [
+            ["memory-1", "memory-3", "memory-4"],
+        ]
+
+    def test_find_memory_clusters_order_independent(self, consolidation_engine: ConsolidationEngine):
+        """Test cluster membership does not depend on input order."""
+        consolidation_engine.consolidation_threshold = 0.9
+        memory_vectors = {
+            "memory-1": [1.0, 0.0, 0.0],
+            "memory-2": [0.0, 0.0, 1.0],
+            "memory-3": [0.9, 0.4, 0.0],
+            "memory-4": [0.7, 0.7, 0.0],
+        }
+        
+        def cluster_sets(vectors):
+            clusters = consolidation_engine._find_memory_clusters(vectors, "test-tenant", "test-user")
+            return {frozenset(m["id"] for m in cluster) for cluster in clusters}
+        
+        reversed_vectors = dict(reversed(list(memory_vectors.items())))
+        assert cluster_sets(memory_vectors) == cluster_sets(reversed_vectors)
+
+    def test_find_similar_pairs_matches_exact_cosine(self, consolidation_engine: ConsolidationEngine):
+        """Test quantized pair search agrees with exact cosine similarity."""
+        consolidation_engine.consolidation_threshold = 0.9
+        rng = np.random.default_rng(0)
+        base = rng.standard_normal((50, 64)).astype(np.float32)
+        vectors = np.concatenate([base, base + 0.3 * rng.standard_normal((50, 64)).astype(np.float32)])
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        
+        rows, cols = consolidation_engine._find_similar_pairs(normalized)
+        
+        exact_rows, exact_cols = np.nonzero(np.triu(normalized @ normalized.T >= 0.9, 1))
+        assert set(zip(rows.tolist(), cols.tolist())) == set(zip(exact_rows.tolist(), exact_cols.tolist()))
+
+    def test_find_similar_pairs_across_tiles(self, consolidation_engine: ConsolidationEngine, monkeypatch):
+        """Test exact tile rescoring finds duplicates spread over several tiles."""
+        monkeypatch.setattr("engram.core.consolidation.CLUSTER_BLOCK_SIZE", 16)
+        consolidation_engine.consolidation_threshold = 0.9
+        rng = np.random.default_rng(2)
+        base = rng.standard_normal((1, 32)).astype(np.float32)
+        vectors = np.concatenate([
+            base + 0.01 * rng.standard_normal((40, 32)).astype(np.float32),
+            rng.standard_normal((20, 32)).astype(np.float32),
+        ])
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        
+        rows, cols = consolidation_engine._find_similar_pairs(vectors)
+        
+        exact_rows, exact_cols = np.nonzero(np.triu(vectors @ vectors.T >= 0.9, 1))
+        assert len(rows) >= 40 * 39 // 2
+        assert set(zip(rows.tolist(), cols.tolist())) == set(zip(exact_rows.tolist(), exact_cols.tolist()))
+
+    def test_find_similar_pairs_lsh(self, consolidation_engine: ConsolidationEngine):
+        """Test LSH candidate pairs recover near-duplicates found by the exact pass."""
+        rng = np.random.default_rng(1)
+        base = rng.standard_normal((500, 64)).astype(np.float32)
+        vectors = np.concatenate([base, base[:50] + 0.02 * rng.standard_normal((50, 64)).astype(np.float32)])
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        
+        rows, cols = consolidation_engine._find_similar_pairs_lsh(vectors)
+        exact_rows, exact_cols = consolidation_engine._find_similar_pairs(vectors)
+        
+        assert len(rows) == 50
+        assert set(zip(rows.tolist(), cols.tolist())) == set(zip(exact_rows.tolist(), exact_cols.tolist()))
+
+    def test_find_similar_pairs_lsh_large_bucket(self, consolidation_engine: ConsolidationEngine):
+        """Test a cluster larger than a bucket may expand is still fully linked."""
+        rng = np.random.default_rng(3)
+        base = rng.standard_normal((1, 64)).astype(np.float32)
+        vectors = np.concatenate([
+            base + 0.001 * rng.standard_normal((100, 64)).astype(np.float32),
+            rng.standard_normal((200, 64)).astype(np.float32),
+        ])
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        
+        rows, cols = consolidation_engine._find_similar_pairs_lsh(vectors)
+        exact_rows, exact_cols = consolidation_engine._find_similar_pairs(vectors)
+        
+        assert len(rows) == 100 * 99 // 2
+        assert set(zip(rows.tolist(), cols.tolist())) == set(zip(exact_rows.tolist(), exact_cols.tolist()))
+
+    def test_cluster_labels(self, consolidation_engine: ConsolidationEngine):
+        """Test that linked memories share a label and the rest do not."""
+        vectors = np.array([[1, 0], [0, 1], [1, 0.01], [0.01, 1], [0.6, -0.8]], dtype=np.float32)
+        
+        labels = consolidation_engine._cluster_labels(
+            ["a", "b", "c", "d", "e"], vectors, "test-tenant", "test-user"
+        )
+        
+        assert labels[0] == labels[2]
+        assert labels[1] == labels[3]
+        assert len(set(labels.tolist())) == 3
+
+    def test_quantize_int8(self):
+        """Test int8 scalar quantization round-trips closely."""
+        matrix = np.array([[0.5, -1.0, 0.25], [0.0, 0.0, 0.0]], dtype=np.float32)
+        
+        codes, scales = quantize_int8(matrix)
+        
+        assert codes.dtype == np.int8
+        assert np.allclose(codes * scales[:, None], matrix, atol=1 / 127)
+
+    def test_buffer_pool_reuses_buffers(self):
+        """Test released scratch buffers are handed out again."""
+        pool = _BufferPool(max_bytes=1024)
+        
+        first = pool.rent((3, 5))
+        assert first.shape == (3, 5)
+        assert first.flags.c_contiguous
+        pool.release(first)
+        
+        second = pool.rent((4, 4))
+        assert np.shares_memory(first, second)
+        pool.release(second)
+        
+        # Buffers beyond the retention limit are not pooled
+        large = pool.rent((1024,))
+        pool.release(large)
+        assert not np.shares_memory(large, pool.rent((1024,)))
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_consolidate_all(self, consolidation_engine: ConsolidationEngine, max_workers: int):
+        """Test consolidating several users, serially and in worker processes."""
+        vectors = np.array([[1.0, 0.0], [1.0, 0.001], [0.0, 1.0]], dtype=np.float32)
+        memory_vectors_by_user = {
+            ("tenant", "user-1"): (["a", "b", "c"], vectors),
+            ("tenant", "user-2"): (["d", "e"], vectors[1:]),
+            ("tenant", "broken"): (["f"], np.ones((2, 2), dtype=np.float32)),
+        }
+        
+        results = consolidation_engine.consolidate_all(
+            memory_vectors_by_user, dry_run=True, max_workers=max_workers
+        )
+        
+        assert results[("tenant", "user-1")]["merged"] == [["a", "b"]]
+        assert results[("tenant", "user-2")]["merged"] == []
+        assert ("tenant", "broken") not in results
+
+    def test_consolidate_all_keeps_results_after_worker_failure(self, consolidation_engine: ConsolidationEngine):
+        """Test a dead worker or exhausted memory only loses the affected users."""
+        outcomes = {
+            "user-1": {"merged": [], "deleted": [], "updated": []},
+            "user-2": BrokenProcessPool("worker died"),
+            "user-3": MemoryError(),
+        }
+        
+        def submit(function, tenant_id, user_id, *args):
+            future = Future()
+            if isinstance(outcomes[user_id], BaseException):
+                future.set_exception(outcomes[user_id])
+            else:
+                future.set_result(outcomes[user_id])
+            return future
+        
+        vectors = (["a"], np.ones((1, 2), dtype=np.float32))
+        with patch("engram.core.consolidation.ProcessPoolExecutor") as executor_class:
+            executor_class.return_value.__enter__.return_value.submit.side_effect = submit
+            results = consolidation_engine.consolidate_all(
+                {("tenant", user_id): vectors for user_id in outcomes}, max_workers=3
+            )
+        
+        assert results == {("tenant", "user-1"): outcomes["user-1"]}
 
     def test_identify_forgotten_memories(self, consolidation_engine: ConsolidationEngine):
         """Test identifying forgotten memories."""
@@ -143,6 +338,36 @@ class TestConsolidationEngine:
         assert "memory-2" not in forgotten_ids
         assert "memory-3" not in forgotten_ids
 
+    def test_identify_forgotten_memories_timestamp_formats(self, consolidation_engine: ConsolidationEngine):
+        """Test UTC offsets, datetimes and invalid access times."""
+        current_time = datetime(2024, 6, 1, 12, 0)
+        memories = [
+            {"id": "utc", "metadata": {"importance": 0.1, "last_accessed_at": "2024-01-01T00:00:00Z"}},
+            {"id": "datetime", "metadata": {"importance": 0.1, "last_accessed_at": datetime(2024, 1, 1)}},
+            {"id": "invalid", "metadata": {"importance": 0.1, "last_accessed_at": "yesterday"}},
+            {"id": "boundary", "metadata": {"importance": 0.1, "last_accessed_at": "2024-05-02T12:00:00"}},
+        ]
+        
+        forgotten_ids = consolidation_engine.identify_forgotten_memories(memories, current_time)
+        
+        assert forgotten_ids == ["utc", "datetime"]
+
+    def test_identify_forgotten_memories_invalid_importance(self, consolidation_engine: ConsolidationEngine):
+        """Test non-numeric importance counts as the default instead of raising."""
+        consolidation_engine.importance_threshold = 0.3
+        stale = {"last_accessed_at": "2024-01-01T00:00:00"}
+        memories = [
+            {"id": "text", "metadata": {**stale, "importance": "high"}},
+            {"id": "none", "metadata": {**stale, "importance": None}},
+            {"id": "nan", "metadata": {**stale, "importance": float("nan")}},
+            {"id": "list", "metadata": {**stale, "importance": [0.1]}},
+            {"id": "low", "metadata": {**stale, "importance": 0.1}},
+        ]
+        
+        forgotten_ids = consolidation_engine.identify_forgotten_memories(memories, datetime(2024, 6, 1))
+        
+        assert forgotten_ids == ["low"]
+
     def test_identify_forgotten_memories_no_metadata(self, consolidation_engine: ConsolidationEngine):
         """Test identifying forgotten memories with missing metadata."""
         memories = [
@@ -203,6 +428,28 @@ class TestConsolidationEngine:
         
         assert 0.0 <= importance <= 1.0  # Should be clamped
 
+    def test_calculate_memory_importance_invalid_base(self, consolidation_engine: ConsolidationEngine):
+        """Test invalid stored importance falls back to the default."""
+        for invalid in ("high", None, float("nan")):
+            importance = consolidation_engine.calculate_memory_importance(
+                {"metadata": {"importance": invalid}}, access_frequency=0, recency_days=10000
+            )
+            assert importance == pytest.approx(0.5)
+
+    def test_calculate_memory_importance_batch(self, consolidation_engine: ConsolidationEngine):
+        """Test batch importance scores match the per-memory calculation."""
+        base = np.array([0.1, 0.5, 0.9, 0.5])
+        frequency = np.array([0, 10, 100, 3])
+        days = np.array([100, 1, 0, 30])
+        
+        scores = consolidation_engine.calculate_memory_importance_batch(base, frequency, days)
+        
+        expected = [
+            consolidation_engine.calculate_memory_importance({"metadata": {"importance": b}}, f, d)
+            for b, f, d in zip(base.tolist(), frequency.tolist(), days.tolist())
+        ]
+        assert scores.tolist() == pytest.approx(expected)
+
     def test_get_consolidation_stats(self, consolidation_engine: ConsolidationEngine):
         """Test getting consolidation engine statistics."""
         stats = consolidation_engine.get_consolidation_stats()
@@ -271,8 +518,8 @@ class TestConsolidationEngine:
             "memory-2": [0.11, 0.21, 0.31, 0.41] * 10,
         }
         
-        # Mock retrieval engine to raise exception
-        consolidation_engine.retrieval_engine.find_similar_memories.side_effect = Exception("Vector DB error")
+        # Vectors of different dimensions cannot be compared
+        memory_vectors["memory-2"] = [0.11, 0.21]
         
         with pytest.raises(ValueError, match="Memory consolidation failed"):
             consolidation_engine.consolidate_memories(
@@ -303,3 +550,111 @@ class TestConsolidationEngine:
         assert len(result["merged"]) >= 0
         assert len(result["deleted"]) == 0  # No actual deletions in dry run
         assert len(result["updated"]) == 0  # No actual updates in dry run
+
+
+class TestMemoryANNIndex:
+    """Test the persistent nearest-neighbour index used for consolidation."""
+
+    @pytest.fixture
+    def ann_index(self, tmp_path):
+        """Create an index persisted to a temporary directory."""
+        index = MemoryANNIndex(index_path=str(tmp_path), flush_interval=3600)
+        yield index
+        index.close()
+
+    def test_query_returns_nearest_memories(self, ann_index: MemoryANNIndex):
+        """Test that indexed memories are found by similarity."""
+        vectors = np.eye(4, dtype=np.float32)
+        ann_index.add("tenant", "user", ["a", "b", "c", "d"], vectors)
+        
+        memory_ids, labels, similarities = ann_index.query("tenant", "user", vectors[:1], k=2)
+        
+        assert memory_ids[labels[0, 0]] == "a"
+        assert similarities[0, 0] == pytest.approx(1.0, abs=1e-5)
+
+    def test_index_persists_and_removes(self, ann_index: MemoryANNIndex, tmp_path):
+        """Test that a reloaded index keeps its memories and deletions."""
+        vectors = np.eye(3, dtype=np.float32)
+        ann_index.add("tenant", "user", ["a", "b", "c"], vectors)
+        ann_index.remove("tenant", "user", ["b"])
+        
+        # Changes are only written by the flusher
+        assert not list(tmp_path.glob("*.bin"))
+        ann_index.flush()
+        
+        reloaded = MemoryANNIndex(index_path=str(tmp_path), flush_interval=0)
+        memory_ids, labels, _ = reloaded.query("tenant", "user", vectors, k=5)
+        
+        assert labels.shape == (3, 2)
+        assert {memory_ids[label] for label in labels.ravel()} == {"a", "c"}
+
+    def test_index_merges_saves_from_other_processes(self, ann_index: MemoryANNIndex, tmp_path):
+        """Test unsaved changes are reapplied on top of another writer's save."""
+        vectors = np.eye(4, dtype=np.float32)
+        other = MemoryANNIndex(index_path=str(tmp_path), flush_interval=0)
+        other.add("tenant", "user", ["a", "b"], vectors[:2])
+        
+        ann_index.add("tenant", "user", ["c"], vectors[2:3])
+        other.add("tenant", "user", ["d"], vectors[3:])
+        ann_index.flush()
+        
+        memory_ids, labels, _ = other.query("tenant", "user", vectors, k=1)
+        assert [memory_ids[label] for label in labels[:, 0]] == ["a", "b", "c", "d"]
+
+    def test_failed_saves_drop_unsaved_changes(self, tmp_path):
+        """Test changes that keep failing to save are not kept in memory forever."""
+        unwritable = tmp_path / "not-a-directory"
+        unwritable.write_bytes(b"")
+        index = MemoryANNIndex(index_path=str(unwritable), flush_interval=3600)
+        index.add("tenant", "user", ["a", "b"], np.eye(2, dtype=np.float32))
+        
+        for _ in range(MAX_SAVE_FAILURES - 1):
+            index.flush()
+        assert index._namespaces["tenant:user"].pending
+        
+        index.flush()
+        state = index._namespaces["tenant:user"]
+        assert not state.pending
+        assert state.entry is None
+        index.close()
+
+    def test_namespace_cache_is_bounded(self, tmp_path):
+        """Test least recently used namespaces are dropped once saved."""
+        index = MemoryANNIndex(index_path=str(tmp_path), flush_interval=3600, cache_size=2)
+        vectors = np.eye(2, dtype=np.float32)
+        for user_id in ["user-1", "user-2", "user-3"]:
+            index.add("tenant", user_id, ["a", "b"], vectors)
+        
+        # Unsaved namespaces are kept
+        assert len(index._namespaces) == 3
+        index.flush()
+        index.query("tenant", "user-3", vectors, k=1)
+        assert list(index._namespaces) == ["tenant:user-2", "tenant:user-3"]
+        
+        memory_ids, labels, _ = index.query("tenant", "user-1", vectors, k=1)
+        assert [memory_ids[label] for label in labels[:, 0]] == ["a", "b"]
+        index.close()
+
+    def test_query_unknown_user(self, ann_index: MemoryANNIndex):
+        """Test querying a user without an index."""
+        _, labels, similarities = ann_index.query("tenant", "nobody", np.ones((2, 4)), k=3)
+        
+        assert labels.shape == (2, 0)
+        assert similarities.shape == (2, 0)
+
+    def test_consolidation_uses_index(self, ann_index: MemoryANNIndex):
+        """Test that large memory sets cluster through the index like the exhaustive pass."""
+        rng = np.random.default_rng(3)
+        base = rng.normal(size=(40, 16)).astype(np.float32)
+        vectors = np.concatenate([base, base[:10] + 0.01])
+        memory_ids = [f"memory-{i:02d}" for i in range(len(vectors))]
+        
+        exhaustive = ConsolidationEngine(Mock(spec=RetrievalEngine))
+        indexed = ConsolidationEngine(Mock(spec=RetrievalEngine), ann_index)
+        
+        with patch("engram.core.consolidation.settings.ann_min_memories", 10):
+            expected = exhaustive._find_memory_clusters((memory_ids, vectors), "tenant", "user")
+            clusters = indexed._find_memory_clusters((memory_ids, vectors), "tenant", "user")
+        
+        assert len(clusters) == 10
+        assert [[m["id"] for m in c] for c in clusters] == [[m["id"] for m in c] for c in expected]
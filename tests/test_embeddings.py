@@ -0,0 +1,123 @@
+"""Tests for embeddings facade functionality."""
+
+import numpy as np
+import pytest
+from unittest.mock import Mock, patch
+
+from engram.core.embeddings import EmbeddingsFacade, _make_provider
+
+
+class TestEmbeddingsFacade:
+    """Test EmbeddingsFacade functionality."""
+
+    @pytest.fixture
+    def mock_provider(self):
+        """Create a mock embeddings provider."""
+        provider = Mock()
+        provider.provider_name = "local"
+        provider.normalizes_embeddings = True
+        provider.max_batch_size = 256
+        provider.embed_texts = Mock(side_effect=lambda texts: [[float(len(text)), 1.0] for text in texts])
+        return provider
+
+    @pytest.fixture
+    def embeddings_facade(self, mock_provider):
+        """Create an embeddings facade backed by the mock provider."""
+        with patch.object(EmbeddingsFacade, "_register_providers"), \
+                patch("engram.core.embeddings._make_provider", return_value=mock_provider):
+            facade = EmbeddingsFacade()
+            facade._provider_name = "local"
+            yield facade
+
+    def test_embed_texts(self, embeddings_facade: EmbeddingsFacade):
+        """Test embeddings are returned in input order."""
+        embeddings = embeddings_facade.embed_texts(["a", "bbb"])
+        
+        assert embeddings.dtype == np.float32
+        assert embeddings.tolist() == [[1.0, 1.0], [3.0, 1.0]]
+
+    def test_embed_texts_normalizes(self, embeddings_facade: EmbeddingsFacade, mock_provider):
+        """Test vectors from providers without unit-length output are normalized."""
+        mock_provider.normalizes_embeddings = False
+        
+        embeddings = embeddings_facade.embed_texts(["aaa", "b"])
+        
+        assert np.linalg.norm(embeddings, axis=1) == pytest.approx([1.0, 1.0])
+        assert embeddings[0] == pytest.approx(np.array([3.0, 1.0]) / np.sqrt(10.0))
+
+    def test_embed_texts_batches(self, embeddings_facade: EmbeddingsFacade, mock_provider):
+        """Test large inputs are split into provider-sized batches in order."""
+        mock_provider.max_batch_size = 2
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+        
+        embeddings = embeddings_facade.embed_texts(texts)
+        
+        assert mock_provider.embed_texts.call_count == 3
+        assert embeddings[:, 0].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    def test_embed_texts_uses_cache(self, embeddings_facade: EmbeddingsFacade, mock_provider):
+        """Test repeated texts are served from the cache."""
+        embeddings_facade.embed_texts(["a", "bbb"])
+        embeddings = embeddings_facade.embed_texts(["bbb", "cc"])
+        
+        assert embeddings.tolist() == [[3.0, 1.0], [2.0, 1.0]]
+        assert mock_provider.embed_texts.call_args_list[1][0][0] == ["cc"]
+
+    def test_embed_texts_deduplicates(self, embeddings_facade: EmbeddingsFacade, mock_provider):
+        """Test repeated texts within one call are embedded once."""
+        embeddings_facade._cache_size = 0
+        
+        embeddings = embeddings_facade.embed_texts(["bbb", "a", "bbb", "a"])
+        
+        mock_provider.embed_texts.assert_called_once_with(["bbb", "a"])
+        assert embeddings.tolist() == [[3.0, 1.0], [1.0, 1.0], [3.0, 1.0], [1.0, 1.0]]
+
+    def test_embed_texts_cache_eviction(self, embeddings_facade: EmbeddingsFacade, mock_provider):
+        """Test the least recently used embedding is evicted."""
+        embeddings_facade._cache_size = 2
+        embeddings_facade.embed_texts(["a", "bb"])
+        embeddings_facade.embed_texts(["a"])
+        embeddings_facade.embed_texts(["ccc"])
+        embeddings_facade.embed_texts(["a", "bb"])
+        
+        assert mock_provider.embed_texts.call_args_list[-1][0][0] == ["bb"]
+
+    def test_embed_query(self, embeddings_facade: EmbeddingsFacade, mock_provider):
+        """Test single queries are embedded once and then served from the cache."""
+        first = embeddings_facade.embed_query("bbb")
+        first[0] = 0.0
+        second = embeddings_facade.embed_query("bbb")
+        
+        assert second.tolist() == [3.0, 1.0]
+        mock_provider.embed_texts.assert_called_once_with(["bbb"])
+
+    def test_embed_texts_empty(self, embeddings_facade: EmbeddingsFacade, mock_provider):
+        """Test no texts yields an empty array without calling the provider."""
+        embeddings = embeddings_facade.embed_texts([])
+        
+        assert len(embeddings) == 0
+        mock_provider.embed_texts.assert_not_called()
+
+    def test_embed_texts_count_mismatch(self, embeddings_facade: EmbeddingsFacade, mock_provider):
+        """Test provider results are validated."""
+        mock_provider.embed_texts.side_effect = None
+        mock_provider.embed_texts.return_value = []
+        
+        with pytest.raises(ValueError, match="Embedding generation failed"):
+            embeddings_facade.embed_texts(["a"])
+
+    def test_make_provider_shared_and_falls_back(self):
+        """Test providers are created once and unconfigured ones fall back to local."""
+        local_provider = Mock()
+        _make_provider.cache_clear()
+        try:
+            with patch(
+                "engram.core.embeddings.ProviderFactory.create_embeddings_provider",
+                return_value=local_provider,
+            ) as create:
+                assert _make_provider("openai", False, False) is local_provider
+                assert _make_provider("openai", False, False) is local_provider
+            
+            create.assert_called_once_with("local")
+        finally:
+            _make_provider.cache_clear()
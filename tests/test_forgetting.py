@@ -0,0 +1,167 @@
+"""Tests for forgetting engine functionality."""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy.orm import sessionmaker
+
+from engram.core.forgetting import ForgettingEngine, _health_cache
+from engram.database.models import Memory, ModalityType, Tenant, UserMemoryStats
+
+
+class TestForgettingEngine:
+    """Test ForgettingEngine functionality."""
+
+    @pytest.fixture
+    def session_factory(self, test_engine):
+        """Route the engine's sessions to the test database."""
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+        _health_cache.clear()
+        with patch("engram.core.forgetting.get_session", factory):
+            yield factory
+
+    @pytest.fixture
+    def forgetting_engine(self, session_factory):
+        """Create a forgetting engine for testing."""
+        engine = ForgettingEngine()
+        engine.importance_threshold = 0.2
+        engine.forgetting_days = 30
+        return engine
+
+    def add_memories(self, session_factory, tenant_id, specs):
+        """Insert memories given as (id, user_id, importance, idle_days, age_days)."""
+        now = datetime.utcnow()
+        with session_factory() as session:
+            session.add_all([
+                Memory(
+                    id=memory_id,
+                    tenant_id=tenant_id,
+                    user_id=user_id,
+                    text=f"memory {memory_id}",
+                    memory_metadata={},
+                    importance=importance,
+                    modality=ModalityType.TEXT,
+                    created_at=now - timedelta(days=age_days),
+                    last_accessed_at=now - timedelta(days=idle_days),
+                )
+                for memory_id, user_id, importance, idle_days, age_days in specs
+            ])
+            session.commit()
+
+    def test_analyze_memory_health(self, forgetting_engine: ForgettingEngine, session_factory):
+        """Test all health counts come back from one aggregate query."""
+        self.add_memories(session_factory, "health-tenant", [
+            ("health-1", "user-1", 0.1, 40, 400),
+            ("health-2", "user-1", 0.5, 40, 10),
+            ("health-3", "user-1", 0.1, 1, 10),
+            ("health-4", "user-2", 0.9, 1, 1),
+        ])
+        
+        with patch("engram.core.forgetting.settings.memory_retention_days", 365):
+            health = forgetting_engine.analyze_memory_health("health-tenant", "user-1")
+        
+        assert health["total_memories"] == 3
+        assert health["low_importance_count"] == 2
+        assert health["old_memories_count"] == 2
+        assert health["very_old_memories_count"] == 1
+        assert health["avg_importance"] == pytest.approx(0.233, abs=1e-3)
+        assert health["modality_breakdown"] == [{"modality": "text", "count": 3}]
+
+    def test_analyze_memory_health_is_cached(self, forgetting_engine: ForgettingEngine, session_factory):
+        """Test health is served from cache until refreshed or a sweep runs."""
+        self.add_memories(session_factory, "cached-tenant", [
+            ("cached-1", "user-1", 0.1, 40, 40),
+        ])
+        assert forgetting_engine.analyze_memory_health("cached-tenant")["total_memories"] == 1
+        
+        self.add_memories(session_factory, "cached-tenant", [
+            ("cached-2", "user-1", 0.9, 1, 1),
+        ])
+        assert forgetting_engine.analyze_memory_health("cached-tenant")["total_memories"] == 1
+        assert forgetting_engine.analyze_memory_health(
+            "cached-tenant", force_refresh=True
+        )["total_memories"] == 2
+        
+        forgetting_engine.forget_user_memories("cached-tenant")
+        
+        health = forgetting_engine.analyze_memory_health("cached-tenant")
+        assert health["total_memories"] == 1
+        assert health["low_importance_count"] == 0
+
+    def test_forget_user_memories(self, forgetting_engine: ForgettingEngine, session_factory):
+        """Test low-importance, idle memories are deactivated in one update."""
+        self.add_memories(session_factory, "forget-tenant", [
+            ("forget-1", "user-1", 0.1, 40, 40),
+            ("forget-2", "user-1", 0.1, 1, 40),
+            ("forget-3", "user-1", 0.9, 40, 40),
+            ("forget-4", "user-2", 0.1, 40, 40),
+        ])
+        
+        result = forgetting_engine.forget_user_memories("forget-tenant", "user-1")
+        
+        assert result["memories_forgotten"] == 1
+        assert result["memory_ids"] == ["forget-1"]
+        with session_factory() as session:
+            active = {m.id: m.active for m in session.query(Memory).filter(Memory.tenant_id == "forget-tenant")}
+        assert active == {"forget-1": False, "forget-2": True, "forget-3": True, "forget-4": True}
+        
+        # Already forgotten memories are not counted again
+        assert forgetting_engine.forget_user_memories("forget-tenant", "user-1")["memories_forgotten"] == 0
+
+    def test_forget_updates_user_stats(self, forgetting_engine: ForgettingEngine, session_factory):
+        """Test sweeps take forgotten memories out of the users' stats."""
+        self.add_memories(session_factory, "forget-stats-tenant", [
+            ("forget-stats-1", "user-1", 0.1, 40, 40),
+            ("forget-stats-2", "user-1", 0.1, 40, 40),
+            ("forget-stats-3", "user-1", 0.7, 40, 40),
+            ("forget-stats-4", "user-2", 0.1, 40, 40),
+        ])
+        with session_factory() as session:
+            session.add(Tenant(id="forget-stats-tenant", name="Forget stats tenant"))
+            session.add(UserMemoryStats(
+                tenant_id="forget-stats-tenant", user_id="user-1",
+                total_memories=3, active_memories=3, avg_importance=0.3,
+            ))
+            session.commit()
+        
+        result = forgetting_engine.forget_user_memories("forget-stats-tenant")
+        
+        assert result["memories_forgotten"] == 3
+        with session_factory() as session:
+            stats = session.query(UserMemoryStats).filter_by(tenant_id="forget-stats-tenant").one()
+        assert stats.total_memories == 3
+        assert stats.active_memories == 1
+        assert stats.avg_importance == pytest.approx(0.7)
+
+    def test_forget_old_memories(self, forgetting_engine: ForgettingEngine, session_factory):
+        """Test memories past the retention period are deactivated."""
+        self.add_memories(session_factory, "retention-tenant", [
+            ("retention-1", "user-1", 0.9, 1, 400),
+            ("retention-2", "user-1", 0.9, 1, 10),
+        ])
+        
+        result = forgetting_engine.forget_old_memories("retention-tenant", retention_days=365)
+        
+        assert result == {
+            "memories_forgotten": 1,
+            "retention_days": 365,
+            "memory_ids": ["retention-1"],
+        }
+
+    def test_forget_in_batches(self, forgetting_engine: ForgettingEngine, session_factory):
+        """Test large sweeps run as several bounded batches."""
+        self.add_memories(session_factory, "batch-tenant", [
+            (f"batch-{i:02d}", "user-1", 0.1, 40, 40) for i in range(12)
+        ])
+        
+        with patch("engram.core.forgetting.FORGET_BATCH_SIZE", 5):
+            result = forgetting_engine.forget_user_memories("batch-tenant")
+        
+        # Batches of 5, 5 and 2 rows; only the first IDs are reported
+        assert result["memories_forgotten"] == 12
+        assert result["memory_ids"] == [f"batch-{i:02d}" for i in range(10)]
+        with session_factory() as session:
+            assert session.query(Memory).filter(
+                Memory.tenant_id == "batch-tenant", Memory.active == True
+            ).count() == 0
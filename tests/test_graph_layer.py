@@ -2,6 +2,10 @@
 
 import pytest
 from unittest.mock import Mock, patch
+
+from sqlalchemy.orm import sessionmaker
+
+from engram.database.graph_models import Edge, Node
 from engram.graph.builder import GraphBuilder, EntityExtractor, RelationshipExtractor
 from engram.graph.store import GraphStore
 from engram.graph.api import GraphAPI
@@ -204,6 +208,33 @@ class TestGraphStore:
         assert len(edge_ids) == 1
         mock_session.add.assert_called()
         mock_session.commit.assert_called()
+    
+    def test_get_subgraph_matches_to_dict(self, test_engine):
+        """Test subgraph rows serialize exactly like the ORM models."""
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+        with factory() as session:
+            session.add_all([
+                Node(id="sub-a", tenant_id="sub-tenant", user_id="user1", label="Ada",
+                     node_type="person", properties={"source": "test"}),
+                Node(id="sub-b", tenant_id="sub-tenant", user_id="user1", label="Engine",
+                     node_type="concept", properties={}),
+            ])
+            session.flush()
+            session.add(Edge(id="sub-e", tenant_id="sub-tenant", user_id="user1",
+                             src_id="sub-a", dst_id="sub-b", relation="built",
+                             weight=0.5, properties={}))
+            session.commit()
+            expected_nodes = [session.get(Node, "sub-a").to_dict(), session.get(Node, "sub-b").to_dict()]
+            expected_edges = [session.get(Edge, "sub-e").to_dict()]
+        
+        store = GraphStore()
+        with patch("engram.graph.store.get_session", factory):
+            subgraph = store.get_subgraph("sub-tenant", "user1", seed_labels=["Ada"], radius=1)
+            entities = store.search_entities("sub-tenant", "user1", "engine")
+        
+        assert subgraph["nodes"] == expected_nodes
+        assert subgraph["edges"] == expected_edges
+        assert entities == expected_nodes[1:]
 
 
 class TestGraphAPI:
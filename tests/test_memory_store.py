@@ -4,8 +4,11 @@ import pytest
 from unittest.mock import Mock, patch
 from datetime import datetime
 
-from engram.core.memory_store import MemoryStore
-from engram.database.models import Tenant, Memory, UserMemoryStats
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import selectinload
+
+from engram.core.memory_store import MEMORY_RESULT_COLUMNS, MemoryStore
+from engram.database.models import Tenant, Memory, ModalityType, UserMemoryStats
 from engram.vectordb.base import VectorHit
 
 
@@ -135,25 +138,24 @@ class TestMemoryStore:
             assert len(results) == 0
 
     def test_delete_memory(self, memory_store: MemoryStore):
-        """Test memory deletion."""
-        mock_memory = Mock()
-        mock_memory.id = "memory-1"
-        mock_memory.active = True
+        """Test memory deletion is a single conditional update."""
+        memory_store.db.add(Tenant(id="delete-tenant", name="Delete Tenant"))
+        memory_store.db.add(Memory(id="delete-1", tenant_id="delete-tenant", user_id="delete-user", text="memory"))
+        memory_store.db.commit()
         
-        with patch.object(memory_store.db, 'query') as mock_query:
-            mock_query.return_value.filter.return_value.first.return_value = mock_memory
-            
-            with patch.object(memory_store.db, 'commit') as mock_commit:
-                success = memory_store.delete_memory(
-                    memory_id="memory-1",
-                    tenant_id="test-tenant-id",
-                    user_id="test-user-id",
-                )
-                
-                assert success is True
-                assert mock_memory.active is False
-                mock_commit.assert_called_once()
-                memory_store.vector_index.delete.assert_called_once()
+        success = memory_store.delete_memory(
+            memory_id="delete-1",
+            tenant_id="delete-tenant",
+            user_id="delete-user",
+        )
+        
+        assert success is True
+        assert memory_store.db.get(Memory, "delete-1").active is False
+        memory_store.vector_index.delete.assert_called_once_with(["delete-1"], "delete-tenant:delete-user")
+        
+        # Deleting again is a no-op that skips the vector index
+        assert memory_store.delete_memory("delete-1", "delete-tenant", "delete-user") is False
+        memory_store.vector_index.delete.assert_called_once()
 
     def test_delete_memory_not_found(self, memory_store: MemoryStore):
         """Test memory deletion with non-existent memory."""
@@ -188,6 +190,21 @@ class TestMemoryStore:
             assert len(memories) == 2
             assert memories[0].id == "memory-1"
 
+    def test_count_memories(self, memory_store: MemoryStore):
+        """Test memory counting with listing filters."""
+        tenant = memory_store.create_tenant("count-tenant")
+        memory_store.db.add_all([
+            Memory(id="count-1", tenant_id=tenant.id, user_id="user-a", text="one", memory_metadata={}),
+            Memory(id="count-2", tenant_id=tenant.id, user_id="user-a", text="two", memory_metadata={}),
+            Memory(id="count-3", tenant_id=tenant.id, user_id="user-b", text="three", memory_metadata={}, active=False),
+        ])
+        memory_store.db.commit()
+
+        assert memory_store.count_memories(tenant_id=tenant.id) == 2
+        assert memory_store.count_memories(tenant_id=tenant.id, active_only=False) == 3
+        assert memory_store.count_memories(tenant_id=tenant.id, user_id="user-b") == 0
+        assert memory_store.count_memories(tenant_id="missing-tenant") == 0
+
     def test_get_user_stats(self, memory_store: MemoryStore):
         """Test getting user statistics."""
         mock_stats = Mock()
@@ -256,7 +273,7 @@ class TestMemoryStore:
 
     def test_retrieve_memories_embedding_error(self, memory_store: MemoryStore, sample_retrieval_data):
         """Test memory retrieval with embedding generation error."""
-        memory_store.embeddings_facade.embed_texts.side_effect = ValueError("Embedding error")
+        memory_store.embeddings_facade.embed_query.side_effect = ValueError("Embedding error")
         
         with pytest.raises(ValueError, match="Memory retrieval failed"):
             memory_store.retrieve_memories(
@@ -271,8 +288,8 @@ class TestMemoryStore:
             mock_tenant = Mock()
             mock_query.return_value.filter.return_value.first.return_value = mock_tenant
             
-            with patch.object(memory_store.db, 'add_all') as mock_add_all:
-                mock_add_all.side_effect = Exception("Database error")
+            with patch.object(memory_store.db, 'execute') as mock_execute:
+                mock_execute.side_effect = Exception("Database error")
                 
                 with patch.object(memory_store.db, 'rollback') as mock_rollback:
                     with pytest.raises(ValueError):
@@ -283,3 +300,296 @@ class TestMemoryStore:
                         )
                     
                     mock_rollback.assert_called_once()
+
+    def test_upsert_memories_bulk_insert(self, memory_store: MemoryStore):
+        """Test upserted memories are written in one bulk insert."""
+        memory_store.db.add(Tenant(id="bulk-tenant", name="Bulk Tenant"))
+        memory_store.db.commit()
+        
+        memories = memory_store.upsert_memories(
+            tenant_id="bulk-tenant",
+            user_id="bulk-user",
+            texts=["first", "second"],
+            embeddings=[[0.1, 0.2], [0.3, 0.4]],
+            metadata_list=[{"source": "a"}, {"source": "b"}],
+            importance=0.7,
+            modality="chat",
+        )
+        
+        stored = memory_store.db.query(Memory).filter(Memory.tenant_id == "bulk-tenant").order_by(Memory.chunk_idx).all()
+        assert [memory.id for memory in stored] == [memory.id for memory in memories]
+        assert [memory.text for memory in stored] == ["first", "second"]
+        assert [memory.memory_metadata["source"] for memory in stored] == ["a", "b"]
+        assert all(memory.importance == 0.7 for memory in stored)
+        assert all(memory.modality == ModalityType.CHAT for memory in stored)
+        assert all(memory.active and memory.decay_weight == 1.0 for memory in stored)
+        memory_store.vector_index.upsert.assert_called_once()
+
+    def test_upsert_memories_discards_vectors_on_database_error(self, memory_store: MemoryStore):
+        """Test a failed database write removes the vectors written alongside it."""
+        with patch.object(memory_store, 'get_tenant', return_value=Mock()):
+            with patch.object(memory_store.db, 'execute', side_effect=Exception("Database error")):
+                with pytest.raises(ValueError, match="Memory upsert failed"):
+                    memory_store.upsert_memories(
+                        tenant_id="test-tenant-id",
+                        user_id="test-user-id",
+                        texts=["first", "second"],
+                        embeddings=[[0.1, 0.2], [0.3, 0.4]],
+                    )
+        
+        written = memory_store.vector_index.upsert.call_args.args
+        memory_store.vector_index.delete.assert_called_once_with(
+            [item[0] for item in written[0]], "test-tenant-id:test-user-id"
+        )
+
+    def test_upsert_memories_rolls_back_on_vector_error(self, memory_store: MemoryStore):
+        """Test a failed vector write leaves no rows in the database."""
+        memory_store.db.add(Tenant(id="vector-tenant", name="Vector Tenant"))
+        memory_store.db.commit()
+        memory_store.vector_index.upsert.side_effect = RuntimeError("Vector error")
+        
+        with pytest.raises(ValueError, match="Memory upsert failed"):
+            memory_store.upsert_memories(
+                tenant_id="vector-tenant",
+                user_id="vector-user",
+                texts=["first"],
+                embeddings=[[0.1, 0.2]],
+            )
+        
+        assert memory_store.db.query(Memory).filter(Memory.tenant_id == "vector-tenant").count() == 0
+        memory_store.vector_index.delete.assert_not_called()
+
+    def test_user_stats_track_writes_incrementally(self, memory_store: MemoryStore):
+        """Test stats follow upserts and deletes without a full recompute."""
+        memory_store.db.add(Tenant(id="stats-tenant", name="Stats Tenant"))
+        memory_store.db.commit()
+        
+        def upsert(count, importance):
+            return memory_store.upsert_memories(
+                tenant_id="stats-tenant",
+                user_id="stats-user",
+                texts=[f"memory {i}" for i in range(count)],
+                embeddings=[[0.1, 0.2]] * count,
+                importance=importance,
+            )
+        
+        # The first write has no stats row yet and recomputes
+        memories = upsert(2, 0.2)
+        
+        with patch.object(memory_store, '_recompute_user_stats') as mock_recompute:
+            upsert(2, 0.8)
+            memory_store.delete_memory(memories[0].id, "stats-tenant", "stats-user")
+            mock_recompute.assert_not_called()
+        
+        stats = memory_store.get_user_stats("stats-tenant", "stats-user")
+        memory_store.db.refresh(stats)
+        assert stats.total_memories == 4
+        assert stats.active_memories == 3
+        assert stats.avg_importance == pytest.approx(0.6)
+
+    def test_list_memories_returns_result_columns(self, memory_store: MemoryStore):
+        """Test listing reads only the columns callers need."""
+        memory_store.db.add(Tenant(id="list-tenant", name="List Tenant"))
+        memory_store.db.add_all([
+            Memory(
+                id=f"list-{i}", tenant_id="list-tenant", user_id="list-user",
+                text=f"memory {i}", memory_metadata={"i": i}, created_at=datetime(2024, 1, i + 1),
+            )
+            for i in range(3)
+        ])
+        memory_store.db.commit()
+        
+        memories = memory_store.list_memories("list-tenant", "list-user", limit=2)
+        
+        assert [memory.id for memory in memories] == ["list-2", "list-1"]
+        assert memories[0].memory_metadata == {"i": 2}
+        assert memories[0]._fields == tuple(column.key for column in MEMORY_RESULT_COLUMNS)
+
+    def test_store_stats_and_counts(self, memory_store: MemoryStore):
+        """Test counts come from single aggregate queries."""
+        memory_store.embeddings_facade._provider_name = "test"
+        keys = ("total_tenants", "total_memories", "active_memories")
+        before = memory_store.get_store_stats()
+        
+        memory_store.db.add(Tenant(id="agg-tenant", name="Aggregate Tenant"))
+        memory_store.db.add_all([
+            Memory(id=f"agg-{i}", tenant_id="agg-tenant", user_id="agg-user", text="memory", active=i < 2)
+            for i in range(3)
+        ])
+        memory_store.db.commit()
+        
+        after = memory_store.get_store_stats()
+        
+        assert [after[key] - before[key] for key in keys] == [1, 3, 2]
+        assert memory_store.count_memories("agg-tenant") == 2
+        assert memory_store.count_memories("agg-tenant", active_only=False) == 3
+
+    def test_retrieve_memories_touches_hits_in_one_update(self, memory_store: MemoryStore):
+        """Test only returned memories get a new last accessed time."""
+        stale = datetime(2020, 1, 1)
+        memory_store.db.add(Tenant(id="touch-tenant", name="Touch Tenant"))
+        memory_store.db.add_all([
+            Memory(
+                id=f"touch-{i}", tenant_id="touch-tenant", user_id="touch-user",
+                text=f"memory {i}", created_at=stale, last_accessed_at=stale,
+            )
+            for i in range(3)
+        ])
+        memory_store.db.commit()
+        
+        hits = [VectorHit("touch-0", 0.9, {}), VectorHit("touch-2", 0.8, {})]
+        with patch.object(memory_store.retrieval_engine, 'retrieve_memories', return_value=hits):
+            results = memory_store.retrieve_memories("touch-tenant", "touch-user", "query")
+        
+        assert [result["memory_id"] for result in results] == ["touch-0", "touch-2"]
+        assert results[0]["last_accessed_at"] == results[1]["last_accessed_at"]
+        
+        memory_store.db.expire_all()
+        touched = {
+            memory.id: memory.last_accessed_at > stale
+            for memory in memory_store.db.query(Memory).filter(Memory.tenant_id == "touch-tenant")
+        }
+        assert touched == {"touch-0": True, "touch-1": False, "touch-2": True}
+
+    def test_retrieve_memories_keeps_hit_order(self, memory_store: MemoryStore):
+        """Test results follow the ranked hits and skip inactive memories."""
+        memory_store.db.add(Tenant(id="rank-tenant", name="Rank Tenant"))
+        memory_store.db.add_all([
+            Memory(id=f"rank-{i}", tenant_id="rank-tenant", user_id="rank-user", text=f"memory {i}", active=i != 1)
+            for i in range(3)
+        ])
+        memory_store.db.commit()
+        
+        hits = [VectorHit("rank-2", 0.9, {}), VectorHit("rank-1", 0.8, {}), VectorHit("rank-0", 0.7, {})]
+        with patch.object(memory_store.retrieval_engine, 'retrieve_memories', return_value=hits):
+            results = memory_store.retrieve_memories("rank-tenant", "rank-user", "query")
+        
+        assert [(result["memory_id"], result["score"]) for result in results] == [("rank-2", 0.9), ("rank-0", 0.7)]
+
+
+class TestMatchAny:
+    """Test the ID list filter helper."""
+
+    def test_postgres_uses_single_array_parameter(self):
+        """Test PostgreSQL filters bind the whole list as one array."""
+        from sqlalchemy import select
+        from sqlalchemy.dialects import postgresql
+        from engram.database.postgres import match_any
+        
+        session = Mock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+        
+        statement = select(Memory.id).where(match_any(Memory.id, ["a", "b", "c"], session))
+        compiled = statement.compile(dialect=postgresql.dialect())
+        
+        assert "= ANY (" in str(compiled)
+        assert list(compiled.params.values()) == [["a", "b", "c"]]
+
+    def test_other_dialects_use_in(self, test_session):
+        """Test other dialects fall back to IN and still match."""
+        from engram.database.postgres import match_any
+        
+        test_session.add(Tenant(id="match-tenant", name="Match Tenant"))
+        test_session.add_all([
+            Memory(id=f"match-{i}", tenant_id="match-tenant", user_id="user-1", text=f"memory {i}")
+            for i in range(3)
+        ])
+        test_session.commit()
+        
+        memories = test_session.query(Memory).filter(
+            match_any(Memory.id, ["match-0", "match-2", "missing"], test_session)
+        ).all()
+        
+        assert sorted(memory.id for memory in memories) == ["match-0", "match-2"]
+
+
+class TestCopyRows:
+    """Test the COPY bulk insert helper."""
+
+    def test_rows_are_written_in_copy_text_format(self):
+        """Test values are bound, escaped and completed with column defaults."""
+        from sqlalchemy.dialects import postgresql
+        from engram.database.postgres import copy_rows
+        
+        session = Mock()
+        session.get_bind.return_value.dialect = postgresql.psycopg2.dialect()
+        cursor = session.connection.return_value.connection.cursor.return_value
+        copied = {}
+        cursor.copy_expert.side_effect = lambda sql, buffer: copied.update(sql=sql, data=buffer.read())
+        
+        copy_rows(session, Memory.__table__, [{
+            "id": "memory-1",
+            "text": "tab\there\nnew line \\ slash",
+            "memory_metadata": {"key": "value"},
+            "modality": ModalityType.CHAT,
+            "mime": None,
+        }])
+        
+        assert copied["sql"] == (
+            "COPY memories (id, text, memory_metadata, modality, mime, importance, decay_weight, active) FROM STDIN"
+        )
+        assert copied["data"] == (
+            'memory-1\ttab\\there\\nnew line \\\\ slash\t{"key": "value"}\tCHAT\t\\N\t0.5\t1.0\tt\n'
+        )
+        cursor.close.assert_called_once()
+
+    def test_engine_encodes_json_with_orjson(self):
+        """Test JSON columns are encoded compactly by the engine's serializer."""
+        from engram.database.postgres import engine
+        
+        encoded = engine.dialect._json_serializer({"key": "value", 1: [1.5, None]})
+        
+        assert encoded == '{"key":"value","1":[1.5,null]}'
+        assert engine.dialect._json_deserializer(encoded) == {"key": "value", "1": [1.5, None]}
+
+    def test_engine_encodes_numpy_and_float_subclasses(self):
+        """Test values json.dumps accepted still encode, and NaN becomes null."""
+        import numpy as np
+        from engram.database.postgres import engine
+        
+        class Score(float):
+            pass
+            
+        encoded = engine.dialect._json_serializer({
+            "score": np.float64(0.25),
+            "count": np.int64(3),
+            "vector": np.array([0.5, 1.0], dtype=np.float32),
+            "boosted": Score(1.5),
+            "missing": float("nan"),
+        })
+        
+        assert encoded == '{"score":0.25,"count":3,"vector":[0.5,1.0],"boosted":1.5,"missing":null}'
+        with pytest.raises(TypeError):
+            engine.dialect._json_serializer({"value": object()})
+
+    def test_engine_query_cache_size(self):
+        """Test the engine keeps compiled statements for every query shape."""
+        from engram.database.postgres import QUERY_CACHE_SIZE, engine
+        
+        assert engine._compiled_cache.capacity == QUERY_CACHE_SIZE
+
+
+class TestRelationshipLoading:
+    """Test relationships never load lazily."""
+
+    def test_lazy_load_raises(self, test_session):
+        test_session.add(Tenant(id="raise-tenant", name="Raise tenant"))
+        test_session.add(Memory(
+            id="raise-memory",
+            tenant_id="raise-tenant",
+            user_id="user-1",
+            text="memory",
+            memory_metadata={},
+            modality=ModalityType.TEXT,
+        ))
+        test_session.commit()
+        test_session.expunge_all()
+        
+        memory = test_session.get(Memory, "raise-memory")
+        with pytest.raises(InvalidRequestError):
+            memory.tenant
+            
+        memory = test_session.query(Memory).options(
+            selectinload(Memory.tenant)
+        ).filter(Memory.id == "raise-memory").one()
+        assert memory.tenant.name == "Raise tenant"
@@ -1,10 +1,23 @@
 """Tests for retrieval engine functionality."""
 
+import sys
+
+import numpy as np
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
+
+from redis.exceptions import ConnectionError as RedisConnectionError
 
-from engram.core.retrieval import RetrievalEngine
+from engram.api.deps import get_cache_redis, get_retrieval_cache
+from engram.core.retrieval import (
+    RetrievalCache,
+    RetrievalEngine,
+    _parse_iso,
+    cosine_similarities,
+    top_k_indices,
+)
+from engram.database.models import Memory, ModalityType
 from engram.vectordb.base import VectorHit
 
 
@@ -73,6 +86,46 @@ class TestRetrievalEngine:
         # First hit should have higher composite score due to recency
         assert reranked_hits[0].score >= reranked_hits[1].score
 
+    def test_rerank_hits_matches_scalar_scoring(self, retrieval_engine: RetrievalEngine):
+        """Test batch scores match the per-hit helpers and only top_k hits are built."""
+        now = datetime.now()
+        hits = [
+            VectorHit(
+                id=f"memory-{i}",
+                score=0.5 + i / 20,
+                metadata={
+                    "importance": 0.1 * i,
+                    "decay_weight": 0.5,
+                    "last_accessed_at": (now - timedelta(days=3 * i)).isoformat(),
+                    "created_at": (now - timedelta(days=40 * i)).isoformat(),
+                },
+            )
+            for i in range(8)
+        ]
+        hits.append(VectorHit(id="memory-bad", score=0.9, metadata={"created_at": "invalid"}))
+        
+        reranked_hits = retrieval_engine._rerank_hits(hits, [0.1] * 4, top_k=3, explain=True)
+        
+        assert len(reranked_hits) == 3
+        scores = [hit.score for hit in reranked_hits]
+        assert scores == sorted(scores, reverse=True)
+        for hit in reranked_hits:
+            metadata = hit.metadata
+            assert metadata["recency_boost"] == pytest.approx(
+                retrieval_engine._calculate_recency_boost(
+                    metadata.get("last_accessed_at"), metadata.get("created_at")
+                ), abs=1e-6
+            )
+            assert metadata["decay_penalty"] == pytest.approx(
+                retrieval_engine._calculate_decay_penalty(
+                    metadata.get("created_at"), metadata.get("decay_weight", 1.0)
+                ), abs=1e-6
+            )
+        
+        all_hits = retrieval_engine._rerank_hits(hits, [0.1] * 4)
+        assert [hit.id for hit in all_hits[:3]] == [hit.id for hit in reranked_hits]
+        assert all_hits[-1].score <= reranked_hits[-1].score
+
     def test_calculate_recency_boost_recent(self, retrieval_engine: RetrievalEngine):
         """Test recency boost calculation for recent access."""
         recent_time = datetime.now().isoformat()
@@ -101,6 +154,22 @@ class TestRetrievalEngine:
         
         assert boost == 0.0
 
+    def test_timestamps_are_parsed_once(self, retrieval_engine: RetrievalEngine):
+        """Test repeated timestamps hit the parse cache."""
+        timestamp = "2024-01-02T03:04:05Z"
+        hits = [
+            VectorHit(id=f"memory-{i}", score=0.8, metadata={"created_at": timestamp})
+            for i in range(5)
+        ]
+        _parse_iso.cache_clear()
+        
+        retrieval_engine._rerank_hits(hits, [0.1] * 4)
+        retrieval_engine._calculate_decay_penalty(timestamp, 0.5)
+        
+        info = _parse_iso.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+        assert _parse_iso(timestamp).tzinfo is not None
+
     def test_calculate_decay_penalty_recent(self, retrieval_engine: RetrievalEngine):
         """Test decay penalty calculation for recent memory."""
         recent_time = datetime.now().isoformat()
@@ -123,6 +192,18 @@ class TestRetrievalEngine:
         
         assert penalty == 0.0
 
+    def test_batch_factors_use_one_snapshot(self, retrieval_engine: RetrievalEngine):
+        """Test batch recency and decay factors against a fixed now."""
+        now = 1_700_000_000.0
+        day = 24 * 3600
+        times = np.array([now, now - 14 * day, now - 730 * day, np.nan])
+        
+        boost = retrieval_engine._calculate_recency_boost_batch(times, now)
+        penalty = retrieval_engine._calculate_decay_penalty_batch(times, np.full(4, 0.5), now)
+        
+        assert boost == pytest.approx([1.0, np.exp(-1.0), np.exp(-730 / 14), 0.0])
+        assert penalty == pytest.approx([0.0, 14 / 365 * 0.5, 1.0, 0.0])
+
     def test_find_similar_memories(self, retrieval_engine: RetrievalEngine):
         """Test finding similar memories."""
         memory_vector = [0.1, 0.2, 0.3, 0.4] * 10
@@ -148,8 +229,35 @@ class TestRetrievalEngine:
             exclude_id="test-id",  # Should exclude this ID
         )
         
-        # Should still return results but without the excluded ID
-        assert len(similar_hits) == 0  # Mock returns same ID, so excluded
+        # The vector index leaves out the excluded ID itself
+        call_kwargs = retrieval_engine.vector_index.query.call_args.kwargs
+        assert call_kwargs["exclude_ids"] == ["test-id"]
+        assert call_kwargs["score_threshold"] == 0.92
+        assert len(similar_hits) == 1
+
+    def test_find_similar_memories_batch(self, retrieval_engine: RetrievalEngine):
+        """Test batched similarity search issues a single query."""
+        retrieval_engine.vector_index.query.return_value = [
+            [VectorHit("memory-2", 0.95, {})],
+        ]
+        
+        similar_hits = retrieval_engine.find_similar_memories_batch(
+            memory_vectors=[[0.1, 0.2], [0.2, 0.1]],
+            tenant_id="test-tenant",
+            user_id="test-user",
+            similarity_threshold=0.9,
+            exclude_ids=["memory-1", "memory-2"],
+        )
+        
+        retrieval_engine.vector_index.query.assert_called_once_with(
+            vectors=[[0.1, 0.2], [0.2, 0.1]],
+            top_k=50,
+            namespace="test-tenant:test-user",
+            score_threshold=0.9,
+            exclude_ids=["memory-1", "memory-2"],
+        )
+        # Missing result lists are padded to one per vector
+        assert [[hit.id for hit in hits] for hits in similar_hits] == [["memory-2"], []]
 
     def test_get_retrieval_stats(self, retrieval_engine: RetrievalEngine):
         """Test getting retrieval engine statistics."""
@@ -209,7 +317,7 @@ class TestRetrievalEngine:
         
         query_vector = [0.1, 0.2, 0.3, 0.4] * 10
         
-        reranked_hits = retrieval_engine._rerank_hits(hits, query_vector)
+        reranked_hits = retrieval_engine._rerank_hits(hits, query_vector, explain=True)
         
         assert len(reranked_hits) == 1
         hit = reranked_hits[0]
@@ -221,6 +329,11 @@ class TestRetrievalEngine:
         assert "composite_score" in hit.metadata
         
         assert hit.metadata["original_score"] == 0.8
+        
+        # Without explain, the hit shares the original metadata
+        plain_hit = retrieval_engine._rerank_hits(hits, query_vector)[0]
+        assert plain_hit.metadata is hits[0].metadata
+        assert plain_hit.score == pytest.approx(hit.score)
 
     def test_ranking_consistency(self, retrieval_engine: RetrievalEngine):
         """Test that ranking is consistent across multiple runs."""
@@ -265,6 +378,31 @@ class TestRetrievalEngine:
         
         assert len(reranked_hits) == 0
 
+    def test_retrieve_uses_stored_embeddings(self, retrieval_engine: RetrievalEngine, mock_vector_index):
+        """Test hybrid retrieval scores stored vectors and embeds only the rest in one batch."""
+        memories = [
+            Memory(id=f"hybrid-{i}", text=f"memory {i}", modality=modality, importance=0.5)
+            for i, modality in enumerate([ModalityType.TEXT, ModalityType.TEXT, ModalityType.PDF, ModalityType.PDF])
+        ]
+        mock_vector_index.fetch.return_value = {"hybrid-0": [0.0, 1.0], "hybrid-2": [1.0, 0.0]}
+        registry = Mock()
+        registry.embed_query.return_value = np.array([1.0, 0.0], dtype=np.float32)
+        registry.embed_texts.side_effect = lambda texts, modality="text": [[0.6, 0.8]] * len(texts)
+        
+        with patch.dict(sys.modules, {"engram.providers.multimodal_registry": Mock(embeddings_registry=registry)}), \
+             patch("engram.core.memory_store.MemoryStore.get_memories", return_value=memories):
+            results = retrieval_engine.retrieve("tenant", "user", "query", top_k=3)
+        
+        mock_vector_index.fetch.assert_called_once_with(
+            ["hybrid-0", "hybrid-1", "hybrid-2", "hybrid-3"], "tenant:user"
+        )
+        registry.embed_query.assert_called_once_with("query", "text")
+        assert registry.embed_texts.call_count == 2
+        registry.embed_texts.assert_any_call(["memory 1"], "text")
+        registry.embed_texts.assert_any_call(["memory 3"], "pdf")
+        assert [result["memory_id"] for result in results] == ["hybrid-2", "hybrid-1", "hybrid-3"]
+        assert results[1]["score"] == pytest.approx(0.6)
+
     def test_vector_index_error_handling(self, retrieval_engine: RetrievalEngine):
         """Test error handling when vector index fails."""
         retrieval_engine.vector_index.query.side_effect = Exception("Vector DB error")
@@ -275,3 +413,181 @@ class TestRetrievalEngine:
                 tenant_id="test-tenant",
                 user_id="test-user",
             )
+
+
+class TestTopKIndices:
+    """Test partial top-k selection."""
+
+    def test_matches_full_sort(self):
+        """Test the selection matches a full descending sort."""
+        scores = np.random.default_rng(0).random(100)
+        
+        expected = np.argsort(-scores)
+        assert top_k_indices(scores, 10).tolist() == expected[:10].tolist()
+        assert top_k_indices(scores, None).tolist() == expected.tolist()
+        assert top_k_indices(scores, 500).tolist() == expected.tolist()
+        assert top_k_indices(scores, 0).tolist() == []
+
+    def test_ties_keep_original_order(self):
+        """Test equal scores come back in their original order."""
+        scores = np.array([0.5, 0.9, 0.5, 0.5, 0.1, 0.5])
+        
+        assert top_k_indices(scores, 5).tolist() == [1, 0, 2, 3, 5]
+
+
+class TestCosineSimilarities:
+    """Test batched cosine similarity."""
+
+    def test_matches_pairwise(self):
+        """Test the matrix product matches pairwise cosine similarity."""
+        rng = np.random.default_rng(1)
+        query = rng.standard_normal(16).tolist()
+        vectors = rng.standard_normal((5, 16)).tolist()
+        
+        expected = [
+            np.dot(query, vector) / (np.linalg.norm(query) * np.linalg.norm(vector))
+            for vector in vectors
+        ]
+        assert cosine_similarities(query, vectors) == pytest.approx(expected, abs=1e-5)
+
+    def test_zero_and_mismatched_vectors(self):
+        """Test zero vectors and other dimensions score 0.0."""
+        similarities = cosine_similarities([1.0, 0.0], [[2.0, 0.0], [0.0, 0.0], [1.0, 0.0, 0.0]])
+        
+        assert similarities.tolist() == [1.0, 0.0, 0.0]
+        assert cosine_similarities([1.0, 0.0], []).tolist() == []
+
+
+class TestRetrievalCache:
+    """Test RetrievalCache functionality."""
+
+    def test_hit_returns_copies(self):
+        """Test cached results come back as independent copies."""
+        cache = RetrievalCache(maxsize=10, ttl=60)
+        cache.put("tenant", "user", "query", 5, [{"memory_id": "m1", "score": 0.9}])
+        
+        first = cache.get("tenant", "user", "query", 5)
+        first[0]["score"] = 0.0
+        
+        assert cache.get("tenant", "user", "query", 5) == [{"memory_id": "m1", "score": 0.9}]
+        assert cache.get("tenant", "user", "query", 6) is None
+        assert cache.get("tenant", "other-user", "query", 5) is None
+
+    def test_entries_expire(self):
+        """Test entries are dropped after the TTL."""
+        cache = RetrievalCache(maxsize=10, ttl=60)
+        with patch("engram.core.retrieval.time.monotonic", return_value=100.0):
+            cache.put("tenant", "user", "query", 5, [{"memory_id": "m1"}])
+        
+        with patch("engram.core.retrieval.time.monotonic", return_value=159.0):
+            assert cache.get("tenant", "user", "query", 5) is not None
+        with patch("engram.core.retrieval.time.monotonic", return_value=161.0):
+            assert cache.get("tenant", "user", "query", 5) is None
+
+    def test_invalidate_is_per_user(self):
+        """Test invalidation only drops the given user's entries."""
+        cache = RetrievalCache(maxsize=10, ttl=60)
+        cache.put("tenant", "user-1", "query", 5, [{"memory_id": "m1"}])
+        cache.put("tenant", "user-2", "query", 5, [{"memory_id": "m2"}])
+        
+        cache.invalidate("tenant", "user-1")
+        
+        assert cache.get("tenant", "user-1", "query", 5) is None
+        assert cache.get("tenant", "user-2", "query", 5) == [{"memory_id": "m2"}]
+
+    def test_least_recently_used_is_evicted(self):
+        """Test the cache stays within maxsize."""
+        cache = RetrievalCache(maxsize=2, ttl=60)
+        cache.put("tenant", "user", "a", 5, [])
+        cache.put("tenant", "user", "b", 5, [])
+        cache.get("tenant", "user", "a", 5)
+        cache.put("tenant", "user", "c", 5, [])
+        
+        assert cache.get("tenant", "user", "a", 5) == []
+        assert cache.get("tenant", "user", "b", 5) is None
+        assert cache.get("tenant", "user", "c", 5) == []
+
+    def test_results_from_before_a_write_are_not_served(self):
+        """Test results computed across an invalidation are stored under the old generation."""
+        cache = RetrievalCache(maxsize=10, ttl=60)
+        generation, cached = cache.lookup("tenant", "user", "query", 5)
+        assert cached is None
+        
+        cache.invalidate("tenant", "user")
+        cache.put("tenant", "user", "query", 5, [{"memory_id": "stale"}], generation=generation)
+        
+        assert cache.get("tenant", "user", "query", 5) is None
+
+    def test_invalidation_is_shared_through_redis(self):
+        """Test a write in one process invalidates the other processes' entries."""
+        generations = {}
+        redis_client = Mock()
+        redis_client.get.side_effect = generations.get
+        redis_client.incr.side_effect = lambda key: generations.update({key: generations.get(key, 0) + 1})
+        first = RetrievalCache(maxsize=10, ttl=60, redis_client=redis_client)
+        second = RetrievalCache(maxsize=10, ttl=60, redis_client=redis_client)
+        second.put("tenant", "user", "query", 5, [{"memory_id": "m1"}])
+        
+        first.invalidate("tenant", "user")
+        
+        assert second.get("tenant", "user", "query", 5) is None
+
+    def test_unreachable_redis_is_a_miss(self):
+        """Test entries are not served while the generation cannot be read."""
+        redis_client = Mock()
+        redis_client.get.return_value = None
+        cache = RetrievalCache(maxsize=10, ttl=60, redis_client=redis_client)
+        cache.put("tenant", "user", "query", 5, [{"memory_id": "m1"}])
+        
+        redis_client.get.side_effect = RedisConnectionError("down")
+        
+        assert cache.get("tenant", "user", "query", 5) is None
+
+    @pytest.mark.parametrize("workers,maxsize", [(1, 10000), (2, 0)])
+    def test_unreachable_redis_falls_back_at_startup(self, workers, maxsize):
+        """Test the shared cache is only used when Redis answers a ping."""
+        redis_client = Mock()
+        redis_client.ping.side_effect = RedisConnectionError("down")
+        get_cache_redis.cache_clear()
+        get_retrieval_cache.cache_clear()
+        try:
+            with patch("engram.api.deps.redis.from_url", return_value=redis_client), \
+                    patch("engram.api.deps.settings.redis_enabled", True), \
+                    patch("engram.api.deps.settings.workers", workers), \
+                    patch("engram.core.retrieval.settings.retrieval_cache_size", 10000):
+                cache = get_retrieval_cache()
+        finally:
+            get_cache_redis.cache_clear()
+            get_retrieval_cache.cache_clear()
+        
+        assert cache.redis_client is None
+        assert cache.maxsize == maxsize
+
+    def test_memory_store_serves_repeat_queries(self, memory_store):
+        """Test repeat queries skip embedding until the user writes."""
+        memory_store.retrieval_cache = RetrievalCache(maxsize=10, ttl=60)
+        results = [{"memory_id": "m1", "score": 0.9}]
+        
+        with patch.object(memory_store.retrieval_engine, "retrieve_memories", return_value=[]):
+            memory_store.retrieval_cache.put("tenant", "user", "query", None, results)
+            assert memory_store.retrieve_memories("tenant", "user", "query") == results
+            memory_store.embeddings_facade.embed_query.assert_not_called()
+            
+            memory_store.retrieval_cache.invalidate("tenant", "user")
+            assert memory_store.retrieve_memories("tenant", "user", "query") == []
+            memory_store.embeddings_facade.embed_query.assert_called_once()
+
+    def test_memory_store_skips_results_raced_by_a_write(self, memory_store):
+        """Test a write committed during retrieval keeps its results out of the cache."""
+        memory_store.retrieval_cache = RetrievalCache(maxsize=10, ttl=60)
+        
+        def write_during_retrieval(**kwargs):
+            memory_store.retrieval_cache.invalidate("tenant", "user")
+            return []
+        
+        with patch.object(
+            memory_store.retrieval_engine, "retrieve_memories", side_effect=write_during_retrieval
+        ):
+            memory_store.retrieve_memories("tenant", "user", "query")
+        
+        assert memory_store.retrieval_cache.get("tenant", "user", "query", None) is None
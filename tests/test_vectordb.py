@@ -203,6 +203,33 @@ class TestChromaVectorIndex:
         assert results[0][0].id == "id-1"
         assert results[0][1].id == "id-2"
 
+    @patch('engram.vectordb.chroma_db.chromadb.PersistentClient')
+    def test_chroma_query_threshold_and_exclusions(self, mock_chroma_client_class, temp_dir):
+        """Test ChromaDB query applies the score threshold and per-query exclusions."""
+        mock_client = Mock()
+        mock_collection = Mock()
+        mock_collection.query = Mock(return_value={
+            "ids": [["id-1", "id-2", "id-3"], ["id-2", "id-1", "id-3"]],
+            "distances": [[0.0, 0.05, 0.5], [0.0, 0.05, 0.08]],
+            "metadatas": [[{}, {}, {}], [{}, {}, {}]],
+        })
+        mock_client.get_or_create_collection = Mock(return_value=mock_collection)
+        mock_chroma_client_class.return_value = mock_client
+        
+        index = ChromaVectorIndex(persist_directory=temp_dir)
+        
+        results = index.query(
+            [[0.1, 0.2], [0.2, 0.1]],
+            top_k=2,
+            namespace="test:namespace",
+            score_threshold=0.9,
+            exclude_ids=["id-1", "id-2"],
+        )
+        
+        # One extra result is requested to make up for the excluded ID
+        assert mock_collection.query.call_args.kwargs["n_results"] == 3
+        assert [[hit.id for hit in hits] for hits in results] == [["id-2"], ["id-1", "id-3"]]
+
     @patch('engram.vectordb.chroma_db.chromadb.PersistentClient')
     def test_chroma_delete(self, mock_chroma_client_class, temp_dir):
         """Test ChromaDB delete operation."""
@@ -217,6 +244,25 @@ class TestChromaVectorIndex:
         
         mock_collection.delete.assert_called_once_with(ids=["id-1", "id-2"])
 
+    @patch('engram.vectordb.chroma_db.chromadb.PersistentClient')
+    def test_chroma_fetch(self, mock_chroma_client_class, temp_dir):
+        """Test ChromaDB fetch operation."""
+        mock_client = Mock()
+        mock_collection = Mock()
+        mock_collection.get = Mock(return_value={
+            "ids": ["id-2"],
+            "embeddings": [[0.5, 0.6, 0.7, 0.8]],
+        })
+        mock_client.get_or_create_collection = Mock(return_value=mock_collection)
+        mock_chroma_client_class.return_value = mock_client
+        
+        index = ChromaVectorIndex(persist_directory=temp_dir)
+        
+        vectors = index.fetch(["id-1", "id-2"], "test:namespace")
+        
+        assert vectors == {"id-2": [0.5, 0.6, 0.7, 0.8]}
+        mock_collection.get.assert_called_once_with(ids=["id-1", "id-2"], include=["embeddings"])
+
     @patch('engram.vectordb.chroma_db.chromadb.PersistentClient')
     def test_chroma_get_stats(self, mock_chroma_client_class, temp_dir):
         """Test ChromaDB statistics."""
@@ -263,8 +309,8 @@ class TestPineconeVectorIndex:
         mock_index.upsert = Mock()
         mock_index.query = Mock(return_value={
             "matches": [
-                {"id": "test-namespace:id-1", "score": 0.95, "metadata": {"test": "data1"}},
-                {"id": "test-namespace:id-2", "score": 0.87, "metadata": {"test": "data2"}},
+                {"id": "test:namespace:id-1", "score": 0.95, "metadata": {"test": "data1"}},
+                {"id": "test:namespace:id-2", "score": 0.87, "metadata": {"test": "data2"}},
             ]
         })
         mock_index.delete = Mock()
@@ -335,6 +381,30 @@ class TestPineconeVectorIndex:
         assert results[0][0].id == "id-1"  # Should extract original ID
         assert results[0][1].id == "id-2"
 
+    @patch('engram.vectordb.pinecone_db.Pinecone')
+    def test_pinecone_query_excludes_prefixed_ids(self, mock_pinecone_class, mock_pinecone_client):
+        """Test that excluded IDs are matched after stripping the whole namespace."""
+        mock_pinecone_class.return_value = mock_pinecone_client
+        mock_pinecone_client.Index.return_value.query.return_value = Mock(matches=[[
+            Mock(id="tenant:user:mem-1", score=0.99, metadata={}),
+            Mock(id="tenant:user:mem-2", score=0.9, metadata={}),
+        ]])
+        
+        index = PineconeVectorIndex(
+            api_key="test-key",
+            index_name="test-index",
+            dimension=384,
+        )
+        
+        results = index.query(
+            [[0.1, 0.2, 0.3, 0.4]],
+            top_k=1,
+            namespace="tenant:user",
+            exclude_ids=["mem-1"],
+        )
+        
+        assert [hit.id for hit in results[0]] == ["mem-2"]
+
     @patch('engram.vectordb.pinecone_db.Pinecone')
     def test_pinecone_delete(self, mock_pinecone_class, mock_pinecone_client):
         """Test Pinecone delete operation."""